@@ -0,0 +1,67 @@
+"""Import-time benchmark for the pyctrld package.
+
+Each statement is timed in a fresh interpreter so module caches do not leak
+between runs. The median wall time over all runs is reported.
+
+Usage:
+    python benchmarks/import_time.py [--runs N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "import pyctrld": "import pyctrld",
+    "ControlDApi()": "from pyctrld import ControlDApi; ControlDApi('token')",
+    "api.devices": "from pyctrld import ControlDApi; ControlDApi('token').devices",
+    "api.profiles.custom_rules": (
+        "from pyctrld import ControlDApi; ControlDApi('token').profiles.custom_rules"
+    ),
+    "all public names": "import pyctrld; [getattr(pyctrld, n) for n in pyctrld.__all__]",
+}
+
+_TEMPLATE = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(statement: str, runs: int) -> float:
+    """Return the median time in seconds needed to execute a statement in a new interpreter.
+
+    Args:
+        statement: Python source to execute.
+        runs: Number of fresh interpreters to spawn.
+
+    Returns:
+        Median execution time in seconds.
+    """
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _TEMPLATE.format(statement=statement)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="interpreters per statement")
+    args = parser.parse_args()
+
+    for label, statement in STATEMENTS.items():
+        print(f"{label:<28} {measure(statement, args.runs) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
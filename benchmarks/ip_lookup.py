@@ -0,0 +1,72 @@
+"""IP attribution benchmark comparing IpIndex with a linear scan.
+
+Builds N devices with learned IPs and a set of customer networks, and
+attributes a batch of source IPs to devices, once with IpIndex and once by
+scanning every entry per query.
+
+Usage:
+    python benchmarks/ip_lookup.py [--devices N] [--queries N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import random
+import time
+
+from pyctrld.tools.ip_index import IpIndex
+
+
+def linear_lookup(entries: list[tuple[ipaddress.IPv4Network, str]], ip: str) -> tuple[str, ...]:
+    """Return the devices of the most specific entry containing an IP by scanning all entries."""
+    address = ipaddress.ip_address(ip)
+    best, devices = -1, ()
+    for network, device_id in entries:
+        if address in network and network.prefixlen >= best:
+            if network.prefixlen > best:
+                best, devices = network.prefixlen, ()
+            devices += (device_id,)
+    return devices
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=5_000, help="number of devices")
+    parser.add_argument("--queries", type=int, default=1_000, help="number of lookups")
+    args = parser.parse_args()
+
+    entries = []
+    for number in range(args.devices):
+        entries.append(
+            (ipaddress.ip_network(f"10.{number // 256 % 256}.{number % 256}.1"), f"D{number}")
+        )
+        if number % 10 == 0:
+            entries.append((ipaddress.ip_network(f"172.16.{number % 256}.0/24"), f"D{number}"))
+    queries = [
+        f"{random.choice(['10', '172'])}.{random.randrange(17)}.{random.randrange(256)}.1"
+        for _ in range(args.queries)
+    ]
+
+    start = time.perf_counter()
+    index = IpIndex()
+    for network, device_id in entries:
+        index.add(str(network), device_id)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = index.lookup_many(queries)
+    radix = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = [linear_lookup(entries, ip) for ip in queries]
+    linear = time.perf_counter() - start
+
+    assert [sorted(devices) for devices in indexed] == [sorted(devices) for devices in scanned]
+    print(f"index build   {built * 1000:10.2f} ms")
+    print(f"IpIndex       {radix * 1e6 / len(queries):10.2f} us/lookup")
+    print(f"linear scan   {linear * 1e6 / len(queries):10.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Rule lookup benchmark comparing RuleIndex with a linear scan.
+
+Builds a profile with N custom rules and resolves a batch of queried hostnames
+against it, once with RuleIndex and once by scanning every rule per query.
+
+Usage:
+    python benchmarks/rule_lookup.py [--rules N] [--queries N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from pyctrld._core.models.profiles.custom_rules import CustomRule
+from pyctrld.tools.rule_index import RuleIndex
+
+
+def linear_lookup(rules: list[CustomRule], hostname: str) -> CustomRule | None:
+    """Return the most specific rule matching a hostname by scanning all rules."""
+    best = None
+    for rule in rules:
+        if (hostname == rule.PK or hostname.endswith("." + rule.PK)) and (
+            best is None or len(rule.PK) > len(best.PK)
+        ):
+            best = rule
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=50_000, help="number of custom rules")
+    parser.add_argument("--queries", type=int, default=1_000, help="number of lookups")
+    args = parser.parse_args()
+
+    rules = [
+        CustomRule(PK=f"host{i}.example{i % 100}.com", order=i, group=0, action={"status": 1})
+        for i in range(args.rules)
+    ]
+    queries = [
+        f"www.host{random.randrange(args.rules * 2)}.example7.com" for _ in range(args.queries)
+    ]
+
+    start = time.perf_counter()
+    index = RuleIndex(rules)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = index.lookup_many(queries)
+    trie = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = [linear_lookup(rules, hostname) for hostname in queries]
+    linear = time.perf_counter() - start
+
+    assert [rule and rule.PK for rule in indexed] == [rule and rule.PK for rule in scanned]
+    print(f"index build   {built * 1000:10.2f} ms")
+    print(f"RuleIndex     {trie * 1e6 / len(queries):10.2f} us/lookup")
+    print(f"linear scan   {linear * 1e6 / len(queries):10.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,106 +14,185 @@ Example:
 
 The package also exports individual endpoint classes and form data models
 for more granular control over API interactions.
+
+Public names are resolved lazily on first attribute access, so importing the
+package does not import endpoint modules, ``requests`` or the Pydantic models.
 """
 
 from __future__ import annotations
 
-from pyctrld._api import ControlDApi
-from pyctrld.api.access import AccessEndpoint, AccessFormData
-from pyctrld.api.account import AccountEndpoint
-from pyctrld.api.analytics import AnalyticsEndpoint
-from pyctrld.api.billing import BillingEndpoint
-from pyctrld.api.devices import (
-    CreateDeviceFormData,
-    DevicesEndpoint,
-    DeviceStatus,
-    ModifyDeviceFormData,
-)
-from pyctrld.api.misc import MiscEndpoint
-from pyctrld.api.mobile_config import MobileConfigEndpoint
-from pyctrld.api.organization import (
-    CreateSubOrganizationFromData,
-    ModifyOrganizationFromData,
-    OrganizationEndpoint,
-)
-from pyctrld.api.profiles._api import ProfilesAPI
-from pyctrld.api.profiles.custom_rules import (
-    CreateCustomRuleFormData,
-    CustomRulesEndpoint,
-    ModifyCustomRuleFormData,
-)
-from pyctrld.api.profiles.default_rule import (
-    DefaultRuleEndpoint,
-    DefaultRuleFormData,
-)
-from pyctrld.api.profiles.filters import (
-    FiltersEndpoint,
-    ModifyFilterFormData,
-)
-from pyctrld.api.profiles.list_proxies import ListProxiesEndpoint
-from pyctrld.api.profiles.profiles import (
-    CreateProfileFormData,
-    ModifyOptionFormData,
-    ModifyProfileFormData,
-    ProfilesEndpoint,
-)
-from pyctrld.api.profiles.rule_folders import (
-    CreateRuleFoldersFormData,
-    RuleFoldersEndpoint,
-    RuleFoldersFormData,
-)
-from pyctrld.api.profiles.services import (
-    ModifyServiceFormData,
-)
-from pyctrld.api.profiles.services import (
-    ServicesEndpoint as ProfileServicesEndpoint,
-)
-from pyctrld.api.services import ServicesEndpoint
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__all__ = [
+if TYPE_CHECKING:
+    from pyctrld._api import ControlDApi
+    from pyctrld.api.access import AccessEndpoint, AccessFormData
+    from pyctrld.api.account import AccountEndpoint
+    from pyctrld.api.analytics import AnalyticsEndpoint
+    from pyctrld.api.billing import BillingEndpoint
+    from pyctrld.api.devices import (
+        CreateDeviceFormData,
+        DevicesEndpoint,
+        DeviceStatus,
+        ModifyDeviceFormData,
+    )
+    from pyctrld.api.misc import MiscEndpoint
+    from pyctrld.api.mobile_config import MobileConfigEndpoint
+    from pyctrld.api.organization import (
+        CreateSubOrganizationFromData,
+        ModifyOrganizationFromData,
+        OrganizationEndpoint,
+    )
+    from pyctrld.api.profiles._api import ProfilesAPI
+    from pyctrld.api.profiles.custom_rules import (
+        CreateCustomRuleFormData,
+        CustomRulesEndpoint,
+        CustomRuleTarget,
+        ModifyCustomRuleFormData,
+    )
+    from pyctrld.api.profiles.default_rule import (
+        DefaultRuleEndpoint,
+        DefaultRuleFormData,
+    )
+    from pyctrld.api.profiles.filters import (
+        FiltersEndpoint,
+        ModifyFilterFormData,
+    )
+    from pyctrld.api.profiles.list_proxies import ListProxiesEndpoint
+    from pyctrld.api.profiles.profiles import (
+        CreateProfileFormData,
+        ModifyOptionFormData,
+        ModifyProfileFormData,
+        ProfilesEndpoint,
+    )
+    from pyctrld.api.profiles.rule_folders import (
+        CreateRuleFoldersFormData,
+        RuleFoldersEndpoint,
+        RuleFoldersFormData,
+    )
+    from pyctrld.api.profiles.services import (
+        ModifyServiceFormData,
+    )
+    from pyctrld.api.profiles.services import (
+        ServicesEndpoint as ProfileServicesEndpoint,
+    )
+    from pyctrld.api.services import ServicesEndpoint
+
+# Public name -> (module path, attribute name in that module)
+_LAZY_ATTRIBUTES: dict[str, tuple[str, str]] = {
     # Common
-    "ControlDApi",
+    "ControlDApi": ("pyctrld._api", "ControlDApi"),
     # ProfilesAPI
-    "ProfilesAPI",
+    "ProfilesAPI": ("pyctrld.api.profiles._api", "ProfilesAPI"),
     # Endpoint classes
+    "AccessEndpoint": ("pyctrld.api.access", "AccessEndpoint"),
+    "AccountEndpoint": ("pyctrld.api.account", "AccountEndpoint"),
+    "AnalyticsEndpoint": ("pyctrld.api.analytics", "AnalyticsEndpoint"),
+    "BillingEndpoint": ("pyctrld.api.billing", "BillingEndpoint"),
+    "DevicesEndpoint": ("pyctrld.api.devices", "DevicesEndpoint"),
+    "MiscEndpoint": ("pyctrld.api.misc", "MiscEndpoint"),
+    "MobileConfigEndpoint": ("pyctrld.api.mobile_config", "MobileConfigEndpoint"),
+    "OrganizationEndpoint": ("pyctrld.api.organization", "OrganizationEndpoint"),
+    "CustomRulesEndpoint": ("pyctrld.api.profiles.custom_rules", "CustomRulesEndpoint"),
+    "DefaultRuleEndpoint": ("pyctrld.api.profiles.default_rule", "DefaultRuleEndpoint"),
+    "FiltersEndpoint": ("pyctrld.api.profiles.filters", "FiltersEndpoint"),
+    "ListProxiesEndpoint": ("pyctrld.api.profiles.list_proxies", "ListProxiesEndpoint"),
+    "ProfilesEndpoint": ("pyctrld.api.profiles.profiles", "ProfilesEndpoint"),
+    "RuleFoldersEndpoint": ("pyctrld.api.profiles.rule_folders", "RuleFoldersEndpoint"),
+    "ServicesEndpoint": ("pyctrld.api.services", "ServicesEndpoint"),
+    "ProfileServicesEndpoint": ("pyctrld.api.profiles.services", "ServicesEndpoint"),
+    # Form data classes
+    "AccessFormData": ("pyctrld.api.access", "AccessFormData"),
+    "CreateDeviceFormData": ("pyctrld.api.devices", "CreateDeviceFormData"),
+    "ModifyDeviceFormData": ("pyctrld.api.devices", "ModifyDeviceFormData"),
+    "CreateSubOrganizationFromData": ("pyctrld.api.organization", "CreateSubOrganizationFromData"),
+    "ModifyOrganizationFromData": ("pyctrld.api.organization", "ModifyOrganizationFromData"),
+    # Enums and types
+    "DeviceStatus": ("pyctrld.api.devices", "DeviceStatus"),
+    # FormData - Custom Rules
+    "CreateCustomRuleFormData": ("pyctrld.api.profiles.custom_rules", "CreateCustomRuleFormData"),
+    "ModifyCustomRuleFormData": ("pyctrld.api.profiles.custom_rules", "ModifyCustomRuleFormData"),
+    "CustomRuleTarget": ("pyctrld.api.profiles.custom_rules", "CustomRuleTarget"),
+    # FormData - Default Rule
+    "DefaultRuleFormData": ("pyctrld.api.profiles.default_rule", "DefaultRuleFormData"),
+    # FormData - Filters
+    "ModifyFilterFormData": ("pyctrld.api.profiles.filters", "ModifyFilterFormData"),
+    # FormData - Profiles
+    "CreateProfileFormData": ("pyctrld.api.profiles.profiles", "CreateProfileFormData"),
+    "ModifyProfileFormData": ("pyctrld.api.profiles.profiles", "ModifyProfileFormData"),
+    "ModifyOptionFormData": ("pyctrld.api.profiles.profiles", "ModifyOptionFormData"),
+    # FormData - Rule Folders
+    "CreateRuleFoldersFormData": ("pyctrld.api.profiles.rule_folders", "CreateRuleFoldersFormData"),
+    "RuleFoldersFormData": ("pyctrld.api.profiles.rule_folders", "RuleFoldersFormData"),
+    # FormData - Services
+    "ModifyServiceFormData": ("pyctrld.api.profiles.services", "ModifyServiceFormData"),
+}
+
+__all__ = [
     "AccessEndpoint",
+    "AccessFormData",
     "AccountEndpoint",
     "AnalyticsEndpoint",
     "BillingEndpoint",
-    "DevicesEndpoint",
-    "MiscEndpoint",
-    "MobileConfigEndpoint",
-    "OrganizationEndpoint",
+    "ControlDApi",
+    "CreateCustomRuleFormData",
+    "CreateDeviceFormData",
+    "CreateProfileFormData",
+    "CreateRuleFoldersFormData",
+    "CreateSubOrganizationFromData",
+    "CustomRuleTarget",
     "CustomRulesEndpoint",
     "DefaultRuleEndpoint",
+    "DefaultRuleFormData",
+    "DeviceStatus",
+    "DevicesEndpoint",
     "FiltersEndpoint",
     "ListProxiesEndpoint",
-    "ProfilesEndpoint",
-    "RuleFoldersEndpoint",
-    "ServicesEndpoint",
-    "ProfileServicesEndpoint",
-    # Form data classes
-    "AccessFormData",
-    "CreateDeviceFormData",
-    "ModifyDeviceFormData",
-    "CreateSubOrganizationFromData",
-    "ModifyOrganizationFromData",
-    # Enums and types
-    "DeviceStatus",
-    # FormData - Custom Rules
-    "CreateCustomRuleFormData",
+    "MiscEndpoint",
+    "MobileConfigEndpoint",
     "ModifyCustomRuleFormData",
-    # FormData - Default Rule
-    "DefaultRuleFormData",
-    # FormData - Filters
+    "ModifyDeviceFormData",
     "ModifyFilterFormData",
-    # FormData - Profiles
-    "CreateProfileFormData",
-    "ModifyProfileFormData",
     "ModifyOptionFormData",
-    # FormData - Rule Folders
-    "CreateRuleFoldersFormData",
-    "RuleFoldersFormData",
-    # FormData - Services
+    "ModifyOrganizationFromData",
+    "ModifyProfileFormData",
     "ModifyServiceFormData",
+    "OrganizationEndpoint",
+    "ProfileServicesEndpoint",
+    "ProfilesAPI",
+    "ProfilesEndpoint",
+    "RuleFoldersEndpoint",
+    "RuleFoldersFormData",
+    "ServicesEndpoint",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name on first access and cache it in the module namespace.
+
+    Args:
+        name: The attribute being looked up.
+
+    Returns:
+        The resolved class or object.
+
+    Raises:
+        AttributeError: If the name is not a public attribute of the package.
+    """
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Return module attributes including lazily loaded public names.
+
+    Returns:
+        Sorted list of attribute names.
+    """
+    return sorted(set(globals()) | set(__all__))
@@ -7,24 +7,33 @@ The ControlDApi class provides access to all API endpoints through cached proper
 from __future__ import annotations
 
 from functools import cached_property
+from typing import TYPE_CHECKING
 
-from pyctrld.api.access import AccessEndpoint
-from pyctrld.api.account import AccountEndpoint
-from pyctrld.api.analytics import AnalyticsEndpoint
-from pyctrld.api.billing import BillingEndpoint
-from pyctrld.api.devices import DevicesEndpoint
-from pyctrld.api.misc import MiscEndpoint
-from pyctrld.api.mobile_config import MobileConfigEndpoint
-from pyctrld.api.organization import OrganizationEndpoint
-from pyctrld.api.profiles._api import ProfilesAPI
-from pyctrld.api.services import ServicesEndpoint
+from pyctrld._core.concurrency import DEFAULT_MAX_WORKERS
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+    from pyctrld._core.concurrency import RateLimiter
+    from pyctrld._core.models.snapshot import AccountSnapshot
+    from pyctrld.api.access import AccessEndpoint
+    from pyctrld.api.account import AccountEndpoint
+    from pyctrld.api.analytics import AnalyticsEndpoint
+    from pyctrld.api.billing import BillingEndpoint
+    from pyctrld.api.devices import DevicesEndpoint
+    from pyctrld.api.misc import MiscEndpoint
+    from pyctrld.api.mobile_config import MobileConfigEndpoint
+    from pyctrld.api.organization import OrganizationEndpoint
+    from pyctrld.api.profiles._api import ProfilesAPI
+    from pyctrld.api.services import ServicesEndpoint
 
 
 class ControlDApi:
     """Main API client for interacting with ControlD services.
 
     This class provides a unified interface to all ControlD API endpoints.
-    Each endpoint is exposed as a cached property, instantiated only when first accessed.
+    Each endpoint is exposed as a cached property; its module is imported and the
+    endpoint instantiated only when first accessed.
 
     Args:
         token: The API authentication bearer token.
@@ -62,6 +71,8 @@ class ControlDApi:
         Returns:
             AccessEndpoint instance for IP management operations.
         """
+        from pyctrld.api.access import AccessEndpoint
+
         return AccessEndpoint(token=self._token)
 
     @cached_property
@@ -71,6 +82,8 @@ class ControlDApi:
         Returns:
             AccountEndpoint instance for account operations.
         """
+        from pyctrld.api.account import AccountEndpoint
+
         return AccountEndpoint(token=self._token)
 
     @cached_property
@@ -80,6 +93,8 @@ class ControlDApi:
         Returns:
             AnalyticsEndpoint instance for analytics operations.
         """
+        from pyctrld.api.analytics import AnalyticsEndpoint
+
         return AnalyticsEndpoint(token=self._token)
 
     @cached_property
@@ -89,6 +104,8 @@ class ControlDApi:
         Returns:
             BillingEndpoint instance for billing operations.
         """
+        from pyctrld.api.billing import BillingEndpoint
+
         return BillingEndpoint(token=self._token)
 
     @cached_property
@@ -98,6 +115,8 @@ class ControlDApi:
         Returns:
             DevicesEndpoint instance for device operations.
         """
+        from pyctrld.api.devices import DevicesEndpoint
+
         return DevicesEndpoint(token=self._token)
 
     @cached_property
@@ -107,6 +126,8 @@ class ControlDApi:
         Returns:
             MiscEndpoint instance for misc operations.
         """
+        from pyctrld.api.misc import MiscEndpoint
+
         return MiscEndpoint(token=self._token)
 
     @cached_property
@@ -116,6 +137,8 @@ class ControlDApi:
         Returns:
             MobileConfigEndpoint instance for mobile config operations.
         """
+        from pyctrld.api.mobile_config import MobileConfigEndpoint
+
         return MobileConfigEndpoint(token=self._token)
 
     @cached_property
@@ -125,6 +148,8 @@ class ControlDApi:
         Returns:
             OrganizationEndpoint instance for organization operations.
         """
+        from pyctrld.api.organization import OrganizationEndpoint
+
         return OrganizationEndpoint(token=self._token)
 
     @cached_property
@@ -134,6 +159,8 @@ class ControlDApi:
         Returns:
             ProfilesAPI instance for profile operations.
         """
+        from pyctrld.api.profiles._api import ProfilesAPI
+
         return ProfilesAPI(token=self._token)
 
     @cached_property
@@ -143,4 +170,32 @@ class ControlDApi:
         Returns:
             ServicesEndpoint instance for service operations.
         """
+        from pyctrld.api.services import ServicesEndpoint
+
         return ServicesEndpoint(token=self._token)
+
+    def snapshot(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> AccountSnapshot:
+        """Capture the complete state of the account.
+
+        Profiles, rule folders, custom rules, services, filters, default rules,
+        devices, known IPs and account data are fetched concurrently; dependent
+        listings start as soon as the listing they depend on has finished.
+
+        Args:
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            AccountSnapshot of the account.
+
+        Example:
+            >>> snapshot = api.snapshot()
+            >>> backup = snapshot.model_dump_json(exclude_none=True)
+        """
+        from pyctrld.tools.snapshot import take_snapshot
+
+        return take_snapshot(self, max_workers=max_workers, rate_limiter=rate_limiter)
@@ -0,0 +1,131 @@
+"""Resumable progress tracking for bulk ControlD API operations.
+
+This module provides a small append-only journal that records which items of a
+bulk operation have been processed, so an interrupted run can resume without
+repeating finished work.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any, Iterable, Optional
+
+
+class Checkpoint:
+    """Append-only JSON lines journal of processed item keys.
+
+    Every record is written as one line ``{"key": ..., "ok": ..., ...}`` and flushed
+    immediately, so the journal survives crashes and interrupts. When the file is
+    reopened, later records for a key override earlier ones.
+
+    Args:
+        path: Location of the journal file. Created on first write.
+
+    Example:
+        >>> checkpoint = Checkpoint("import.ckpt")
+        >>> pending = [h for h in hostnames if not checkpoint.is_done(h)]
+        >>> checkpoint.mark_done(pending[:100])
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Load existing records from the journal file.
+
+        Args:
+            path: Location of the journal file.
+        """
+        self._path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._records: dict[str, dict[str, Any]] = {}
+
+        if os.path.exists(self._path):
+            with open(self._path, encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._records[record["key"]] = record
+
+    def __repr__(self) -> str:
+        """Return string representation of the checkpoint.
+
+        Returns:
+            A string showing the journal path and the number of finished items.
+        """
+        return f"<{self.__class__.__name__} path={self._path} done={len(self.done)}>"
+
+    @property
+    def done(self) -> set[str]:
+        """Keys that were processed successfully."""
+        return {key for key, record in self._records.items() if record["ok"]}
+
+    @property
+    def failed(self) -> dict[str, Optional[str]]:
+        """Keys whose last attempt failed, mapped to the recorded error."""
+        return {
+            key: record.get("error") for key, record in self._records.items() if not record["ok"]
+        }
+
+    def is_done(self, key: str) -> bool:
+        """Check whether a key was processed successfully.
+
+        Args:
+            key: Item key.
+
+        Returns:
+            True if the last record for the key is successful.
+        """
+        record = self._records.get(key)
+        return record is not None and record["ok"]
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the last record written for a key.
+
+        Args:
+            key: Item key.
+
+        Returns:
+            The record dictionary, or None if the key was never recorded.
+        """
+        return self._records.get(key)
+
+    def mark_done(self, keys: Iterable[str], **extra: Any) -> None:
+        """Record keys as processed successfully.
+
+        Args:
+            keys: Item keys.
+            **extra: Additional JSON-serializable fields stored with every record.
+        """
+        self._write([{"key": key, "ok": True, **extra} for key in keys])
+
+    def mark_failed(self, keys: Iterable[str], error: str, **extra: Any) -> None:
+        """Record keys as failed.
+
+        Args:
+            keys: Item keys.
+            error: Error message to store.
+            **extra: Additional JSON-serializable fields stored with every record.
+        """
+        self._write([{"key": key, "ok": False, "error": error, **extra} for key in keys])
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        """Append records to the journal and update the in-memory state.
+
+        Args:
+            records: Records to write.
+        """
+        if not records:
+            return
+
+        with self._lock:
+            with open(self._path, "a", encoding="utf-8") as file:
+                file.writelines(json.dumps(record) + "\n" for record in records)
+                file.flush()
+                os.fsync(file.fileno())
+
+            for record in records:
+                self._records[record["key"]] = record
@@ -0,0 +1,162 @@
+"""Concurrency helpers for bulk ControlD API operations.
+
+This module provides a thread-safe rate limiter and a bounded thread pool runner
+used by bulk endpoint methods to issue many API calls in parallel without
+overwhelming the ControlD API.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from pyctrld._core.logger import logger
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+    T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS: int = 8
+DEFAULT_RATE: float = 10.0
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting the rate of API calls.
+
+    A single instance can be shared between several bulk operations so that
+    all of them draw from the same request budget.
+
+    Args:
+        rate: Maximum sustained number of calls per second.
+        burst: Maximum number of calls allowed at once. Defaults to ``rate`` rounded up.
+
+    Example:
+        >>> limiter = RateLimiter(rate=5)
+        >>> limiter.acquire()  # blocks until a call is allowed
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: Optional[int] = None) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            rate: Maximum sustained number of calls per second.
+            burst: Maximum number of calls allowed at once.
+
+        Raises:
+            ValueError: If rate or burst is not positive.
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got: {rate}")
+
+        self._rate = rate
+        self._capacity = float(burst if burst is not None else max(1, round(rate + 0.5)))
+        if self._capacity <= 0:
+            raise ValueError(f"burst must be positive, got: {burst}")
+
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Return string representation of the rate limiter.
+
+        Returns:
+            A string showing the rate and burst capacity.
+        """
+        return f"<{self.__class__.__name__} rate={self._rate} burst={self._capacity:g}>"
+
+    def acquire(self) -> None:
+        """Block until one call is allowed by the limiter."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                delay = (1 - self._tokens) / self._rate
+
+            time.sleep(delay)
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Split an iterable into lists of at most ``size`` items.
+
+    Args:
+        items: Items to split.
+        size: Maximum chunk length.
+
+    Yields:
+        Consecutive chunks of items.
+
+    Raises:
+        ValueError: If size is not positive.
+    """
+    if size <= 0:
+        raise ValueError(f"chunk size must be positive, got: {size}")
+
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def iter_concurrently(
+    func: Callable[[T], Any],
+    items: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Iterator[tuple[T, Any, Optional[Exception]]]:
+    """Call ``func`` for every item in a thread pool and yield outcomes as they complete.
+
+    At most ``2 * max_workers`` calls are in flight at any time, so large inputs
+    are consumed lazily instead of being queued up front. Exceptions raised by
+    ``func`` are returned instead of raised, so one failing call does not abort
+    the others.
+
+    Args:
+        func: Callable invoked once per item.
+        items: Items to process.
+        max_workers: Number of worker threads.
+        rate_limiter: Optional limiter acquired before each call.
+
+    Yields:
+        Tuples of (item, result, error). ``error`` is None when the call succeeded,
+        otherwise ``result`` is None.
+    """
+
+    def call(item: T) -> Any:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return func(item)
+
+    name = getattr(func, "__name__", repr(func))
+    iterator = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: dict[Future, T] = {}
+
+        for item in islice(iterator, 2 * max_workers):
+            pending[executor.submit(call, item)] = item
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                if error is not None:
+                    logger.debug(f"{name} failed for {item!r}: {error}")
+                    yield item, None, error  # type: ignore[misc]
+                else:
+                    yield item, future.result(), None
+
+                for next_item in islice(iterator, 1):
+                    pending[executor.submit(call, next_item)] = next_item
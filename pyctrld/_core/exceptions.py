@@ -18,6 +18,7 @@ class ApiError(Exception):
 
     Attributes:
         message: Formatted error message containing HTTP status, error code, and API message.
+        status_code: HTTP status code of the response.
 
     Example:
         >>> try:
@@ -42,6 +43,7 @@ class ApiError(Exception):
             KeyError: If the response JSON doesn't contain expected error fields.
             JSONDecodeError: If the response body is not valid JSON.
         """
+        self.status_code = response.status_code
         data = response.json()["error"]
 
         message = (
@@ -8,10 +8,10 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
-from pyctrld._core.models.common import ConfiguratedBaseModel, Status
+from pyctrld._core.models.common import DeferredBaseModel, Status
 
 
-class UserData(ConfiguratedBaseModel):
+class UserData(DeferredBaseModel):
     """User account data model.
 
     Represents detailed information about a ControlD user account including
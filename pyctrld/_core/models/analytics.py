@@ -6,10 +6,10 @@ logging levels and storage endpoints.
 
 from __future__ import annotations
 
-from pyctrld._core.models.common import ConfiguratedBaseModel
+from pyctrld._core.models.common import DeferredBaseModel
 
 
-class Level(ConfiguratedBaseModel):
+class Level(DeferredBaseModel):
     """Analytics logging level configuration.
 
     Attributes:
@@ -21,7 +21,7 @@ class Level(ConfiguratedBaseModel):
     title: str
 
 
-class Endpoint(ConfiguratedBaseModel):
+class Endpoint(DeferredBaseModel):
     """Analytics storage endpoint/region configuration.
 
     Attributes:
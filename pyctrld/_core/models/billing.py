@@ -8,10 +8,10 @@ from __future__ import annotations
 
 from typing import Optional
 
-from pyctrld._core.models.common import ConfiguratedBaseModel, Status
+from pyctrld._core.models.common import DeferredBaseModel, Status
 
 
-class PricePoint(ConfiguratedBaseModel):
+class PricePoint(DeferredBaseModel):
     """Price point configuration for a product.
 
     Attributes:
@@ -59,7 +59,7 @@ class PricePoint(ConfiguratedBaseModel):
     PK: int
 
 
-class Product(ConfiguratedBaseModel):
+class Product(DeferredBaseModel):
     """Product information model.
 
     Attributes:
@@ -77,7 +77,7 @@ class Product(ConfiguratedBaseModel):
     PK: int
 
 
-class ActiveSubscription(ConfiguratedBaseModel):
+class ActiveSubscription(DeferredBaseModel):
     """Active subscription details.
 
     Attributes:
@@ -105,7 +105,7 @@ class ActiveSubscription(ConfiguratedBaseModel):
     user: str
 
 
-class Subscription(ConfiguratedBaseModel):
+class Subscription(DeferredBaseModel):
     """Subscription model with full details.
 
     Attributes:
@@ -139,7 +139,7 @@ class Subscription(ConfiguratedBaseModel):
     next_rebill_date: str
 
 
-class ActiveProduct(ConfiguratedBaseModel):
+class ActiveProduct(DeferredBaseModel):
     """Active product with subscription details.
 
     Attributes:
@@ -161,7 +161,7 @@ class ActiveProduct(ConfiguratedBaseModel):
     subscription: ActiveSubscription
 
 
-class Payment(ConfiguratedBaseModel):
+class Payment(DeferredBaseModel):
     """Payment transaction record.
 
     Attributes:
@@ -0,0 +1,55 @@
+"""Bulk operation result models for PyCtrlD.
+
+This module provides the result summary returned by bulk endpoint methods,
+which report the outcome of every processed item instead of raising on the
+first failed API call.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class BulkResult(BaseModel):
+    """Per-item outcome of a bulk operation.
+
+    Attributes:
+        succeeded: Keys (hostnames, device names, ...) processed successfully in this run.
+        failed: Keys whose API call failed, mapped to the error message.
+        skipped: Keys that needed no API call, e.g. already done according to a
+            checkpoint or already in the desired state.
+    """
+
+    succeeded: list[str] = Field(default_factory=list)
+    failed: dict[str, str] = Field(default_factory=dict)
+    skipped: list[str] = Field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if no item failed."""
+        return not self.failed
+
+
+class CallPlanResult(BulkResult):
+    """Outcome of a bulk modification with the calls that were (or would be) made.
+
+    Attributes:
+        calls: Form data payload sent for every modified key; only the fields
+            that differ from the current state are included.
+        dry_run: True if the calls were only computed, not executed.
+    """
+
+    calls: dict[str, dict[str, Any]] = Field(default_factory=dict)
+    dry_run: bool = False
+
+    def describe(self) -> str:
+        """Return the call list, one call per line.
+
+        Returns:
+            Multi-line description, or a note that nothing has to change.
+        """
+        if not self.calls:
+            return "nothing to change"
+        return "\n".join(f"modify {key} {payload}" for key, payload in self.calls.items())
@@ -41,6 +41,17 @@ class ConfiguratedBaseModel(BaseModel):
         return Do(value)
 
 
+class DeferredBaseModel(ConfiguratedBaseModel):
+    """Base model for rarely used API responses.
+
+    Behaves like ConfiguratedBaseModel but defers building the Pydantic core
+    schema until the model is first used for validation, so importing the
+    module that defines it stays cheap.
+    """
+
+    model_config = ConfigDict(extra="allow", defer_build=True)
+
+
 class ProfilesBaseModel(ConfiguratedBaseModel):
     """Base model for profile-related data structures.
 
@@ -11,7 +11,7 @@ from typing import Any, Optional
 
 from pydantic import field_validator, model_validator
 
-from pyctrld._core.models.common import ConfiguratedBaseModel, Status
+from pyctrld._core.models.common import ConfiguratedBaseModel, DeferredBaseModel, Status
 
 
 class Stats(Enum):
@@ -197,7 +197,7 @@ class Device(ConfiguratedBaseModel):
         return Stats(value)
 
 
-class Settings(ConfiguratedBaseModel):
+class Settings(DeferredBaseModel):
     """Device settings configuration.
 
     Attributes:
@@ -216,7 +216,7 @@ class Settings(ConfiguratedBaseModel):
         return Stats(value)
 
 
-class Icon(ConfiguratedBaseModel):
+class Icon(DeferredBaseModel):
     """Device icon/type definition.
 
     Attributes:
@@ -232,7 +232,7 @@ class Icon(ConfiguratedBaseModel):
     require: Optional[list[str]] = None
 
 
-class BaseIcons(ConfiguratedBaseModel):
+class BaseIcons(DeferredBaseModel):
     """Base class for icon collections with hyphen-to-underscore conversion.
 
     This model automatically converts hyphenated keys to underscored keys
@@ -268,7 +268,7 @@ class OsIcons(BaseIcons):
     desktop_linux: Icon
 
 
-class Os(ConfiguratedBaseModel):
+class Os(DeferredBaseModel):
     """Operating system device type category.
 
     Attributes:
@@ -298,7 +298,7 @@ class BrowserIcons(BaseIcons):
     browser_other: Icon
 
 
-class Browser(ConfiguratedBaseModel):
+class Browser(DeferredBaseModel):
     """Browser device type category.
 
     Attributes:
@@ -328,7 +328,7 @@ class TvIcons(BaseIcons):
     tv_samsung: Icon
 
 
-class Tv(ConfiguratedBaseModel):
+class Tv(DeferredBaseModel):
     """TV device type category.
 
     Attributes:
@@ -374,7 +374,7 @@ class RouterIcons(BaseIcons):
     router_firewalla: Icon
 
 
-class Router(ConfiguratedBaseModel):
+class Router(DeferredBaseModel):
     """Router device type category.
 
     Attributes:
@@ -388,7 +388,7 @@ class Router(ConfiguratedBaseModel):
     setup_url: str
 
 
-class DeviceTypes(ConfiguratedBaseModel):
+class DeviceTypes(DeferredBaseModel):
     """Complete device types categorization.
 
     Contains all available device type categories and their icons.
@@ -10,13 +10,13 @@ from typing import TYPE_CHECKING
 
 from pydantic import field_validator
 
-from pyctrld._core.models.common import ConfiguratedBaseModel
+from pyctrld._core.models.common import DeferredBaseModel
 
 if TYPE_CHECKING:
     from typing import Any
 
 
-class Ip(ConfiguratedBaseModel):
+class Ip(DeferredBaseModel):
     """IP information model.
 
     Attributes:
@@ -38,7 +38,7 @@ class Ip(ConfiguratedBaseModel):
     pop: str
 
 
-class Location(ConfiguratedBaseModel):
+class Location(DeferredBaseModel):
     """Geographic location coordinates.
 
     Attributes:
@@ -50,7 +50,7 @@ class Location(ConfiguratedBaseModel):
     long: float
 
 
-class FeatureStatus(ConfiguratedBaseModel):
+class FeatureStatus(DeferredBaseModel):
     """Feature availability status at a network location.
 
     Attributes:
@@ -64,7 +64,7 @@ class FeatureStatus(ConfiguratedBaseModel):
     pxy: int
 
 
-class Network(ConfiguratedBaseModel):
+class Network(DeferredBaseModel):
     """Network point of presence (POP) information.
 
     Attributes:
@@ -6,10 +6,10 @@ including members, permissions, and resource limits.
 
 from __future__ import annotations
 
-from pyctrld._core.models.common import ConfiguratedBaseModel, Count, Status
+from pyctrld._core.models.common import Count, DeferredBaseModel, Status
 
 
-class Members(Count):
+class Members(Count, DeferredBaseModel):
     """Member count information.
 
     Inherits from Count to provide member count data.
@@ -18,7 +18,7 @@ class Members(Count):
     pass
 
 
-class Profiles(Count):
+class Profiles(Count, DeferredBaseModel):
     """Profile count and limit information.
 
     Attributes:
@@ -56,7 +56,7 @@ class SubOrganizations(Profiles):
     pass
 
 
-class BaseOrganization(ConfiguratedBaseModel):
+class BaseOrganization(DeferredBaseModel):
     """Base organization model with common fields.
 
     Attributes:
@@ -112,7 +112,7 @@ class Organization(BaseOrganization):
     max_sub_orgs: int
 
 
-class Permission(ConfiguratedBaseModel):
+class Permission(DeferredBaseModel):
     """Member permission configuration.
 
     Attributes:
@@ -124,7 +124,7 @@ class Permission(ConfiguratedBaseModel):
     printable: bool
 
 
-class Member(ConfiguratedBaseModel):
+class Member(DeferredBaseModel):
     """Organization member model.
 
     Attributes:
@@ -144,7 +144,7 @@ class Member(ConfiguratedBaseModel):
     permission: Permission
 
 
-class ParentOrg(ConfiguratedBaseModel):
+class ParentOrg(DeferredBaseModel):
     """Parent organization reference.
 
     Attributes:
@@ -156,7 +156,7 @@ class ParentOrg(ConfiguratedBaseModel):
     PK: str
 
 
-class ParentProfile(ConfiguratedBaseModel):
+class ParentProfile(DeferredBaseModel):
     """Parent profile reference.
 
     Attributes:
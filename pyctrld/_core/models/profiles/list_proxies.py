@@ -8,13 +8,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
 
-from pyctrld._core.models.common import ConfiguratedBaseModel
+from pyctrld._core.models.common import DeferredBaseModel
 
 if TYPE_CHECKING:
     from typing import Optional
 
 
-class Proxie(ConfiguratedBaseModel):
+class Proxie(DeferredBaseModel):
     """Proxy server model.
 
     Represents a proxy server location that can be used to redirect DNS traffic
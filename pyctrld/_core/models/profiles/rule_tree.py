@@ -0,0 +1,97 @@
+"""Rule tree models for ControlD API.
+
+This module provides data models describing the complete custom rule layout of
+a profile: every rule folder together with the custom rules inside it.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from pydantic import BaseModel, Field
+
+from pyctrld._core.models.profiles.custom_rules import CustomRule
+from pyctrld._core.models.profiles.rule_folders import RuleFolder
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+
+class FolderRules(BaseModel):
+    """A rule folder and the custom rules it contains.
+
+    Attributes:
+        folder: The folder, None for the root folder.
+        rules: Custom rules in the folder keyed by hostname (rule PK).
+    """
+
+    folder: Optional[RuleFolder] = None
+    rules: dict[str, CustomRule] = Field(default_factory=dict)
+
+
+class RuleTree(BaseModel):
+    """All rule folders of a profile with their custom rules.
+
+    Attributes:
+        profile_id: Primary key (PK) of the profile.
+        folders: Folders keyed by folder PK. The root folder uses key 0.
+    """
+
+    profile_id: str
+    folders: dict[int, FolderRules] = Field(default_factory=dict)
+
+    @classmethod
+    def from_listing(
+        cls,
+        profile_id: str,
+        folders: Iterable[RuleFolder],
+        rules: dict[int, list[CustomRule]],
+    ) -> RuleTree:
+        """Build a rule tree from folder and per-folder rule listings.
+
+        Args:
+            profile_id: Primary key (PK) of the profile.
+            folders: Rule folders of the profile.
+            rules: Custom rules keyed by folder PK, 0 for the root folder.
+
+        Returns:
+            RuleTree with the root folder first, followed by the folders in listing order.
+        """
+        tree = cls(profile_id=profile_id)
+        tree.folders[0] = FolderRules(rules={rule.PK: rule for rule in rules.get(0, [])})
+        for folder in folders:
+            tree.folders[folder.PK] = FolderRules(
+                folder=folder, rules={rule.PK: rule for rule in rules.get(folder.PK, [])}
+            )
+        return tree
+
+    @property
+    def root(self) -> FolderRules:
+        """The root folder holding rules that are not inside any folder."""
+        return self.folders.setdefault(0, FolderRules())
+
+    def rules(self) -> dict[str, CustomRule]:
+        """Return every custom rule of the profile keyed by hostname.
+
+        Returns:
+            Mapping of hostname to CustomRule across all folders.
+        """
+        return {
+            hostname: rule
+            for folder in self.folders.values()
+            for hostname, rule in folder.rules.items()
+        }
+
+    def find(self, hostname: str) -> Optional[CustomRule]:
+        """Return the custom rule for a hostname, wherever it is in the profile.
+
+        Args:
+            hostname: Hostname (rule PK) to look up.
+
+        Returns:
+            The CustomRule, or None if the profile has no rule for the hostname.
+        """
+        for folder in self.folders.values():
+            if hostname in folder.rules:
+                return folder.rules[hostname]
+        return None
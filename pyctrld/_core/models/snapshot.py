@@ -0,0 +1,101 @@
+"""Account snapshot models for PyCtrlD.
+
+This module provides serializable models that capture the complete state of a
+ControlD account: profiles with their rules, services, filters and default rule,
+devices with their known IPs, and account data.
+"""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+from pyctrld._core.models.access import Ips
+from pyctrld._core.models.account import UserData
+from pyctrld._core.models.common import Action
+from pyctrld._core.models.devices import Device
+from pyctrld._core.models.profiles.filters import NativeFilter, ThirdPartyFilter
+from pyctrld._core.models.profiles.profiles import Option, ProfileObject
+from pyctrld._core.models.profiles.rule_tree import RuleTree
+from pyctrld._core.models.profiles.services import Service
+
+
+class ProfileSnapshot(BaseModel):
+    """Complete state of a single profile.
+
+    Attributes:
+        profile: The profile object, including its options (``profile.profile.opt``).
+        rule_tree: Rule folders with their custom rules.
+        services: Services that have a rule in the profile.
+        native_filters: Native ControlD filters and their states.
+        third_party_filters: Third-party filters and their states.
+        default_rule: The default rule of the profile.
+    """
+
+    profile: ProfileObject
+    rule_tree: RuleTree
+    services: list[Service] = Field(default_factory=list)
+    native_filters: list[NativeFilter] = Field(default_factory=list)
+    third_party_filters: list[ThirdPartyFilter] = Field(default_factory=list)
+    default_rule: Action
+
+
+class DeviceSnapshot(BaseModel):
+    """State of a single device.
+
+    Attributes:
+        device: The device object.
+        known_ips: IPs recently used to query against the device.
+    """
+
+    device: Device
+    known_ips: list[Ips] = Field(default_factory=list)
+
+
+class AccountSnapshot(BaseModel):
+    """Complete state of a ControlD account at a point in time.
+
+    Use ``model_dump_json(exclude_none=True)`` to serialize a snapshot and
+    ``AccountSnapshot.model_validate_json()`` to load it back.
+
+    Attributes:
+        taken_at: Unix timestamp of when the snapshot was started.
+        user: Account data.
+        options: Available profile option definitions.
+        profiles: Profile snapshots keyed by profile PK.
+        devices: Device snapshots keyed by device PK.
+    """
+
+    taken_at: int
+    user: UserData
+    options: list[Option] = Field(default_factory=list)
+    profiles: dict[str, ProfileSnapshot] = Field(default_factory=dict)
+    devices: dict[str, DeviceSnapshot] = Field(default_factory=dict)
+
+
+class SyncState(BaseModel):
+    """Locally stored profile state maintained by incremental syncs.
+
+    Attributes:
+        synced_at: Unix timestamp of the last sync.
+        profiles: Profile snapshots keyed by profile PK. Each snapshot holds the
+            profile object, and thus the ``updated`` timestamp it was fetched at.
+    """
+
+    synced_at: int = 0
+    profiles: dict[str, ProfileSnapshot] = Field(default_factory=dict)
+
+
+class SyncResult(BaseModel):
+    """Outcome of an incremental sync.
+
+    Attributes:
+        state: The updated sync state.
+        refreshed: PKs of new or changed profiles whose sub-resources were fetched.
+        unchanged: PKs of profiles reused from the previous state.
+        removed: PKs of profiles that no longer exist.
+    """
+
+    state: SyncState
+    refreshed: list[str] = Field(default_factory=list)
+    unchanged: list[str] = Field(default_factory=list)
+    removed: list[str] = Field(default_factory=list)
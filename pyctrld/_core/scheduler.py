@@ -0,0 +1,174 @@
+"""Dependency-aware task scheduler for concurrent ControlD API calls.
+
+This module provides a small DAG scheduler: every task may depend on other tasks
+and is started as soon as all of its dependencies have finished. Tasks may add
+new tasks while running, which allows fanning out over results (e.g. one task
+per profile once the profile list is known).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+
+from pyctrld._core.concurrency import DEFAULT_MAX_WORKERS
+from pyctrld._core.logger import logger
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from typing import Any, Callable, Hashable, Iterable, Optional
+
+    from pyctrld._core.concurrency import RateLimiter
+
+
+class TaskScheduler:
+    """Run a graph of dependent tasks in a thread pool under one rate budget.
+
+    Each task is a callable receiving the results of its dependencies as
+    positional arguments, in the order the dependencies were given.
+
+    Args:
+        max_workers: Number of tasks executed concurrently.
+        rate_limiter: Optional limiter acquired before each task is executed.
+
+    Example:
+        >>> scheduler = TaskScheduler(max_workers=4)
+        >>> scheduler.add("profiles", api.profiles.profiles.list)
+        >>> scheduler.add("count", len, depends_on=["profiles"])
+        >>> scheduler.run()["count"]
+        3
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """Initialize an empty scheduler.
+
+        Args:
+            max_workers: Number of tasks executed concurrently.
+            rate_limiter: Optional limiter acquired before each task is executed.
+        """
+        self._max_workers = max_workers
+        self._rate_limiter = rate_limiter
+
+        self._lock = threading.Lock()
+        self._tasks: dict[Hashable, tuple[Callable[..., Any], tuple[Hashable, ...]]] = {}
+        self._dependents: dict[Hashable, list[Hashable]] = {}
+        self._unresolved: dict[Hashable, int] = {}
+        self._ready: deque[Hashable] = deque()
+        self._results: dict[Hashable, Any] = {}
+
+    def __repr__(self) -> str:
+        """Return string representation of the scheduler.
+
+        Returns:
+            A string showing the number of tasks and finished tasks.
+        """
+        return f"<{self.__class__.__name__} tasks={len(self._tasks)} done={len(self._results)}>"
+
+    def add(
+        self, key: Hashable, func: Callable[..., Any], depends_on: Iterable[Hashable] = ()
+    ) -> None:
+        """Add a task to the graph.
+
+        Can be called before run() or from inside a running task.
+
+        Args:
+            key: Unique task key, used to reference the task and its result.
+            func: Callable executed with the results of the dependencies.
+            depends_on: Keys of previously added tasks this task depends on.
+
+        Raises:
+            ValueError: If the key is already used or a dependency is unknown.
+        """
+        dependencies = tuple(depends_on)
+
+        with self._lock:
+            if key in self._tasks:
+                raise ValueError(f"task {key!r} already exists")
+
+            unknown = [dependency for dependency in dependencies if dependency not in self._tasks]
+            if unknown:
+                raise ValueError(f"task {key!r} depends on unknown tasks: {unknown!r}")
+
+            self._tasks[key] = (func, dependencies)
+            unresolved = 0
+            for dependency in dependencies:
+                if dependency not in self._results:
+                    self._dependents.setdefault(dependency, []).append(key)
+                    unresolved += 1
+
+            if unresolved:
+                self._unresolved[key] = unresolved
+            else:
+                self._ready.append(key)
+
+    def run(self) -> dict[Hashable, Any]:
+        """Execute all tasks, including tasks added while running.
+
+        Returns:
+            Mapping of task key to its result.
+
+        Raises:
+            Exception: The first exception raised by a task. Tasks that were not
+                started yet are cancelled.
+        """
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            running: dict[Future, Hashable] = {}
+
+            while True:
+                with self._lock:
+                    while self._ready:
+                        key = self._ready.popleft()
+                        running[executor.submit(self._execute, key)] = key
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        logger.debug(f"Task {key!r} failed: {error}")
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        raise error
+
+                    self._resolve(key, future.result())
+
+        return self._results
+
+    def _execute(self, key: Hashable) -> Any:
+        """Execute a single task with the results of its dependencies.
+
+        Args:
+            key: Task key.
+
+        Returns:
+            The task result.
+        """
+        func, dependencies = self._tasks[key]
+        arguments = [self._results[dependency] for dependency in dependencies]
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        return func(*arguments)
+
+    def _resolve(self, key: Hashable, result: Any) -> None:
+        """Store a task result and release dependents whose dependencies are all done.
+
+        Args:
+            key: Task key.
+            result: The task result.
+        """
+        with self._lock:
+            self._results[key] = result
+            for dependent in self._dependents.pop(key, []):
+                self._unresolved[dependent] -= 1
+                if not self._unresolved[dependent]:
+                    del self._unresolved[dependent]
+                    self._ready.append(dependent)
@@ -1,10 +1,29 @@
 from __future__ import annotations
 
+import ipaddress
+from typing import TYPE_CHECKING, Optional
+
+from pyctrld._core.concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    chunked,
+    iter_concurrently,
+)
+from pyctrld._core.logger import logger
 from pyctrld._core.models.access import Ips
+from pyctrld._core.models.bulk import CallPlanResult
 from pyctrld._core.models.common import BaseFormData
 from pyctrld._core.urls import Endpoints
 from pyctrld._core.utils import BaseEndpoint
 
+if TYPE_CHECKING:
+    from typing import Iterable
+
+ACCESS_CHUNK_SIZE: int = 100
+MAX_CIDR_SIZE: int = 256
+# Maximum number of IPs returned by list_known_ips()
+KNOWN_IPS_LIMIT: int = 50
+
 
 class AccessFormData(BaseFormData):
     """
@@ -53,3 +72,142 @@ class AccessEndpoint(BaseEndpoint):
         """
         self._delete(self._url, data=form_data.model_dump_json())
         return True
+
+    def bulk_authorize_ips(
+        self,
+        ips: dict[str, Iterable[str]],
+        replace: bool = False,
+        max_cidr_size: int = MAX_CIDR_SIZE,
+        chunk_size: int = ACCESS_CHUNK_SIZE,
+        dry_run: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> CallPlanResult:
+        """Authorize IPs and CIDR ranges on many devices, sending only what is missing.
+
+        CIDR ranges of up to ``max_cidr_size`` addresses are expanded to their
+        host addresses. The known IPs of every device are fetched concurrently and IPs that
+        are already authorized are dropped. With ``replace``, known IPs that are
+        not in the new list are deleted, e.g. when egress IPs are rotated. Learn
+        and delete calls of up to ``chunk_size`` IPs are sent concurrently.
+
+        list_known_ips() returns the latest 50 IPs of a device only, so older
+        authorized IPs are sent again. Since IPs beyond the listing cannot be
+        deleted, ``replace`` fails devices with 50 or more known IPs without
+        sending anything for them.
+
+        Args:
+            ips: IPs and CIDR ranges to authorize, keyed by device PK.
+            replace: Delete known IPs that are not listed for the device.
+            max_cidr_size: Maximum number of addresses of an expanded CIDR range.
+            chunk_size: Maximum number of IPs per learn or delete request.
+            dry_run: Only compute the calls without sending them. Nothing is printed;
+                call ``describe()`` on the result to show the call list.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            CallPlanResult: Updated, failed and skipped (already authorized) device
+            PKs, and the IPs to learn and delete of every updated device.
+
+        Raises:
+            ValueError: If an entry is not an IP or CIDR range, or a range is larger
+                than ``max_cidr_size``.
+
+        Example:
+            >>> api.access.bulk_authorize_ips({"dev1": ["203.0.113.0/28"]}, replace=True).ok
+            True
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+        desired = {
+            device_id: _expand_ips(entries, max_cidr_size) for device_id, entries in ips.items()
+        }
+
+        result = CallPlanResult(dry_run=dry_run)
+        for device_id, known, error in iter_concurrently(
+            self.list_known_ips, desired, max_workers, rate_limiter
+        ):
+            if error is not None:
+                result.failed[device_id] = str(error)
+                continue
+
+            if replace and len(known) >= KNOWN_IPS_LIMIT:
+                result.failed[device_id] = (
+                    f"cannot replace: the device has {KNOWN_IPS_LIMIT} or more known IPs "
+                    "and older IPs are not listed"
+                )
+                continue
+
+            known_ips = {_normalize_ip(item.ip) for item in known}
+            learn = [ip for ip in desired[device_id] if ip not in known_ips]
+            delete = sorted(known_ips - desired[device_id].keys()) if replace else []
+            if learn or delete:
+                result.calls[device_id] = {"learn": learn, "delete": delete}
+            else:
+                result.skipped.append(device_id)
+
+        if dry_run:
+            logger.info(f"Access bulk authorize (dry run):\n{result.describe()}")
+            return result
+
+        requests = [
+            (method, AccessFormData(device_id=device_id, ips=chunk))
+            for device_id, call in result.calls.items()
+            for method, key in ((self.learn_new_ip, "learn"), (self.delete_learned_ip, "delete"))
+            for chunk in chunked(call[key], chunk_size)
+        ]
+        for (_, form_data), _, error in iter_concurrently(
+            lambda request: request[0](request[1]), requests, max_workers, rate_limiter
+        ):
+            if error is not None:
+                result.failed.setdefault(form_data.device_id, str(error))
+        result.succeeded = [
+            device_id for device_id in result.calls if device_id not in result.failed
+        ]
+
+        logger.info(
+            f"Access bulk authorize: {len(result.succeeded)} devices updated with "
+            f"{len(requests)} requests, {len(result.failed)} failed, "
+            f"{len(result.skipped)} already up to date"
+        )
+        return result
+
+
+def _normalize_ip(ip: str) -> str:
+    """Return the canonical text form of an IP, or the input if it is not an IP."""
+    try:
+        return ipaddress.ip_address(ip).compressed
+    except ValueError:
+        return ip
+
+
+def _expand_ips(entries: Iterable[str], max_cidr_size: int) -> dict[str, None]:
+    """Expand IPs and CIDR ranges to unique canonical IPs.
+
+    Args:
+        entries: IPs and CIDR ranges.
+        max_cidr_size: Maximum number of addresses of a range.
+
+    Returns:
+        Ordered set (dict keys) of IPs.
+
+    Raises:
+        ValueError: If an entry is invalid or a range is too large.
+    """
+    ips: dict[str, None] = {}
+    for entry in entries:
+        if "/" not in entry:
+            ips[ipaddress.ip_address(entry.strip()).compressed] = None
+            continue
+
+        network = ipaddress.ip_network(entry.strip(), strict=False)
+        if network.num_addresses > max_cidr_size:
+            raise ValueError(
+                f"{entry} has {network.num_addresses} addresses, more than {max_cidr_size}"
+            )
+        if network.num_addresses == 1:
+            ips[network.network_address.compressed] = None
+        else:
+            ips.update(dict.fromkeys(ip.compressed for ip in network.hosts()))
+    return ips
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
-from typing import Literal, Optional
-
+import json
+import os
+from typing import TYPE_CHECKING, Any, Literal, Optional
+
+from pyctrld._core.concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
+from pyctrld._core.logger import logger
+from pyctrld._core.models.bulk import BulkResult, CallPlanResult
 from pyctrld._core.models.common import BaseFormData
 from pyctrld._core.models.devices import Device, DeviceStatus, DeviceTypes, Stats
 from pyctrld._core.urls import Endpoints
 from pyctrld._core.utils import BaseEndpoint
 
+if TYPE_CHECKING:
+    from enum import Enum
+    from pathlib import Path
+    from typing import IO, Iterable
+
 _icon_list = Literal[
     "mobile-ios",
     "mobile-android",
@@ -207,3 +221,236 @@ class DevicesEndpoint(BaseEndpoint):
 
         self._delete(self._url + f"/{device_id}")
         return True
+
+    def bulk_create_devices(
+        self,
+        form_data: Iterable[CreateDeviceFormData],
+        key: Literal["name", "desc"] = "name",
+        output: Optional[str | Path] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> BulkResult:
+        """
+        Create many Devices, skipping the ones that already exist.
+
+        Existing devices are looked up with a single list_all_devices() call and
+        matched by ``key``: the device name, or the description when it holds an
+        external key such as a router serial number. Rows repeating the key of an
+        earlier row are not sent, the remaining devices are created concurrently.
+
+        When ``output`` is given, one JSON line with the key, PK and resolvers
+        (DoH, DoT, legacy v4/v6) of every created or already existing device is
+        appended to that file as soon as it is known.
+
+        Args:
+            form_data: Creation form data of every device.
+            key: Field identifying a device across runs.
+            output: Optional path of the resolver output file (JSON lines).
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            BulkResult: Keys of created, failed and skipped (already existing) devices.
+                Rows without a ``key`` value fail under their device name, rows
+                repeating a key fail under ``"<key> (row <n>)"``, counting from 1.
+
+        Example:
+            >>> rows = [CreateDeviceFormData(name=f"router-{n}", profile_id="PK", icon="router")
+            ...         for n in range(2000)]
+            >>> api.devices.bulk_create_devices(rows, output="resolvers.ndjson").failed
+            {}
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+        existing = {getattr(device, key): device for device in self.list_all_devices()}
+
+        result = BulkResult()
+        rows: dict[str, int] = {}
+        found: dict[str, Device] = {}
+        pending: dict[str, CreateDeviceFormData] = {}
+        for row, data in enumerate(form_data, 1):
+            device_key = getattr(data, key)
+            if device_key is None:
+                result.failed[data.name] = f"{key} is required to identify the device"
+            elif device_key in rows:
+                result.failed[f"{device_key} (row {row})"] = (
+                    f"duplicate {key}, first given in row {rows[device_key]}"
+                )
+            else:
+                rows[device_key] = row
+                if device_key in existing:
+                    found[device_key] = existing[device_key]
+                else:
+                    pending[device_key] = data
+
+        with open(os.devnull if output is None else output, "a", encoding="utf-8") as file:
+            for device_key, device in found.items():
+                result.skipped.append(device_key)
+                _write_resolvers(file, device_key, device, created=False)
+
+            for data, device, error in iter_concurrently(
+                self.create_device, pending.values(), max_workers, rate_limiter
+            ):
+                device_key = getattr(data, key)
+                if error is not None:
+                    result.failed[device_key] = str(error)
+                else:
+                    result.succeeded.append(device_key)
+                    _write_resolvers(file, device_key, device, created=True)
+
+        logger.info(
+            f"Devices bulk create: {len(result.succeeded)} created, "
+            f"{len(result.failed)} failed, {len(result.skipped)} already existing"
+        )
+        return result
+
+    def modify_devices(
+        self,
+        form_data: ModifyDeviceFormData,
+        device_ids: Optional[Iterable[str]] = None,
+        filter: Literal["all", "users", "routers"] = "all",
+        profile_id: Optional[str] = None,
+        dry_run: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> CallPlanResult:
+        """
+        Apply the same changes to every selected Device, skipping devices already in that state.
+
+        Devices are selected with a single list_all_devices() call: by type
+        (``filter``), by enforced profile and/or by PK. Every device is compared
+        with the form data and only the fields that differ are sent; devices
+        where nothing would change are skipped. The remaining modify_device()
+        calls run concurrently.
+
+        Fields without a counterpart in the Device model (``profile_id2``,
+        ``ctrld_custom_config``) are always sent.
+
+        Args:
+            form_data: Fields to update.
+            device_ids: Primary keys (PK) of the devices to modify. Defaults to all
+                devices matching the other selectors.
+            filter: Only modify devices of this type.
+            profile_id: Only modify devices enforcing this profile.
+            dry_run: Only compute the calls without sending them. Nothing is printed;
+                call ``describe()`` on the result to show the call list.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            CallPlanResult: Modified, failed and skipped (unchanged) device PKs and
+            the payload of every call.
+
+        Example:
+            >>> result = api.devices.modify_devices(
+            ...     ModifyDeviceFormData(stats="FULL"), filter="routers", dry_run=True
+            ... )
+            >>> print(result.describe())
+            modify 8fj2k3l1 {'stats': 2}
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+        devices = [
+            device
+            for device in self.list_all_devices(filter)
+            if profile_id is None or device.profile.PK == profile_id
+        ]
+
+        result = CallPlanResult(dry_run=dry_run)
+        if device_ids is not None:
+            by_id = {device.PK: device for device in devices}
+            devices = []
+            for device_id in dict.fromkeys(device_ids):
+                if device_id in by_id:
+                    devices.append(by_id[device_id])
+                else:
+                    result.failed[device_id] = "device not found or not selected"
+
+        changes: dict[str, ModifyDeviceFormData] = {}
+        for device in devices:
+            changed = _changed_fields(device, form_data)
+            if changed:
+                changes[device.PK] = ModifyDeviceFormData(
+                    **{name: getattr(form_data, name) for name in changed}
+                )
+                result.calls[device.PK] = changes[device.PK].model_dump(
+                    mode="json", exclude_none=True
+                )
+            else:
+                result.skipped.append(device.PK)
+
+        if dry_run:
+            logger.info(f"Devices bulk modify (dry run):\n{result.describe()}")
+            return result
+
+        for device_id, _, error in iter_concurrently(
+            lambda device_id: self.modify_device(device_id, changes[device_id]),
+            changes,
+            max_workers,
+            rate_limiter,
+        ):
+            if error is not None:
+                result.failed[device_id] = str(error)
+            else:
+                result.succeeded.append(device_id)
+
+        logger.info(
+            f"Devices bulk modify: {len(result.succeeded)} modified, "
+            f"{len(result.failed)} failed, {len(result.skipped)} unchanged"
+        )
+        return result
+
+
+def _write_resolvers(file: IO[str], key: str, device: Device, created: bool) -> None:
+    """Append the resolvers of a device to the output file and flush it.
+
+    Args:
+        file: Open output file.
+        key: Key of the device.
+        device: The device.
+        created: Whether the device was created in this run.
+    """
+    record = {
+        "key": key,
+        "PK": device.PK,
+        "created": created,
+        "resolvers": device.resolvers.model_dump(exclude_none=True),
+    }
+    file.write(json.dumps(record) + "\n")
+    file.flush()
+
+
+def _changed_fields(device: Device, form_data: ModifyDeviceFormData) -> list[str]:
+    """Return the fields of the form data that differ from the current device state.
+
+    Args:
+        device: Current state of the device.
+        form_data: Fields to update.
+
+    Returns:
+        Names of the set fields that would change the device.
+    """
+
+    def status(value: Optional[Enum]) -> Optional[int]:
+        return value.value if value is not None else None
+
+    current: dict[str, Any] = {
+        "name": device.name,
+        "profile_id": device.profile.PK,
+        "stats": status(device.stats),
+        "legacy_ipv4_status": status(device.legacy_ipv4.status) if device.legacy_ipv4 else 0,
+        "learn_ip": status(device.learn_ip),
+        "restricted": status(device.restricted),
+        "bump_tls": status(device.bump_tls),
+        "desc": device.desc,
+        "ddns_status": status(device.ddns.status) if device.ddns else None,
+        "ddns_subdomain": device.ddns.subdomain if device.ddns else None,
+        "ddns_ext_status": status(device.ddns_ext.status) if device.ddns_ext else None,
+        "ddns_ext_host": device.ddns_ext.host if device.ddns_ext else None,
+        "status": status(device.status),
+    }
+    return [
+        name
+        for name, value in form_data.model_dump(mode="json", exclude_none=True).items()
+        if name not in current or current[name] != value
+    ]
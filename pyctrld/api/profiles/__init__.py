@@ -2,66 +2,128 @@
 
 This package contains all profile-related endpoints and form data classes for managing
 DNS profiles, custom rules, filters, services, and rule folders in the ControlD API.
+
+Public names are resolved lazily on first attribute access.
 """
 
 from __future__ import annotations
 
-from pyctrld.api.profiles._api import ProfilesAPI
-from pyctrld.api.profiles.custom_rules import (
-    CreateCustomRuleFormData,
-    CustomRulesEndpoint,
-    ModifyCustomRuleFormData,
-)
-from pyctrld.api.profiles.default_rule import (
-    DefaultRuleEndpoint,
-    DefaultRuleFormData,
-)
-from pyctrld.api.profiles.filters import (
-    FiltersEndpoint,
-    ModifyFilterFormData,
-)
-from pyctrld.api.profiles.list_proxies import ListProxiesEndpoint
-from pyctrld.api.profiles.profiles import (
-    CreateProfileFormData,
-    ModifyOptionFormData,
-    ModifyProfileFormData,
-    ProfilesEndpoint,
-)
-from pyctrld.api.profiles.rule_folders import (
-    CreateRuleFoldersFormData,
-    RuleFoldersEndpoint,
-    RuleFoldersFormData,
-)
-from pyctrld.api.profiles.services import (
-    ModifyServiceFormData,
-    ServicesEndpoint,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__all__ = [
+if TYPE_CHECKING:
+    from pyctrld.api.profiles._api import ProfilesAPI
+    from pyctrld.api.profiles.custom_rules import (
+        CreateCustomRuleFormData,
+        CustomRulesEndpoint,
+        CustomRuleTarget,
+        ModifyCustomRuleFormData,
+    )
+    from pyctrld.api.profiles.default_rule import (
+        DefaultRuleEndpoint,
+        DefaultRuleFormData,
+    )
+    from pyctrld.api.profiles.filters import (
+        FiltersEndpoint,
+        ModifyFilterFormData,
+    )
+    from pyctrld.api.profiles.list_proxies import ListProxiesEndpoint
+    from pyctrld.api.profiles.profiles import (
+        CreateProfileFormData,
+        ModifyOptionFormData,
+        ModifyProfileFormData,
+        ProfilesEndpoint,
+    )
+    from pyctrld.api.profiles.rule_folders import (
+        CreateRuleFoldersFormData,
+        RuleFoldersEndpoint,
+        RuleFoldersFormData,
+    )
+    from pyctrld.api.profiles.services import (
+        ModifyServiceFormData,
+        ServicesEndpoint,
+    )
+
+# Public name -> submodule of this package that defines it
+_LAZY_ATTRIBUTES: dict[str, str] = {
     # Common
-    "ProfilesAPI",
+    "ProfilesAPI": "_api",
     # Endpoints
+    "CustomRulesEndpoint": "custom_rules",
+    "DefaultRuleEndpoint": "default_rule",
+    "FiltersEndpoint": "filters",
+    "ListProxiesEndpoint": "list_proxies",
+    "ProfilesEndpoint": "profiles",
+    "RuleFoldersEndpoint": "rule_folders",
+    "ServicesEndpoint": "services",
+    # FormData - Custom Rules
+    "CreateCustomRuleFormData": "custom_rules",
+    "ModifyCustomRuleFormData": "custom_rules",
+    "CustomRuleTarget": "custom_rules",
+    # FormData - Default Rule
+    "DefaultRuleFormData": "default_rule",
+    # FormData - Filters
+    "ModifyFilterFormData": "filters",
+    # FormData - Profiles
+    "CreateProfileFormData": "profiles",
+    "ModifyProfileFormData": "profiles",
+    "ModifyOptionFormData": "profiles",
+    # FormData - Rule Folders
+    "CreateRuleFoldersFormData": "rule_folders",
+    "RuleFoldersFormData": "rule_folders",
+    # FormData - Services
+    "ModifyServiceFormData": "services",
+}
+
+__all__ = [
+    "CreateCustomRuleFormData",
+    "CreateProfileFormData",
+    "CreateRuleFoldersFormData",
+    "CustomRuleTarget",
     "CustomRulesEndpoint",
     "DefaultRuleEndpoint",
+    "DefaultRuleFormData",
     "FiltersEndpoint",
     "ListProxiesEndpoint",
-    "ProfilesEndpoint",
-    "RuleFoldersEndpoint",
-    "ServicesEndpoint",
-    # FormData - Custom Rules
-    "CreateCustomRuleFormData",
     "ModifyCustomRuleFormData",
-    # FormData - Default Rule
-    "DefaultRuleFormData",
-    # FormData - Filters
     "ModifyFilterFormData",
-    # FormData - Profiles
-    "CreateProfileFormData",
-    "ModifyProfileFormData",
     "ModifyOptionFormData",
-    # FormData - Rule Folders
-    "CreateRuleFoldersFormData",
-    "RuleFoldersFormData",
-    # FormData - Services
+    "ModifyProfileFormData",
     "ModifyServiceFormData",
+    "ProfilesAPI",
+    "ProfilesEndpoint",
+    "RuleFoldersEndpoint",
+    "RuleFoldersFormData",
+    "ServicesEndpoint",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name on first access and cache it in the package namespace.
+
+    Args:
+        name: The attribute being looked up.
+
+    Returns:
+        The resolved class.
+
+    Raises:
+        AttributeError: If the name is not a public attribute of the package.
+    """
+    try:
+        submodule = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(import_module(f"{__name__}.{submodule}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Return package attributes including lazily loaded public names.
+
+    Returns:
+        Sorted list of attribute names.
+    """
+    return sorted(set(globals()) | set(__all__))
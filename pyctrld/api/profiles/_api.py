@@ -7,21 +7,30 @@ custom rules, default rules, filters, proxies, and services.
 from __future__ import annotations
 
 from functools import cached_property
+from typing import TYPE_CHECKING
 
-from pyctrld.api.profiles.custom_rules import CustomRulesEndpoint
-from pyctrld.api.profiles.default_rule import DefaultRuleEndpoint
-from pyctrld.api.profiles.filters import FiltersEndpoint
-from pyctrld.api.profiles.list_proxies import ListProxiesEndpoint
-from pyctrld.api.profiles.profiles import ProfilesEndpoint
-from pyctrld.api.profiles.rule_folders import RuleFoldersEndpoint
-from pyctrld.api.profiles.services import ServicesEndpoint
+from pyctrld._core.concurrency import DEFAULT_MAX_WORKERS
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+    from pyctrld._core.concurrency import RateLimiter
+    from pyctrld._core.models.profiles.rule_tree import RuleTree
+    from pyctrld.api.profiles.custom_rules import CustomRulesEndpoint
+    from pyctrld.api.profiles.default_rule import DefaultRuleEndpoint
+    from pyctrld.api.profiles.filters import FiltersEndpoint
+    from pyctrld.api.profiles.list_proxies import ListProxiesEndpoint
+    from pyctrld.api.profiles.profiles import ProfilesEndpoint
+    from pyctrld.api.profiles.rule_folders import RuleFoldersEndpoint
+    from pyctrld.api.profiles.services import ServicesEndpoint
 
 
 class ProfilesAPI:
     """Unified API for managing DNS profiles and related configurations.
 
     This class provides access to all profile-related endpoints through
-    cached properties. Each endpoint is instantiated only when first accessed.
+    cached properties. Each endpoint module is imported and the endpoint
+    instantiated only when first accessed.
 
     Args:
         token: The API authentication bearer token.
@@ -56,6 +65,8 @@ class ProfilesAPI:
         Returns:
             CustomRulesEndpoint instance for custom rule operations.
         """
+        from pyctrld.api.profiles.custom_rules import CustomRulesEndpoint
+
         return CustomRulesEndpoint(self.token)
 
     @cached_property
@@ -65,6 +76,8 @@ class ProfilesAPI:
         Returns:
             DefaultRuleEndpoint instance for default rule operations.
         """
+        from pyctrld.api.profiles.default_rule import DefaultRuleEndpoint
+
         return DefaultRuleEndpoint(self.token)
 
     @cached_property
@@ -74,6 +87,8 @@ class ProfilesAPI:
         Returns:
             FiltersEndpoint instance for filter operations.
         """
+        from pyctrld.api.profiles.filters import FiltersEndpoint
+
         return FiltersEndpoint(self.token)
 
     @cached_property
@@ -83,6 +98,8 @@ class ProfilesAPI:
         Returns:
             ListProxiesEndpoint instance for proxy listing operations.
         """
+        from pyctrld.api.profiles.list_proxies import ListProxiesEndpoint
+
         return ListProxiesEndpoint(self.token)
 
     @cached_property
@@ -92,6 +109,8 @@ class ProfilesAPI:
         Returns:
             ProfilesEndpoint instance for profile operations.
         """
+        from pyctrld.api.profiles.profiles import ProfilesEndpoint
+
         return ProfilesEndpoint(self.token)
 
     @cached_property
@@ -101,6 +120,8 @@ class ProfilesAPI:
         Returns:
             RuleFoldersEndpoint instance for rule folder operations.
         """
+        from pyctrld.api.profiles.rule_folders import RuleFoldersEndpoint
+
         return RuleFoldersEndpoint(self.token)
 
     @cached_property
@@ -110,4 +131,51 @@ class ProfilesAPI:
         Returns:
             ServicesEndpoint instance for profile service operations.
         """
+        from pyctrld.api.profiles.services import ServicesEndpoint
+
         return ServicesEndpoint(self.token)
+
+    def fetch_rule_tree(
+        self,
+        profile_id: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> RuleTree:
+        """Return all rule folders of a profile together with their custom rules.
+
+        Lists the folders of the profile, then fetches the rules of the root folder
+        and of every folder concurrently.
+
+        Args:
+            profile_id: Primary key (PK) of the profile.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            RuleTree with folders keyed by PK (0 for the root folder) and rules keyed by hostname.
+
+        Raises:
+            ApiError: If any of the listings fails.
+
+        Example:
+            >>> tree = profiles_api.fetch_rule_tree("PK123")
+            >>> tree.folders[42].rules["example.com"].action.do
+            <Do.BLOCK: 0>
+        """
+        from pyctrld._core.concurrency import RateLimiter
+        from pyctrld._core.models.profiles.rule_tree import RuleTree
+        from pyctrld.api.profiles.custom_rules import ROOT_FOLDER
+
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+
+        rate_limiter.acquire()
+        folders = self.rule_folders.list(profile_id)
+
+        listing = self.custom_rules.list_by_folder(
+            profile_id,
+            folder_ids=[ROOT_FOLDER] + [folder.PK for folder in folders],
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+        )
+        return RuleTree.from_listing(profile_id, folders, listing)
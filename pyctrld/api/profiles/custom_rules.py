@@ -6,16 +6,27 @@ within profiles, including creating, modifying, deleting, and listing rules.
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from pydantic import field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from requests import RequestException
 
+from pyctrld._core.checkpoint import Checkpoint
+from pyctrld._core.concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    chunked,
+    iter_concurrently,
+)
+from pyctrld._core.exceptions import ApiError
 from pyctrld._core.logger import logger
+from pyctrld._core.models.bulk import BulkResult
 from pyctrld._core.models.common import BaseFormData, Do, Status
 from pyctrld._core.models.profiles.custom_rules import (
     CustomRule,
     ModifiedCustomRule,
 )
+from pyctrld._core.models.profiles.rule_folders import RuleFolder
 from pyctrld._core.urls import Endpoints
 from pyctrld._core.utils import (
     BaseEndpoint,
@@ -24,6 +35,17 @@ from pyctrld._core.utils import (
     check_via_v6_is_aaaa_record,
 )
 
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any, Callable, Iterable, Mapping
+
+# Number of hostnames sent in a single create/modify request by bulk methods
+CUSTOM_RULES_CHUNK_SIZE: int = 100
+# Group ID of rules that are not inside any folder
+ROOT_FOLDER: int = 0
+# Client error statuses that reject the request as a whole, not one of its hostnames
+_UNSPLITTABLE_STATUSES = frozenset({401, 403, 429})
+
 
 class __BaseCustomRuleFormData(BaseFormData):
     """Base form data class for custom rule operations.
@@ -110,6 +132,101 @@ class ModifyCustomRuleFormData(__BaseCustomRuleFormData):
         return None if value is None else Do(value)
 
 
+class CustomRuleTarget(BaseModel):
+    """Desired attributes of a single custom rule, used by bulk modification.
+
+    Attributes left as None are not changed. Targets are immutable and hashable,
+    so hostnames sharing an identical target can be modified with one request.
+
+    Args:
+        do (Optional[Do | int]): Rule type. (BLOCK = 0, BYPASS = 1, SPOOF = 2, REDIRECT = 3).
+        status (Optional[bool | Status]): Rule status. (ENABLED or DISABLED).
+        via (Optional[str]): Spoof/Redirect target.
+        via_v6 (Optional[str]): IPv6 spoof target.
+        group (Optional[int]): Folder ID to move the rule to.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    do: Optional[Do] = None
+    status: Optional[Status] = None
+    via: Optional[str] = None
+    via_v6: Optional[str] = None
+    group: Optional[int] = None
+
+    @field_validator("do", mode="before")
+    @classmethod
+    def set_do(cls, value):
+        return None if value is None else Do(value)
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def set_status(cls, value):
+        return None if value is None else Status(value)
+
+
+class BulkModifyResult(BulkResult):
+    """Outcome of CustomRulesEndpoint.bulk_modify().
+
+    Attributes:
+        plan: Modify requests the hostnames were grouped into.
+    """
+
+    plan: list[ModifyCustomRuleFormData] = Field(default_factory=list)
+
+
+def _send_bisecting(
+    send: Callable[[Any], Any], form_data: Any, rate_limiter: RateLimiter
+) -> dict[str, Optional[str]]:
+    """Send a multi-hostname request, splitting it in halves while its payload is rejected.
+
+    Only client errors that point at the payload (4xx other than 401, 403 and
+    429) are split; authentication, rate limit, server and connection errors
+    fail all hostnames of the request at once, so an API that refuses every
+    request is not sent another one per hostname.
+
+    Args:
+        send: Callable performing the API request for a form data object.
+        form_data: Custom rule form data with a ``hostnames`` list.
+        rate_limiter: Limiter acquired before every request.
+
+    Returns:
+        Mapping of hostname to error message, or None when the hostname succeeded.
+    """
+    rate_limiter.acquire()
+    try:
+        send(form_data)
+    except (ApiError, RequestException) as error:
+        hostnames = form_data.hostnames
+        if len(hostnames) == 1 or not _rejects_payload(error):
+            return dict.fromkeys(hostnames, str(error))
+
+        middle = len(hostnames) // 2
+        return _send_bisecting(
+            send, form_data.model_copy(update={"hostnames": hostnames[:middle]}), rate_limiter
+        ) | _send_bisecting(
+            send, form_data.model_copy(update={"hostnames": hostnames[middle:]}), rate_limiter
+        )
+
+    return dict.fromkeys(form_data.hostnames)
+
+
+def _rejects_payload(error: Exception) -> bool:
+    """Check whether an error rejects the content of a request rather than the request itself.
+
+    Args:
+        error: Error raised by a request.
+
+    Returns:
+        True for API client errors other than 401, 403 and 429.
+    """
+    return (
+        isinstance(error, ApiError)
+        and 400 <= error.status_code < 500
+        and error.status_code not in _UNSPLITTABLE_STATUSES
+    )
+
+
 class CustomRulesEndpoint(BaseEndpoint):
     """Endpoint for managing custom DNS filtering rules.
 
@@ -150,6 +267,53 @@ class CustomRulesEndpoint(BaseEndpoint):
 
         return self._list(url=url, model=CustomRule, key="rules")
 
+    def list_by_folder(
+        self,
+        profile_id: str,
+        folder_ids: Optional[Iterable[int]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> dict[int, list[CustomRule]]:
+        """Return custom rules of several folders, fetched concurrently.
+
+        Args:
+            profile_id: Primary key (PK) of the profile.
+            folder_ids: Folder IDs to list, ROOT_FOLDER (0) for the root folder.
+                Defaults to the root folder and every folder of the profile.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            Mapping of folder ID to the list of CustomRule objects in that folder.
+
+        Raises:
+            ApiError: If any of the listings fails.
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+
+        if folder_ids is None:
+            rate_limiter.acquire()
+            folders = self._list(
+                url=Endpoints.RULE_FOLDERS.format(profile_id=profile_id),
+                model=RuleFolder,
+                key="groups",
+            )
+            folder_ids = [ROOT_FOLDER] + [folder.PK for folder in folders]
+
+        def list_folder(folder_id: int) -> list[CustomRule]:
+            return self.list(profile_id, None if folder_id == ROOT_FOLDER else folder_id)
+
+        rules: dict[int, list[CustomRule]] = {}
+        for folder_id, folder_rules, error in iter_concurrently(
+            list_folder, folder_ids, max_workers=max_workers, rate_limiter=rate_limiter
+        ):
+            if error is not None:
+                raise error
+            rules[folder_id] = folder_rules
+
+        return rules
+
     def modify(
         self, profile_id: str, form_data: ModifyCustomRuleFormData
     ) -> list[ModifiedCustomRule]:
@@ -215,3 +379,252 @@ class CustomRulesEndpoint(BaseEndpoint):
         url = self._url.format(profile_id=profile_id) + f"/{hostname}"
         self._delete(url)
         return True
+
+    def bulk_create(
+        self,
+        profile_id: str,
+        form_data: CreateCustomRuleFormData,
+        chunk_size: int = CUSTOM_RULES_CHUNK_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+        checkpoint: Optional[str | Path] = None,
+    ) -> BulkResult:
+        """Create custom rules for a large number of hostnames.
+
+        Duplicated hostnames are dropped, the rest is split into chunks of
+        ``chunk_size`` which are sent concurrently. If the API rejects the content
+        of a chunk it is split in halves and retried, so a single invalid hostname
+        only fails itself; other errors fail the whole chunk.
+
+        When ``checkpoint`` is given, every finished hostname is recorded in that
+        file and hostnames already recorded as created are skipped, so an
+        interrupted import can be resumed by calling the method again.
+
+        Args:
+            profile_id: Primary key (PK) of the profile.
+            form_data: Rule configuration; ``hostnames`` may contain any number of hostnames.
+            chunk_size: Maximum number of hostnames per create request.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+            checkpoint: Optional path of the progress journal.
+
+        Returns:
+            BulkResult with created, failed and skipped hostnames.
+
+        Example:
+            >>> form_data = CreateCustomRuleFormData(do=Do.BLOCK, status=True, hostnames=hosts)
+            >>> result = api.bulk_create("PK123", form_data, checkpoint="import.ckpt")
+            >>> result.failed
+            {}
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+        journal = Checkpoint(checkpoint) if checkpoint is not None else None
+
+        result = BulkResult()
+        pending: list[str] = []
+        for hostname in dict.fromkeys(form_data.hostnames):
+            if journal is not None and journal.is_done(hostname):
+                result.skipped.append(hostname)
+            else:
+                pending.append(hostname)
+
+        def create_chunk(chunk: list[str]) -> dict[str, Optional[str]]:
+            return _send_bisecting(
+                lambda data: self.create(profile_id, data),
+                form_data.model_copy(update={"hostnames": chunk}),
+                rate_limiter,
+            )
+
+        for chunk, outcome, error in iter_concurrently(
+            create_chunk, chunked(pending, chunk_size), max_workers=max_workers
+        ):
+            if error is not None:
+                outcome = dict.fromkeys(chunk, str(error))
+
+            created = [hostname for hostname, message in outcome.items() if message is None]
+            result.succeeded.extend(created)
+            if journal is not None:
+                journal.mark_done(created)
+
+            for hostname, message in outcome.items():
+                if message is not None:
+                    result.failed[hostname] = message
+                    if journal is not None:
+                        journal.mark_failed([hostname], message)
+
+        logger.info(
+            f"Custom rules bulk create for {profile_id}: {len(result.succeeded)} created, "
+            f"{len(result.failed)} failed, {len(result.skipped)} skipped"
+        )
+        return result
+
+    def bulk_delete(
+        self,
+        profile_id: str,
+        hostnames: Optional[Iterable[str]] = None,
+        folder_id: Optional[int] = None,
+        keep: Iterable[str] = (),
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> BulkResult:
+        """Delete custom rules for many hostnames concurrently.
+
+        The rules to delete are selected from a fresh listing of the profile:
+
+        * ``hostnames`` only - the given hostnames, wherever they are in the profile;
+        * ``folder_id`` only - every rule in that folder;
+        * both - the given hostnames that are in that folder.
+
+        Hostnames listed in ``keep`` are never deleted. Requested hostnames that have
+        no rule are reported as skipped, failed deletions do not stop the others.
+
+        Args:
+            profile_id: Primary key (PK) of the profile.
+            hostnames: Hostnames whose rules should be deleted.
+            folder_id: Restrict deletion to this folder, ROOT_FOLDER (0) for the root folder.
+            keep: Hostnames to exclude from deletion.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            BulkResult with deleted, failed and skipped hostnames.
+
+        Raises:
+            ValueError: If neither hostnames nor folder_id is given.
+
+        Example:
+            >>> # delete everything in folder 42 except two hostnames
+            >>> api.bulk_delete("PK123", folder_id=42, keep=["a.com", "b.com"])
+        """
+        if hostnames is None and folder_id is None:
+            raise ValueError("hostnames or folder_id is required")
+
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+
+        listing = self.list_by_folder(
+            profile_id,
+            folder_ids=None if folder_id is None else [folder_id],
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+        )
+        present = {rule.PK for rules in listing.values() for rule in rules}
+        excluded = set(keep)
+
+        result = BulkResult()
+        if hostnames is None:
+            selected = [hostname for hostname in present if hostname not in excluded]
+        else:
+            selected = []
+            for hostname in dict.fromkeys(hostnames):
+                if hostname in present and hostname not in excluded:
+                    selected.append(hostname)
+                else:
+                    result.skipped.append(hostname)
+
+        for hostname, _, error in iter_concurrently(
+            lambda hostname: self.delete(profile_id, hostname),
+            selected,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+        ):
+            if error is not None:
+                result.failed[hostname] = str(error)
+            else:
+                result.succeeded.append(hostname)
+
+        logger.info(
+            f"Custom rules bulk delete for {profile_id}: {len(result.succeeded)} deleted, "
+            f"{len(result.failed)} failed, {len(result.skipped)} skipped"
+        )
+        return result
+
+    @staticmethod
+    def plan_modify(
+        targets: Mapping[str, CustomRuleTarget | dict[str, Any]],
+        chunk_size: int = CUSTOM_RULES_CHUNK_SIZE,
+    ) -> list[ModifyCustomRuleFormData]:
+        """Group per-hostname targets into the fewest modify requests.
+
+        Hostnames with identical target attributes share one request of at most
+        ``chunk_size`` hostnames. Requests are ordered by the first appearance of
+        their target in ``targets``.
+
+        Args:
+            targets: Mapping of hostname to its desired attributes.
+            chunk_size: Maximum number of hostnames per modify request.
+
+        Returns:
+            A list of ModifyCustomRuleFormData, one per request.
+
+        Raises:
+            ValueError: If a target is invalid, e.g. SPOOF without a valid via.
+        """
+        groups: dict[CustomRuleTarget, list[str]] = {}
+        for hostname, target in targets.items():
+            groups.setdefault(CustomRuleTarget.model_validate(target), []).append(hostname)
+
+        return [
+            ModifyCustomRuleFormData(**target.model_dump(exclude_none=True), hostnames=chunk)
+            for target, hostnames in groups.items()
+            for chunk in chunked(hostnames, chunk_size)
+        ]
+
+    def bulk_modify(
+        self,
+        profile_id: str,
+        targets: Mapping[str, CustomRuleTarget | dict[str, Any]],
+        chunk_size: int = CUSTOM_RULES_CHUNK_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> BulkModifyResult:
+        """Apply per-hostname rule changes with as few requests as possible.
+
+        The targets are grouped with plan_modify() and the resulting requests are
+        sent concurrently. Requests whose content is rejected are split in halves and
+        retried, so a single invalid hostname only fails itself; other errors fail
+        the whole request.
+
+        Args:
+            profile_id: Primary key (PK) of the profile.
+            targets: Mapping of hostname to its desired attributes, e.g. a new
+                ``group`` to move the rule to another folder or a new ``status``.
+            chunk_size: Maximum number of hostnames per modify request.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            BulkModifyResult with the executed plan and modified and failed hostnames.
+
+        Example:
+            >>> api.bulk_modify("PK123", {"a.com": {"group": 7}, "b.com": {"status": False}})
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+
+        plan = self.plan_modify(targets, chunk_size=chunk_size)
+        result = BulkModifyResult(plan=plan)
+
+        def modify_chunk(form_data: ModifyCustomRuleFormData) -> dict[str, Optional[str]]:
+            return _send_bisecting(
+                lambda data: self.modify(profile_id, data), form_data, rate_limiter
+            )
+
+        for form_data, outcome, error in iter_concurrently(
+            modify_chunk, plan, max_workers=max_workers
+        ):
+            if error is not None:
+                outcome = dict.fromkeys(form_data.hostnames, str(error))
+
+            for hostname, message in outcome.items():
+                if message is None:
+                    result.succeeded.append(hostname)
+                else:
+                    result.failed[hostname] = message
+
+        logger.info(
+            f"Custom rules bulk modify for {profile_id}: {len(plan)} requests, "
+            f"{len(result.succeeded)} modified, {len(result.failed)} failed"
+        )
+        return result
@@ -6,11 +6,23 @@ including both native ControlD filters and third-party filter lists.
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Optional
+
+from pyctrld._core.concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
+from pyctrld._core.logger import logger
+from pyctrld._core.models.bulk import BulkResult
 from pyctrld._core.models.common import Action, BaseFormData, Status
 from pyctrld._core.models.profiles.filters import NativeFilter, ThirdPartyFilter
 from pyctrld._core.urls import Endpoints
 from pyctrld._core.utils import BaseEndpoint
 
+if TYPE_CHECKING:
+    from typing import Iterable
+
 
 class ModifyFilterFormData(BaseFormData):
     """Form data for modifying filter.
@@ -109,3 +121,86 @@ class FiltersEndpoint(BaseEndpoint):
         return {
             key: Action.model_validate(value, strict=True) for key, value in data["filters"].items()
         }
+
+    def bulk_modify(
+        self,
+        profile_ids: Iterable[str],
+        filters: dict[str, bool],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> dict[str, BulkResult]:
+        """Bring native and third-party filters of many profiles to the desired states.
+
+        The native and third-party filter lists of every profile are fetched
+        concurrently first; then a modify request is sent, concurrently, only
+        for the filters whose current status differs from the desired one.
+
+        Args:
+            profile_ids: Primary keys (PK) of the profiles.
+            filters: Desired status keyed by filter PK, native or third-party.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            BulkResult of every profile, keyed by profile PK, with modified, failed
+            and skipped (already in the desired state) filter PKs. Filters that do
+            not exist in a profile are reported as failed.
+
+        Example:
+            >>> reports = api.profiles.filters.bulk_modify(
+            ...     customer_profiles, {"ads": True, "oisd": False}
+            ... )
+            >>> {pk: report.succeeded for pk, report in reports.items()}
+            {'PK123': ['ads'], 'PK456': []}
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+        profile_ids = list(dict.fromkeys(profile_ids))
+        reports = {profile_id: BulkResult() for profile_id in profile_ids}
+        current: dict[str, dict[str, Status]] = {profile_id: {} for profile_id in profile_ids}
+
+        listings = [
+            (profile_id, method)
+            for profile_id in profile_ids
+            for method in (self.list_native, self.list_third_party)
+        ]
+        for (profile_id, _), items, error in iter_concurrently(
+            lambda listing: listing[1](listing[0]), listings, max_workers, rate_limiter
+        ):
+            if error is not None:
+                reports[profile_id].failed.update(dict.fromkeys(filters, str(error)))
+            else:
+                current[profile_id].update({item.PK: item.status for item in items})
+
+        changes = []
+        for profile_id in profile_ids:
+            report = reports[profile_id]
+            if report.failed:
+                continue
+            for filter, enabled in filters.items():
+                status = current[profile_id].get(filter)
+                if status is None:
+                    report.failed[filter] = "filter not found"
+                elif status == (Status.ENABLED if enabled else Status.DISABLED):
+                    report.skipped.append(filter)
+                else:
+                    changes.append((profile_id, filter, enabled))
+
+        for (profile_id, filter, _), _, error in iter_concurrently(
+            lambda change: self.modify(
+                change[0], change[1], ModifyFilterFormData(status=change[2])
+            ),
+            changes,
+            max_workers,
+            rate_limiter,
+        ):
+            if error is not None:
+                reports[profile_id].failed[filter] = str(error)
+            else:
+                reports[profile_id].succeeded.append(filter)
+
+        logger.info(
+            f"Filters bulk modify: {len(changes)} changes on {len(profile_ids)} profiles, "
+            f"{sum(len(report.failed) for report in reports.values())} failed"
+        )
+        return reports
@@ -6,11 +6,17 @@ in profiles, allowing control over predefined service categories.
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from pydantic import model_validator
 
+from pyctrld._core.concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
 from pyctrld._core.logger import logger
+from pyctrld._core.models.bulk import BulkResult
 from pyctrld._core.models.common import Action, BaseFormData, Do, Status
 from pyctrld._core.models.profiles.services import Service
 from pyctrld._core.urls import Endpoints
@@ -21,6 +27,11 @@ from pyctrld._core.utils import (
     check_via_v6_is_aaaa_record,
 )
 
+if TYPE_CHECKING:
+    from typing import Iterable
+
+    from pyctrld.tools.service_catalog import ServiceCatalog
+
 
 class ModifyServiceFormData(BaseFormData):
     """Form data for modifying service settings.
@@ -58,6 +69,10 @@ class ServicesEndpoint(BaseEndpoint):
     This endpoint provides methods to list and modify DNS filtering rules
     for predefined service categories within a profile.
 
+    Attributes:
+        catalog: Optional ServiceCatalog used to reject unknown services locally
+            before a request is sent.
+
     Args:
         token: The API authentication bearer token.
     """
@@ -70,6 +85,7 @@ class ServicesEndpoint(BaseEndpoint):
         """
         super().__init__(token)
         self._url = Endpoints.PROFILES_SERVICES
+        self.catalog: Optional[ServiceCatalog] = None
 
     def list(self, profile_id: str) -> list[Service]:
         """Returns services that have any kind of rule associated with them.
@@ -107,9 +123,14 @@ class ServicesEndpoint(BaseEndpoint):
         Returns:
             A list of Action objects representing the updated service rules.
 
+        Raises:
+            ValueError: If a catalog is set and does not contain the service.
+
         Reference:
             https://docs.controld.com/reference/put_profiles-profile-id-services-service
         """
+        if self.catalog is not None:
+            self.catalog.validate(service)
         url = self._url.format(profile_id=profile_id)
         return self._modify(
             url=url + f"/{service}",
@@ -117,3 +138,90 @@ class ServicesEndpoint(BaseEndpoint):
             key="services",
             form_data=form_data.model_dump_json(),
         )
+
+    def bulk_modify(
+        self,
+        profile_ids: Iterable[str],
+        services: Iterable[str],
+        form_data: ModifyServiceFormData,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> dict[str, BulkResult]:
+        """Apply one service rule to many services across many profiles.
+
+        The service rules of every profile are listed concurrently first; then a
+        modify request is sent, concurrently, only for the services whose rule
+        differs from the form data. A service without a rule already matches a
+        form data that disables the rule. With a catalog set, unknown services
+        fail on every profile without a request.
+
+        Args:
+            profile_ids: Primary keys (PK) of the profiles.
+            services: Service identifiers, e.g. from ``list_all_services(category)``.
+            form_data: Rule applied to every service.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            BulkResult of every profile, keyed by profile PK, with modified, failed
+            and skipped (already in the desired state) service identifiers.
+
+        Example:
+            >>> gaming = [service.PK for service in api.list_all_services("gaming")]
+            >>> form_data = ModifyServiceFormData(do=Do.BLOCK, status=True)
+            >>> reports = api.profiles.services.bulk_modify(school_profiles, gaming, form_data)
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter()
+        profile_ids = list(dict.fromkeys(profile_ids))
+        services = list(dict.fromkeys(services))
+        desired = form_data.model_dump(mode="json", exclude_none=True)
+        reports = {profile_id: BulkResult() for profile_id in profile_ids}
+
+        if self.catalog is not None:
+            unknown = {}
+            for service in services:
+                try:
+                    self.catalog.validate(service)
+                except ValueError as error:
+                    unknown[service] = str(error)
+            for report in reports.values():
+                report.failed.update(unknown)
+            services = [service for service in services if service not in unknown]
+
+        changes = []
+        for profile_id, current, error in iter_concurrently(
+            self.list, profile_ids, max_workers, rate_limiter
+        ):
+            if error is not None:
+                reports[profile_id].failed.update(dict.fromkeys(services, str(error)))
+                continue
+
+            actions = {service.PK: service.action.model_dump(mode="json") for service in current}
+            for service in services:
+                action = actions.get(service)
+                if (
+                    desired.get("status") == Status.DISABLED.value
+                    if action is None
+                    else all(action.get(name) == value for name, value in desired.items())
+                ):
+                    reports[profile_id].skipped.append(service)
+                else:
+                    changes.append((profile_id, service))
+
+        for (profile_id, service), _, error in iter_concurrently(
+            lambda change: self.modify(change[0], change[1], form_data),
+            changes,
+            max_workers,
+            rate_limiter,
+        ):
+            if error is not None:
+                reports[profile_id].failed[service] = str(error)
+            else:
+                reports[profile_id].succeeded.append(service)
+
+        logger.info(
+            f"Services bulk modify: {len(changes)} changes on {len(profile_ids)} profiles, "
+            f"{sum(len(report.failed) for report in reports.values())} failed"
+        )
+        return reports
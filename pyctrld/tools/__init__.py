@@ -0,0 +1,9 @@
+"""Higher-level tools built on top of the ControlD API endpoints.
+
+Each module of this package provides a self-contained feature composed of many
+endpoint calls, such as taking a snapshot of a whole account. Modules are not
+imported by the package itself, import them directly, e.g.
+``from pyctrld.tools.snapshot import take_snapshot``.
+"""
+
+from __future__ import annotations
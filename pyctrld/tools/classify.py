@@ -0,0 +1,283 @@
+"""Streaming classification of hostname logs against a profile policy.
+
+classify_file() splits a hostname list or query log into byte ranges and
+evaluates them in worker processes, each holding its own copy of a compiled
+PolicySimulator. Only per-action, per-layer, per-folder, per-service and
+per-filter counters travel back to the parent, so files of several gigabytes
+are processed with constant memory.
+
+Supported formats, one record per line:
+    - ``text``: the hostname is the first whitespace separated field.
+    - ``csv``: the hostname is read from the ``column`` field; the first line is the header.
+    - ``ndjson``: the hostname is read from the ``column`` key of each JSON object.
+
+Example:
+    >>> simulator = PolicySimulator(snapshot, filter_hostnames=filter_lists)
+    >>> result = classify_file(simulator, "queries-2024-06-01.ndjson", column="question")
+    >>> result.by_action
+    {'BYPASS': 9123456, 'BLOCK': 412345}
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from pyctrld._core.logger import logger
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Iterator
+
+    from pyctrld.tools.simulate import Decision, PolicySimulator
+
+LogFormat = Literal["text", "csv", "ndjson"]
+
+DEFAULT_BATCH_SIZE = 10_000
+ROOT_FOLDER_NAME = "(root)"
+
+_EXTENSIONS: dict[str, LogFormat] = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+# Simulator of a pool worker process, set by the pool initializer.
+_simulator: Optional[PolicySimulator] = None
+
+
+class Classification(BaseModel):
+    """Aggregated decisions over a hostname log.
+
+    Attributes:
+        total: Number of classified records.
+        invalid: Number of records without a hostname.
+        by_action: Record counts keyed by action name (BLOCK, BYPASS, SPOOF, REDIRECT).
+        by_layer: Record counts keyed by deciding policy layer.
+        by_folder: Counts of records decided by a custom rule, keyed by folder name.
+        by_service: Counts of records decided by a service rule, keyed by service PK.
+        by_filter: Counts of records decided by a filter, keyed by filter PK.
+    """
+
+    total: int = 0
+    invalid: int = 0
+    by_action: dict[str, int] = Field(default_factory=dict)
+    by_layer: dict[str, int] = Field(default_factory=dict)
+    by_folder: dict[str, int] = Field(default_factory=dict)
+    by_service: dict[str, int] = Field(default_factory=dict)
+    by_filter: dict[str, int] = Field(default_factory=dict)
+
+    def merge(self, other: Classification) -> None:
+        """Add the counts of another classification to this one.
+
+        Args:
+            other: Classification to add.
+        """
+        self.total += other.total
+        self.invalid += other.invalid
+        for name in ("by_action", "by_layer", "by_folder", "by_service", "by_filter"):
+            counts = getattr(self, name)
+            for key, count in getattr(other, name).items():
+                _increment(counts, key, count)
+
+
+def classify_file(
+    simulator: PolicySimulator,
+    path: str | Path,
+    log_format: Optional[LogFormat] = None,
+    column: str = "hostname",
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Classification:
+    """Classify every hostname of a log file.
+
+    Args:
+        simulator: Compiled policy of the profile.
+        path: Log file.
+        log_format: Format of the file. Detected from the extension by default
+            (``.csv``, ``.ndjson``/``.jsonl``, anything else is text).
+        column: CSV column or NDJSON key holding the hostname.
+        workers: Number of worker processes. Defaults to the number of CPUs; 1
+            classifies in the calling process.
+        batch_size: Number of records evaluated per batch.
+
+    Returns:
+        Aggregated Classification of the file.
+
+    Raises:
+        ValueError: If the CSV header has no ``column`` field.
+    """
+    path = os.fspath(path)
+    log_format = log_format or _EXTENSIONS.get(os.path.splitext(path)[1].lower(), "text")
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+
+    start, field = 0, None
+    if log_format == "csv":
+        with open(path, "rb") as file:
+            header = file.readline()
+        start = len(header)
+        names = next(csv.reader([header.decode("utf-8")]), [])
+        if column not in names:
+            raise ValueError(f"CSV header has no {column!r} column")
+        field = names.index(column)
+
+    shards = workers * 4 if workers > 1 else 1
+    step = max(1, -(-(size - start) // shards))
+    ranges = [(offset, min(offset + step, size)) for offset in range(start, size, step)]
+    arguments = [(path, begin, end, log_format, column, field, batch_size) for begin, end in ranges]
+
+    result = Classification()
+    if workers == 1:
+        for argument in arguments:
+            result.merge(_classify_range(simulator, *argument))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_initialize, initargs=(simulator,)) as pool:
+            for partial in pool.map(_classify_worker_range, *zip(*arguments)):
+                result.merge(partial)
+
+    logger.info(f"Classified {result.total} records of {path} in {len(ranges)} shards")
+    return result
+
+
+def _initialize(simulator: PolicySimulator) -> None:
+    """Store the simulator of a pool worker process."""
+    global _simulator
+    _simulator = simulator
+
+
+def _classify_worker_range(*arguments: Any) -> Classification:
+    """Classify a byte range in a pool worker with the simulator of the process."""
+    return _classify_range(_simulator, *arguments)
+
+
+def _classify_range(
+    simulator: PolicySimulator,
+    path: str,
+    start: int,
+    end: int,
+    log_format: LogFormat,
+    column: str,
+    field: Optional[int],
+    batch_size: int,
+) -> Classification:
+    """Classify the records starting within a byte range of a file.
+
+    Args:
+        simulator: Compiled policy of the profile.
+        path: Log file.
+        start: First byte of the range.
+        end: Byte after the range.
+        log_format: Format of the file.
+        column: NDJSON key holding the hostname.
+        field: CSV field index holding the hostname.
+        batch_size: Number of records evaluated per batch.
+
+    Returns:
+        Classification of the range.
+    """
+    counts: Counter[int] = Counter()
+    decisions: dict[int, Decision] = {}
+    invalid = 0
+    batch: list[str] = []
+
+    def flush() -> None:
+        for decision in simulator.evaluate_many(batch):
+            counts[id(decision)] += 1
+            decisions[id(decision)] = decision
+        batch.clear()
+
+    for hostname in _read_range(path, start, end, log_format, column, field):
+        if not hostname:
+            invalid += 1
+            continue
+        batch.append(hostname)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    result = Classification(invalid=invalid)
+    for key, count in counts.items():
+        decision = decisions[key]
+        result.total += count
+        _increment(result.by_action, decision.do.name, count)
+        _increment(result.by_layer, decision.layer, count)
+        if decision.layer == "custom_rule":
+            _increment(result.by_folder, decision.folder or ROOT_FOLDER_NAME, count)
+        elif decision.layer == "service":
+            _increment(result.by_service, decision.source, count)
+        elif decision.layer.endswith("filter"):
+            _increment(result.by_filter, decision.source, count)
+    return result
+
+
+def _read_range(
+    path: str,
+    start: int,
+    end: int,
+    log_format: LogFormat,
+    column: str,
+    field: Optional[int],
+) -> Iterator[Optional[str]]:
+    """Yield the hostname of every line starting within a byte range.
+
+    A line crossing the range start belongs to the previous range.
+
+    Args:
+        path: Log file.
+        start: First byte of the range.
+        end: Byte after the range.
+        log_format: Format of the file.
+        column: NDJSON key holding the hostname.
+        field: CSV field index holding the hostname.
+
+    Yields:
+        Hostname of each non-empty line, None for lines without a hostname.
+    """
+    with open(path, "rb") as file:
+        position = start
+        if start:
+            file.seek(start - 1)
+            position += len(file.readline()) - 1
+
+        while position < end:
+            line = file.readline()
+            if not line:
+                break
+            position += len(line)
+
+            text = line.decode("utf-8", errors="replace").strip()
+            if not text or text.startswith("#"):
+                continue
+            yield _parse(text, log_format, column, field)
+
+
+def _parse(text: str, log_format: LogFormat, column: str, field: Optional[int]) -> Optional[str]:
+    """Extract the hostname of a log line.
+
+    Args:
+        text: Stripped log line.
+        log_format: Format of the file.
+        column: NDJSON key holding the hostname.
+        field: CSV field index holding the hostname.
+
+    Returns:
+        The hostname, or None if the line has none.
+    """
+    if log_format == "text":
+        return text.split(maxsplit=1)[0]
+
+    try:
+        if log_format == "csv":
+            return next(csv.reader([text]))[field] or None
+        value = json.loads(text).get(column)
+    except (IndexError, ValueError, AttributeError):
+        return None
+    return value if isinstance(value, str) and value else None
+
+
+def _increment(counts: dict[str, int], key: str, count: int) -> None:
+    """Add a count to a counter dictionary."""
+    counts[key] = counts.get(key, 0) + count
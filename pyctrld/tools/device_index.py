@@ -0,0 +1,260 @@
+"""Multi-key in-memory index over the devices of an account.
+
+DeviceIndex answers lookups by PK, device ID, resolver UID, DoH URL and DoT
+hostname (unique keys), and by name, profile and secondary profile (shared
+keys) with one dictionary access each. Devices are also kept sorted by last
+activity and creation time for range queries.
+
+refresh() compares a new ``list_all_devices()`` listing with the indexed one
+with tools.diff.diff() and only re-indexes added, removed and changed devices.
+
+Example:
+    >>> index = DeviceIndex(api.devices.list_all_devices())
+    >>> index.by_doh("https://dns.controld.com/8fj2k3l1").name
+    'office-router'
+    >>> index.refresh(api.devices.list_all_devices()).summary()
+    '0 added, 0 removed, 1 changed, 211 unchanged'
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING, Optional
+
+from pyctrld.tools.diff import diff
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator
+
+    from pyctrld._core.models.devices import Device
+    from pyctrld.tools.diff import DiffResult
+
+_UNIQUE_KEYS = ("device_id", "uid", "doh", "dot")
+_SHARED_KEYS = ("name", "profile", "profile2")
+
+
+class DeviceIndex:
+    """Devices indexed by their identifiers, profiles and timestamps.
+
+    Args:
+        devices: Devices to index, e.g. from ``DevicesEndpoint.list_all_devices()``.
+    """
+
+    def __init__(self, devices: Iterable[Device] = ()) -> None:
+        """Build the index.
+
+        Args:
+            devices: Devices to index.
+        """
+        self._devices: dict[str, Device] = {}
+        self._unique: dict[str, dict[str, str]] = {name: {} for name in _UNIQUE_KEYS}
+        self._shared: dict[str, dict[str, dict[str, None]]] = {name: {} for name in _SHARED_KEYS}
+        self._by_activity: list[tuple[int, str]] = []
+        self._by_ts: list[tuple[int, str]] = []
+        for device in devices:
+            self.add(device)
+
+    def __repr__(self) -> str:
+        """Return string representation of the index.
+
+        Returns:
+            A string showing the number of indexed devices.
+        """
+        return f"<{self.__class__.__name__} devices={len(self._devices)}>"
+
+    def __len__(self) -> int:
+        """Return the number of indexed devices."""
+        return len(self._devices)
+
+    def __contains__(self, pk: str) -> bool:
+        """Check whether a device with this primary key is indexed."""
+        return pk in self._devices
+
+    def __iter__(self) -> Iterator[Device]:
+        """Iterate over the indexed devices."""
+        return iter(self._devices.values())
+
+    def get(self, pk: str) -> Optional[Device]:
+        """Return the device with a primary key (PK).
+
+        Args:
+            pk: Primary key of the device.
+
+        Returns:
+            The Device, or None if it is not indexed.
+        """
+        return self._devices.get(pk)
+
+    def by_device_id(self, device_id: str) -> Optional[Device]:
+        """Return the device with a device ID."""
+        return self._unique_lookup("device_id", device_id)
+
+    def by_uid(self, uid: str) -> Optional[Device]:
+        """Return the device with a resolver UID."""
+        return self._unique_lookup("uid", uid)
+
+    def by_doh(self, url: str) -> Optional[Device]:
+        """Return the device with a DoH resolver URL; a trailing slash is ignored."""
+        return self._unique_lookup("doh", _doh_key(url))
+
+    def by_dot(self, hostname: str) -> Optional[Device]:
+        """Return the device with a DoT resolver hostname (case-insensitive)."""
+        return self._unique_lookup("dot", hostname.lower())
+
+    def by_name(self, name: str) -> list[Device]:
+        """Return the devices with a name."""
+        return self._shared_lookup("name", name)
+
+    def by_profile(self, profile_id: str) -> list[Device]:
+        """Return the devices enforcing a profile as their main profile."""
+        return self._shared_lookup("profile", profile_id)
+
+    def by_profile2(self, profile_id: str) -> list[Device]:
+        """Return the devices enforcing a profile as their second profile."""
+        return self._shared_lookup("profile2", profile_id)
+
+    def active_between(self, start: int, end: int) -> list[Device]:
+        """Return the devices whose last activity is within a time range.
+
+        Args:
+            start: First Unix timestamp of the range.
+            end: Last Unix timestamp of the range.
+
+        Returns:
+            Devices ordered by last activity. Devices without activity are never returned.
+        """
+        return self._range(self._by_activity, start, end)
+
+    def created_between(self, start: int, end: int) -> list[Device]:
+        """Return the devices created within a time range.
+
+        Args:
+            start: First Unix timestamp of the range.
+            end: Last Unix timestamp of the range.
+
+        Returns:
+            Devices ordered by creation time.
+        """
+        return self._range(self._by_ts, start, end)
+
+    def add(self, device: Device) -> None:
+        """Index a device, replacing an indexed device with the same PK.
+
+        Args:
+            device: The device.
+        """
+        self.remove(device.PK)
+        self._devices[device.PK] = device
+        for name, value in _keys(device).items():
+            if value is None:
+                continue
+            if name in self._unique:
+                self._unique[name][value] = device.PK
+            else:
+                self._shared[name].setdefault(value, {})[device.PK] = None
+
+        if device.last_activity is not None:
+            bisect.insort(self._by_activity, (device.last_activity, device.PK))
+        bisect.insort(self._by_ts, (device.ts, device.PK))
+
+    def remove(self, pk: str) -> bool:
+        """Remove a device from the index.
+
+        Args:
+            pk: Primary key of the device.
+
+        Returns:
+            True if the device was indexed.
+        """
+        device = self._devices.pop(pk, None)
+        if device is None:
+            return False
+
+        for name, value in _keys(device).items():
+            if value is None:
+                continue
+            if name in self._unique:
+                if self._unique[name].get(value) == pk:
+                    del self._unique[name][value]
+            else:
+                devices = self._shared[name][value]
+                del devices[pk]
+                if not devices:
+                    del self._shared[name][value]
+
+        if device.last_activity is not None:
+            _discard(self._by_activity, (device.last_activity, pk))
+        _discard(self._by_ts, (device.ts, pk))
+        return True
+
+    def refresh(self, devices: Iterable[Device]) -> DiffResult:
+        """Bring the index to a new device listing, re-indexing only what differs.
+
+        Args:
+            devices: Complete current listing, e.g. from ``DevicesEndpoint.list_all_devices()``.
+
+        Returns:
+            DiffResult between the indexed and the new devices, keyed by PK.
+        """
+        devices = list(devices)
+        changes = diff(self._devices.values(), devices)
+        current = {device.PK: device for device in devices}
+        for change in changes.changes:
+            if change.kind == "removed":
+                self.remove(change.key)
+            else:
+                self.add(current[change.key])
+        return changes
+
+    def _unique_lookup(self, name: str, value: str) -> Optional[Device]:
+        """Return the device of a unique key value."""
+        pk = self._unique[name].get(value)
+        return self._devices[pk] if pk is not None else None
+
+    def _shared_lookup(self, name: str, value: str) -> list[Device]:
+        """Return the devices of a shared key value."""
+        return [self._devices[pk] for pk in self._shared[name].get(value, ())]
+
+    def _range(self, view: list[tuple[int, str]], start: int, end: int) -> list[Device]:
+        """Return the devices of a sorted view within a timestamp range."""
+        low = bisect.bisect_left(view, (start, ""))
+        high = bisect.bisect_left(view, (end + 1, ""))
+        return [self._devices[pk] for _, pk in view[low:high]]
+
+
+def _keys(device: Device) -> dict[str, Optional[str]]:
+    """Return the index keys of a device.
+
+    The second profile is not a declared Device field; it is read from the
+    ``profile2`` object returned by the API, if any.
+
+    Args:
+        device: The device.
+
+    Returns:
+        Key values keyed by index name, None for missing keys.
+    """
+    profile2 = getattr(device, "profile2", None)
+    if isinstance(profile2, dict):
+        profile2 = profile2.get("PK")
+    return {
+        "device_id": device.device_id,
+        "uid": device.resolvers.uid,
+        "doh": _doh_key(device.resolvers.doh),
+        "dot": device.resolvers.dot.lower(),
+        "name": device.name,
+        "profile": device.profile.PK,
+        "profile2": profile2 or None,
+    }
+
+
+def _doh_key(url: str) -> str:
+    """Normalize a DoH URL for lookups."""
+    return url.rstrip("/")
+
+
+def _discard(view: list[tuple[int, str]], item: tuple[int, str]) -> None:
+    """Remove an item from a sorted view if present."""
+    position = bisect.bisect_left(view, item)
+    if position < len(view) and view[position] == item:
+        del view[position]
@@ -0,0 +1,277 @@
+"""Primary-key based diffs between entity lists and account snapshots.
+
+diff() matches two lists of models by key (``PK`` by default) and reports added,
+removed and changed entities with field-level changes. Entities are compared
+by their current field values, without serializing them; only changed
+entities are dumped to compute their field-level changes, so unchanged
+entities cost one dictionary comparison and models changed in place are
+always seen with their current content.
+
+Example:
+    >>> old = AccountSnapshot.model_validate_json(Path("monday.json").read_text())
+    >>> new = api.snapshot()
+    >>> for entity, result in diff_snapshots(old, new).items():
+    ...     print(entity, result.summary())
+"""
+
+from __future__ import annotations
+
+import operator
+from typing import TYPE_CHECKING, Any, Literal
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from typing import Callable, Hashable, Iterable
+
+    from pyctrld._core.models.snapshot import AccountSnapshot
+
+
+class FieldChange(BaseModel):
+    """Change of a single field.
+
+    Attributes:
+        field: Dotted path of the field, e.g. ``action.do``.
+        old: Previous value, None if the field was added.
+        new: New value, None if the field was removed.
+    """
+
+    field: str
+    old: Any = None
+    new: Any = None
+
+
+class EntityChange(BaseModel):
+    """Added, removed or changed entity.
+
+    Attributes:
+        key: Key of the entity.
+        kind: Type of change.
+        fields: Field-level changes of a changed entity.
+    """
+
+    key: str
+    kind: Literal["added", "removed", "changed"]
+    fields: list[FieldChange] = Field(default_factory=list)
+
+
+class DiffResult(BaseModel):
+    """Differences between two entity lists.
+
+    Attributes:
+        changes: Added, removed and changed entities, in key order of the new list
+            followed by removed keys.
+        unchanged: Number of entities present and identical in both lists.
+    """
+
+    changes: list[EntityChange] = Field(default_factory=list)
+    unchanged: int = 0
+
+    def __bool__(self) -> bool:
+        """Return True if the lists differ."""
+        return bool(self.changes)
+
+    @property
+    def added(self) -> list[str]:
+        """Keys of added entities."""
+        return [change.key for change in self.changes if change.kind == "added"]
+
+    @property
+    def removed(self) -> list[str]:
+        """Keys of removed entities."""
+        return [change.key for change in self.changes if change.kind == "removed"]
+
+    @property
+    def changed(self) -> list[str]:
+        """Keys of changed entities."""
+        return [change.key for change in self.changes if change.kind == "changed"]
+
+    def summary(self) -> str:
+        """Return a one-line summary of the differences.
+
+        Returns:
+            Summary string.
+        """
+        return (
+            f"{len(self.added)} added, {len(self.removed)} removed, "
+            f"{len(self.changed)} changed, {self.unchanged} unchanged"
+        )
+
+
+def diff(
+    old: Iterable[BaseModel],
+    new: Iterable[BaseModel],
+    key: str | Callable[[Any], Hashable] = "PK",
+    ignore: Iterable[str] = (),
+) -> DiffResult:
+    """Compare two entity lists by key.
+
+    Entities are compared by their field values at the time of the call, so
+    the same lists can be compared again after models were changed in place.
+
+    Args:
+        old: Previous entities.
+        new: Current entities.
+        key: Field name or function returning the key of an entity.
+        ignore: Top-level fields excluded from the comparison, e.g. ``ts``.
+
+    Returns:
+        DiffResult with added, removed and changed entities.
+    """
+    get_key = operator.attrgetter(key) if isinstance(key, str) else key
+    ignore = frozenset(ignore)
+    exclude = set(ignore) or None
+
+    previous = {get_key(entity): entity for entity in old}
+    changes = []
+    unchanged = 0
+
+    seen = set()
+    for entity in new:
+        entity_key = get_key(entity)
+        seen.add(entity_key)
+        before = previous.get(entity_key)
+
+        if before is None:
+            changes.append(EntityChange(key=str(entity_key), kind="added"))
+        elif _equal(before, entity, ignore):
+            unchanged += 1
+        else:
+            fields = _field_changes(
+                before.model_dump(mode="json", exclude=exclude),
+                entity.model_dump(mode="json", exclude=exclude),
+            )
+            changes.append(EntityChange(key=str(entity_key), kind="changed", fields=fields))
+
+    changes.extend(
+        EntityChange(key=str(entity_key), kind="removed")
+        for entity_key in previous
+        if entity_key not in seen
+    )
+    return DiffResult(changes=changes, unchanged=unchanged)
+
+
+def diff_snapshots(
+    old: AccountSnapshot, new: AccountSnapshot, ignore: Iterable[str] = ()
+) -> dict[str, DiffResult]:
+    """Compare two account snapshots entity type by entity type.
+
+    Profile sub-resources are keyed by ``<profile PK>/<entity key>``.
+
+    Args:
+        old: Previous snapshot.
+        new: Current snapshot.
+        ignore: Top-level fields excluded from the comparison of every entity type.
+
+    Returns:
+        DiffResult keyed by entity type: profiles, folders, rules, services,
+        native_filters, third_party_filters, default_rules and devices.
+    """
+    old_entities, new_entities = _snapshot_entities(old), _snapshot_entities(new)
+    return {
+        entity_type: diff(
+            [entity for _, entity in old_entities[entity_type]],
+            [entity for _, entity in new_entities[entity_type]],
+            key=_composite_key(old_entities[entity_type] + new_entities[entity_type]),
+            ignore=ignore,
+        )
+        for entity_type in new_entities
+    }
+
+
+def _snapshot_entities(snapshot: AccountSnapshot) -> dict[str, list[tuple[str, BaseModel]]]:
+    """Flatten a snapshot into keyed entity lists.
+
+    Args:
+        snapshot: Account snapshot.
+
+    Returns:
+        Lists of (key, entity) pairs keyed by entity type.
+    """
+    entities: dict[str, list[tuple[str, BaseModel]]] = {
+        name: []
+        for name in (
+            "profiles",
+            "folders",
+            "rules",
+            "services",
+            "native_filters",
+            "third_party_filters",
+            "default_rules",
+            "devices",
+        )
+    }
+
+    for pk, profile in snapshot.profiles.items():
+        entities["profiles"].append((pk, profile.profile))
+        for folder in profile.rule_tree.folders.values():
+            if folder.folder is not None:
+                entities["folders"].append((f"{pk}/{folder.folder.PK}", folder.folder))
+            entities["rules"].extend((f"{pk}/{rule.PK}", rule) for rule in folder.rules.values())
+        entities["services"].extend((f"{pk}/{item.PK}", item) for item in profile.services)
+        entities["native_filters"].extend(
+            (f"{pk}/{item.PK}", item) for item in profile.native_filters
+        )
+        entities["third_party_filters"].extend(
+            (f"{pk}/{item.PK}", item) for item in profile.third_party_filters
+        )
+        entities["default_rules"].append((pk, profile.default_rule))
+
+    entities["devices"] = [(pk, device.device) for pk, device in snapshot.devices.items()]
+    return entities
+
+
+def _composite_key(pairs: list[tuple[str, BaseModel]]) -> Callable[[BaseModel], str]:
+    """Return a key function looking up the precomputed key of an entity instance."""
+    keys = {id(entity): entity_key for entity_key, entity in pairs}
+    return lambda entity: keys[id(entity)]
+
+
+def _field_changes(old: Any, new: Any, path: str = "") -> list[FieldChange]:
+    """Compare two JSON-like values recursively.
+
+    Args:
+        old: Previous value.
+        new: Current value.
+        path: Dotted path of the values.
+
+    Returns:
+        Changes of the leaf values. Lists are compared as a whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for name in {**old, **new}:
+            changes += _field_changes(
+                old.get(name), new.get(name), f"{path}.{name}" if path else name
+            )
+        return changes
+    return [] if old == new else [FieldChange(field=path, old=old, new=new)]
+
+
+def _equal(old: BaseModel, new: BaseModel, ignore: frozenset[str]) -> bool:
+    """Compare the current field values of two models.
+
+    Args:
+        old: Previous entity.
+        new: Current entity.
+        ignore: Top-level fields excluded from the comparison.
+
+    Returns:
+        True if the models have the same type and values.
+    """
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        return False
+
+    old_values, new_values = _values(old), _values(new)
+    if ignore:
+        old_values = {name: value for name, value in old_values.items() if name not in ignore}
+        new_values = {name: value for name, value in new_values.items() if name not in ignore}
+    return old_values == new_values
+
+
+def _values(model: BaseModel) -> dict[str, Any]:
+    """Return the field values of a model, including extra fields."""
+    extra = model.__pydantic_extra__
+    return {**model.__dict__, **extra} if extra else model.__dict__
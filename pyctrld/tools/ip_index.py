@@ -0,0 +1,348 @@
+"""IP address to device index over learned IPs and resolver addresses.
+
+IpIndex maps IPv4 and IPv6 addresses and networks to device PKs from three
+sources: IPs learned by a device (``AccessEndpoint.list_known_ips()``), the
+legacy IPv4 resolver of a device and the v4/v6 resolver addresses of a device.
+Single addresses are found with one dictionary lookup; networks are stored in a
+binary radix tree per IP version, so the most specific matching network is
+found in at most 32 (IPv4) or 128 (IPv6) steps, independent of the number of
+indexed devices.
+
+Example:
+    >>> index = IpIndex.from_snapshot(api.snapshot())
+    >>> index.lookup("198.51.100.7")
+    ('8fj2k3l1',)
+    >>> index.match("198.51.100.7")
+    {'8fj2k3l1': 'learned'}
+"""
+
+from __future__ import annotations
+
+import ipaddress
+from typing import TYPE_CHECKING, Literal, Optional, get_args
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator
+
+    from pyctrld._core.models.access import Ips
+    from pyctrld._core.models.devices import Device
+    from pyctrld._core.models.snapshot import AccountSnapshot
+
+IpSource = Literal["learned", "legacy_ipv4", "resolver"]
+
+_Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+_Address = ipaddress.IPv4Address | ipaddress.IPv6Address
+
+
+class _Node:
+    """Radix tree node of one network bit."""
+
+    __slots__ = ("children", "devices")
+
+    def __init__(self) -> None:
+        self.children: list[Optional[_Node]] = [None, None]
+        self.devices: dict[str, IpSource] = {}
+
+
+class IpIndex:
+    """Longest-prefix index from IP addresses and networks to device PKs.
+
+    Args:
+        devices: Devices whose resolver addresses are indexed.
+        known_ips: Learned IPs keyed by device PK.
+    """
+
+    def __init__(
+        self,
+        devices: Iterable[Device] = (),
+        known_ips: Optional[dict[str, Iterable[Ips]]] = None,
+    ) -> None:
+        """Build the index.
+
+        Args:
+            devices: Devices whose resolver addresses are indexed.
+            known_ips: Learned IPs keyed by device PK.
+        """
+        self._hosts: dict[_Address, dict[str, IpSource]] = {}
+        self._roots = {4: _Node(), 6: _Node()}
+        self._networks = 0
+        self._entries: dict[str, dict[_Network, set[IpSource]]] = {}
+
+        for device in devices:
+            self.add_device(device)
+        for device_id, ips in (known_ips or {}).items():
+            self.set_known_ips(device_id, ips)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: AccountSnapshot) -> IpIndex:
+        """Build the index of every device of an account snapshot.
+
+        Args:
+            snapshot: Account snapshot with devices and their known IPs.
+
+        Returns:
+            IpIndex of all devices.
+        """
+        return cls(
+            [device.device for device in snapshot.devices.values()],
+            {pk: device.known_ips for pk, device in snapshot.devices.items()},
+        )
+
+    def __repr__(self) -> str:
+        """Return string representation of the index.
+
+        Returns:
+            A string showing the number of indexed devices, addresses and networks.
+        """
+        return (
+            f"<{self.__class__.__name__} devices={len(self._entries)} "
+            f"addresses={len(self._hosts)} networks={self._networks}>"
+        )
+
+    def __len__(self) -> int:
+        """Return the number of indexed devices."""
+        return len(self._entries)
+
+    def add(self, network: str, device_id: str, source: IpSource = "learned") -> None:
+        """Map an address or network to a device.
+
+        Args:
+            network: IP address or CIDR network.
+            device_id: Primary key (PK) of the device.
+            source: Origin of the entry.
+
+        Raises:
+            ValueError: If ``network`` is not an IP address or network.
+        """
+        self._add(ipaddress.ip_network(network.strip(), strict=False), device_id, source)
+
+    def remove(self, network: str, device_id: str, source: Optional[IpSource] = None) -> bool:
+        """Remove the mapping of an address or network to a device.
+
+        Args:
+            network: IP address or CIDR network.
+            device_id: Primary key (PK) of the device.
+            source: Only remove the entry of this origin; all origins if None.
+
+        Returns:
+            True if the mapping existed.
+        """
+        parsed = ipaddress.ip_network(network.strip(), strict=False)
+        return self._remove(parsed, device_id, source)
+
+    def add_device(self, device: Device) -> None:
+        """Index the legacy IPv4 and v4/v6 resolver addresses of a device.
+
+        Resolver entries indexed for the device before are replaced, learned IPs are kept.
+
+        Args:
+            device: The device.
+        """
+        self._remove_source(device.PK, ("legacy_ipv4", "resolver"))
+        if device.legacy_ipv4 is not None and device.legacy_ipv4.resolver:
+            self.add(device.legacy_ipv4.resolver, device.PK, "legacy_ipv4")
+
+        v4 = device.resolvers.v4
+        for address in [*([v4] if isinstance(v4, str) else v4 or []), *(device.resolvers.v6 or [])]:
+            self.add(address, device.PK, "resolver")
+
+    def set_known_ips(self, device_id: str, ips: Iterable[Ips]) -> None:
+        """Replace the learned IPs of a device.
+
+        Only the difference to the previously indexed learned IPs is applied.
+
+        Args:
+            device_id: Primary key (PK) of the device.
+            ips: Current learned IPs, e.g. from ``AccessEndpoint.list_known_ips()``.
+        """
+        current = {
+            network
+            for network, sources in self._entries.get(device_id, {}).items()
+            if "learned" in sources
+        }
+        wanted = {ipaddress.ip_network(item.ip.strip(), strict=False) for item in ips}
+        for network in current - wanted:
+            self._remove(network, device_id, "learned")
+        for network in wanted - current:
+            self._add(network, device_id, "learned")
+
+    def remove_device(self, device_id: str) -> None:
+        """Remove every entry of a device.
+
+        Args:
+            device_id: Primary key (PK) of the device.
+        """
+        for network in list(self._entries.get(device_id, ())):
+            self._remove(network, device_id)
+
+    def match(self, ip: str) -> dict[str, IpSource]:
+        """Return the devices of the most specific address or network containing an IP.
+
+        Args:
+            ip: IPv4 or IPv6 address.
+
+        Returns:
+            Source of the entry keyed by device PK, empty if nothing matches or
+            ``ip`` is not an IP address. If a device has the entry from several
+            sources, the first of learned, legacy_ipv4 and resolver is reported.
+        """
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return {}
+
+        devices = self._hosts.get(address)
+        if devices is not None:
+            return dict(devices)
+        if not self._networks:
+            return {}
+
+        node: Optional[_Node] = self._roots[address.version]
+        best = node.devices
+        value = int(address)
+        for shift in range(address.max_prefixlen - 1, -1, -1):
+            node = node.children[(value >> shift) & 1]
+            if node is None:
+                break
+            if node.devices:
+                best = node.devices
+        return dict(best)
+
+    def lookup(self, ip: str) -> tuple[str, ...]:
+        """Return the PKs of the devices attributed to an IP.
+
+        Args:
+            ip: IPv4 or IPv6 address.
+
+        Returns:
+            Device PKs of the most specific matching entry, empty if nothing matches.
+        """
+        return tuple(self.match(ip))
+
+    def lookup_many(self, ips: Iterable[str]) -> list[tuple[str, ...]]:
+        """Attribute many IPs, resolving repeated IPs once.
+
+        Args:
+            ips: IPv4 or IPv6 addresses.
+
+        Returns:
+            Device PKs of each IP, in input order.
+        """
+        cache: dict[str, tuple[str, ...]] = {}
+        results = []
+        for ip in ips:
+            devices = cache.get(ip)
+            if devices is None:
+                devices = cache[ip] = self.lookup(ip)
+            results.append(devices)
+        return results
+
+    def _slot(self, network: _Network, create: bool = False) -> Optional[dict[str, IpSource]]:
+        """Return the device mapping of an address or network.
+
+        Args:
+            network: Parsed network; a full-length prefix is a single address.
+            create: Create the mapping if it does not exist.
+
+        Returns:
+            The mapping, or None if it does not exist and ``create`` is False.
+        """
+        if network.prefixlen == network.max_prefixlen:
+            if create:
+                return self._hosts.setdefault(network.network_address, {})
+            return self._hosts.get(network.network_address)
+
+        node = self._roots[network.version]
+        for bit in _bits(network):
+            child = node.children[bit]
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[bit] = _Node()
+            node = child
+        if create and not node.devices:
+            self._networks += 1
+        return node.devices
+
+    def _add(self, network: _Network, device_id: str, source: IpSource) -> None:
+        """Add one entry of a device.
+
+        Args:
+            network: Parsed network.
+            device_id: Primary key (PK) of the device.
+            source: Origin of the entry.
+        """
+        sources = self._entries.setdefault(device_id, {}).setdefault(network, set())
+        sources.add(source)
+        self._slot(network, create=True)[device_id] = _primary(sources)
+
+    def _remove(self, network: _Network, device_id: str, source: Optional[IpSource] = None) -> bool:
+        """Remove one entry of a device.
+
+        Args:
+            network: Parsed network.
+            device_id: Primary key (PK) of the device.
+            source: Only remove the entry of this origin; all origins if None.
+
+        Returns:
+            True if the entry existed.
+        """
+        entries = self._entries.get(device_id, {})
+        sources = entries.get(network)
+        if not sources or (source is not None and source not in sources):
+            return False
+
+        devices = self._slot(network)
+        if source is not None and len(sources) > 1:
+            sources.discard(source)
+            devices[device_id] = _primary(sources)
+            return True
+
+        del entries[network]
+        if not entries:
+            del self._entries[device_id]
+        del devices[device_id]
+        if not devices:
+            if network.prefixlen == network.max_prefixlen:
+                del self._hosts[network.network_address]
+            else:
+                self._networks -= 1
+                self._prune(network)
+        return True
+
+    def _prune(self, network: _Network) -> None:
+        """Drop the radix tree nodes of a network that no longer lead to an entry.
+
+        Args:
+            network: Parsed network whose node has just become empty.
+        """
+        path = []
+        node = self._roots[network.version]
+        for bit in _bits(network):
+            path.append((node, bit))
+            node = node.children[bit]
+        for parent, bit in reversed(path):
+            child = parent.children[bit]
+            if child.devices or child.children != [None, None]:
+                break
+            parent.children[bit] = None
+
+    def _remove_source(self, device_id: str, sources: Iterable[IpSource]) -> None:
+        """Remove the entries of a device that come from the given sources."""
+        for network, current in list(self._entries.get(device_id, {}).items()):
+            for source in current.intersection(sources):
+                self._remove(network, device_id, source)
+
+
+def _bits(network: _Network) -> Iterator[int]:
+    """Yield the prefix bits of a network, most significant first."""
+    value = int(network.network_address)
+    for shift in range(
+        network.max_prefixlen - 1, network.max_prefixlen - 1 - network.prefixlen, -1
+    ):
+        yield (value >> shift) & 1
+
+
+def _primary(sources: set[IpSource]) -> IpSource:
+    """Return the source reported for an entry that has several origins."""
+    return next(source for source in get_args(IpSource) if source in sources)
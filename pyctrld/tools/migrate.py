@@ -0,0 +1,215 @@
+"""Profile migration between accounts or organizations.
+
+``CreateProfileFormData.clone_profile_id`` only clones within one account.
+migrate_profiles() copies profiles with their folders, custom rules, services,
+filters, options and default rule from one API token to another: the source
+profiles are read concurrently, and each target profile is brought to the
+source state with a reconcile plan, which creates folders first and then the
+rules grouped by folder and action into multi-hostname create calls.
+
+Migration is resumable: with a checkpoint file, the target profile created for
+a source profile is remembered, verified profiles are skipped, and an
+interrupted profile is completed by reconciling it again, which only writes
+what is still missing.
+
+Example:
+    >>> source, target = ControlDApi(token="tenant_token"), ControlDApi(token="org_token")
+    >>> results = migrate_profiles(source, target, checkpoint="migration.ckpt")
+    >>> all(result.ok for result in results)
+    True
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from pydantic import BaseModel, Field
+
+from pyctrld._core.checkpoint import Checkpoint
+from pyctrld._core.concurrency import DEFAULT_MAX_WORKERS, RateLimiter
+from pyctrld._core.logger import logger
+from pyctrld._core.models.common import Status
+from pyctrld.api.profiles.profiles import CreateProfileFormData
+from pyctrld.tools.reconcile import OptionSpec, ProfileSpec, apply, plan
+from pyctrld.tools.snapshot import snapshot_profiles
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Iterable
+
+    from pyctrld._api import ControlDApi
+    from pyctrld._core.models.snapshot import ProfileSnapshot
+
+
+class MigrationResult(BaseModel):
+    """Outcome of the migration of one profile.
+
+    Attributes:
+        source_profile: Primary key (PK) of the source profile.
+        target_profile: Primary key (PK) of the target profile.
+        operations: Number of write operations executed on the target.
+        failed: Failed write operations mapped to their error.
+        counts: Source and target counts keyed by entity type (folders, rules,
+            services, enabled_filters, options).
+        skipped: True if the profile was already migrated according to the checkpoint.
+    """
+
+    source_profile: str
+    target_profile: str
+    operations: int = 0
+    failed: dict[str, str] = Field(default_factory=dict)
+    counts: dict[str, tuple[int, int]] = Field(default_factory=dict)
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True if all writes succeeded and every target count matches the source."""
+        return not self.failed and all(source == target for source, target in self.counts.values())
+
+
+def migrate_profiles(
+    source: ControlDApi,
+    target: ControlDApi,
+    profile_ids: Optional[Iterable[str]] = None,
+    checkpoint: Optional[Checkpoint | str | Path] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> list[MigrationResult]:
+    """Copy profiles from the source account to the target account.
+
+    Args:
+        source: API client of the source account.
+        target: API client of the target account or sub-organization.
+        profile_ids: Source profile PKs to migrate. Defaults to all profiles.
+        checkpoint: Optional Checkpoint, or path of the journal file, making the
+            migration resumable. Without a checkpoint, every run creates new
+            target profiles.
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+    Returns:
+        MigrationResult of every selected profile, in source listing order.
+
+    Raises:
+        ApiError: If reading the source or creating a target profile fails.
+    """
+    rate_limiter = rate_limiter or RateLimiter()
+    if checkpoint is not None and not isinstance(checkpoint, Checkpoint):
+        checkpoint = Checkpoint(checkpoint)
+    selected = set(profile_ids) if profile_ids is not None else None
+    profiles = [
+        profile
+        for profile in source.profiles.profiles.list()
+        if selected is None or profile.PK in selected
+    ]
+
+    results = []
+    pending = []
+    for profile in profiles:
+        record = checkpoint.get(profile.PK) if checkpoint is not None else None
+        if record is not None and record["ok"]:
+            results.append(
+                MigrationResult(
+                    source_profile=profile.PK, target_profile=record["target"], skipped=True
+                )
+            )
+        else:
+            pending.append(profile)
+
+    sources = snapshot_profiles(source, pending, max_workers=max_workers, rate_limiter=rate_limiter)
+    for profile in pending:
+        result = _migrate_profile(
+            sources[profile.PK], target, checkpoint, max_workers, rate_limiter
+        )
+        if checkpoint is not None and result.ok:
+            checkpoint.mark_done([profile.PK], target=result.target_profile)
+        results.append(result)
+
+    logger.info(
+        f"Migrated {sum(result.ok for result in results)}/{len(results)} profiles, "
+        f"{sum(result.skipped for result in results)} already done"
+    )
+    return results
+
+
+def _migrate_profile(
+    snapshot: ProfileSnapshot,
+    target: ControlDApi,
+    checkpoint: Optional[Checkpoint],
+    max_workers: int,
+    rate_limiter: RateLimiter,
+) -> MigrationResult:
+    """Create or complete the target copy of one source profile.
+
+    Args:
+        snapshot: Snapshot of the source profile.
+        target: API client of the target account.
+        checkpoint: Optional journal of the migration.
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests.
+
+    Returns:
+        MigrationResult of the profile.
+    """
+    source_id = snapshot.profile.PK
+    created_key = f"{source_id}:target"
+    record = checkpoint.get(created_key) if checkpoint is not None else None
+
+    if record is not None:
+        target_id = record["target"]
+    else:
+        target_id = target.profiles.profiles.create(
+            CreateProfileFormData(name=snapshot.profile.name)
+        )[0].PK
+        if checkpoint is not None:
+            checkpoint.mark_done([created_key], target=target_id)
+
+    def snapshot_target() -> ProfileSnapshot:
+        profiles = [
+            profile for profile in target.profiles.profiles.list() if profile.PK == target_id
+        ]
+        return snapshot_profiles(
+            target, profiles, max_workers=max_workers, rate_limiter=rate_limiter
+        )[target_id]
+
+    current = snapshot_target()
+    spec = ProfileSpec.from_snapshot(snapshot)
+    for data in current.profile.profile.opt.data:
+        spec.options.setdefault(data.PK, OptionSpec(status=False))
+
+    migration_plan = plan(spec, current)
+    applied = apply(target, migration_plan, max_workers=max_workers, rate_limiter=rate_limiter)
+
+    return MigrationResult(
+        source_profile=source_id,
+        target_profile=target_id,
+        operations=len(applied.succeeded),
+        failed=applied.failed,
+        counts={
+            name: (count, target_count)
+            for (name, count), target_count in zip(
+                _counts(snapshot).items(), _counts(snapshot_target()).values()
+            )
+        },
+    )
+
+
+def _counts(snapshot: ProfileSnapshot) -> dict[str, int]:
+    """Count the migrated entities of a profile snapshot.
+
+    Args:
+        snapshot: Profile snapshot.
+
+    Returns:
+        Entity counts keyed by entity type.
+    """
+    return {
+        "folders": len(snapshot.rule_tree.folders) - 1,
+        "rules": len(snapshot.rule_tree.rules()),
+        "services": len(snapshot.services),
+        "enabled_filters": sum(
+            item.status == Status.ENABLED
+            for item in [*snapshot.native_filters, *snapshot.third_party_filters]
+        ),
+        "options": len(snapshot.profile.profile.opt.data),
+    }
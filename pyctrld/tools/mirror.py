@@ -0,0 +1,384 @@
+"""Local SQLite mirror of ControlD account state.
+
+The mirror stores profiles, rule folders, custom rules, services, filters,
+devices and known IPs in a SQLite database so that questions spanning the
+whole account can be answered locally in milliseconds.
+
+Table columns are derived from the scalar fields of the Pydantic models
+(``CustomRule``, ``Device``, ...); every row also keeps the complete model as
+JSON in its ``data`` column, so query results are returned as models again.
+The database records a version derived from these columns; when the models
+change, an existing mirror is rebuilt empty and has to be refreshed again.
+
+Example:
+    >>> from pyctrld import ControlDApi
+    >>> from pyctrld.tools.mirror import Mirror
+    >>> with Mirror("account.db") as mirror:
+    ...     mirror.refresh(ControlDApi(token="your_api_token"))
+    ...     mirror.profiles_with_rule("example.com")
+    ['PK123']
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import sqlite3
+import time
+import typing
+import zlib
+from enum import Enum
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
+
+from pydantic import BaseModel
+
+from pyctrld._core.concurrency import DEFAULT_MAX_WORKERS, RateLimiter
+from pyctrld._core.logger import logger
+from pyctrld._core.models.access import Ips
+from pyctrld._core.models.devices import Device
+from pyctrld._core.models.profiles.custom_rules import CustomRule
+from pyctrld._core.models.profiles.filters import NativeFilter, ThirdPartyFilter
+from pyctrld._core.models.profiles.profiles import ProfileObject
+from pyctrld._core.models.profiles.rule_folders import RuleFolder
+from pyctrld._core.models.profiles.services import Service
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Mapping
+
+    from typing_extensions import Self
+
+    from pyctrld._api import ControlDApi
+    from pyctrld._core.models.snapshot import AccountSnapshot
+
+SECONDS_PER_DAY = 86400
+
+_SQL_TYPES = {str: "TEXT", int: "INTEGER", float: "REAL", bool: "INTEGER"}
+
+
+class _Table(NamedTuple):
+    """Mapping of a model to a mirror table."""
+
+    name: str
+    model: type[BaseModel]
+    parent: Optional[str] = None
+    extra: Mapping[str, Callable[[Any], Any]] = MappingProxyType({})
+    indexes: tuple[str, ...] = ()
+
+
+_TABLES = {
+    table.name: table
+    for table in (
+        _Table("profiles", ProfileObject),
+        _Table("folders", RuleFolder, "profile_pk", indexes=("profile_pk", "group")),
+        _Table("rules", CustomRule, "profile_pk", indexes=("PK", "profile_pk", "group")),
+        _Table("services", Service, "profile_pk", indexes=("PK", "profile_pk")),
+        _Table("native_filters", NativeFilter, "profile_pk", indexes=("profile_pk",)),
+        _Table("third_party_filters", ThirdPartyFilter, "profile_pk", indexes=("profile_pk",)),
+        _Table(
+            "devices",
+            Device,
+            extra={
+                "profile_pk": lambda device: device.profile.PK,
+                "resolver_uid": lambda device: device.resolvers.uid,
+            },
+            indexes=("device_id", "profile_pk", "resolver_uid"),
+        ),
+        _Table("known_ips", Ips, "device_pk", indexes=("device_pk", "ip")),
+    )
+}
+
+
+class Mirror:
+    """SQLite mirror of an account with indexed query helpers.
+
+    Args:
+        path: Database file, or ":memory:" for an in-memory mirror.
+    """
+
+    def __init__(self, path: str | Path = ":memory:") -> None:
+        """Open the database and create the tables and indexes.
+
+        A database written with a different schema version is emptied and rebuilt.
+
+        Args:
+            path: Database file, or ":memory:" for an in-memory mirror.
+        """
+        self._path = os.fspath(path)
+        self._connection = sqlite3.connect(self._path)
+        self._connection.row_factory = sqlite3.Row
+
+        statements = _schema()
+        version = zlib.crc32("\n".join(statements).encode()) & 0x7FFFFFFF
+        stored = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if stored == version:
+            return
+
+        if stored:
+            logger.info(f"Mirror schema of {self._path} changed, rebuilding it")
+        with self._connection:
+            for name in _TABLES:
+                self._connection.execute(f'DROP TABLE IF EXISTS "{name}"')
+            for statement in statements:
+                self._connection.execute(statement)
+            self._connection.execute(f"PRAGMA user_version = {version}")
+
+    def __repr__(self) -> str:
+        """Return string representation of the mirror.
+
+        Returns:
+            A string showing the database path.
+        """
+        return f"<{self.__class__.__name__} path={self._path}>"
+
+    def __enter__(self) -> Self:
+        """Return the mirror for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the database connection."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def load(self, snapshot: AccountSnapshot) -> None:
+        """Replace the mirror content with an account snapshot.
+
+        Args:
+            snapshot: Snapshot to store, e.g. from ``ControlDApi.snapshot()``.
+        """
+        rows: dict[str, list[tuple[Optional[str], BaseModel]]] = {name: [] for name in _TABLES}
+
+        for profile_id, profile in snapshot.profiles.items():
+            rows["profiles"].append((None, profile.profile))
+            for folder in profile.rule_tree.folders.values():
+                if folder.folder is not None:
+                    rows["folders"].append((profile_id, folder.folder))
+                rows["rules"].extend((profile_id, rule) for rule in folder.rules.values())
+            rows["services"].extend((profile_id, service) for service in profile.services)
+            rows["native_filters"].extend((profile_id, item) for item in profile.native_filters)
+            rows["third_party_filters"].extend(
+                (profile_id, item) for item in profile.third_party_filters
+            )
+
+        for device_id, device in snapshot.devices.items():
+            rows["devices"].append((None, device.device))
+            rows["known_ips"].extend((device_id, ip) for ip in device.known_ips)
+
+        with self._connection:
+            for name, items in rows.items():
+                table = _TABLES[name]
+                columns = _table_columns(table)
+                self._connection.execute(f'DELETE FROM "{name}"')
+                self._connection.executemany(
+                    f'INSERT INTO "{name}" ({", ".join(map(_quote, columns))}) '
+                    f"VALUES ({', '.join('?' * len(columns))})",
+                    [_row(table, parent, item) for parent, item in items],
+                )
+
+        logger.info(
+            f"Mirror loaded: {len(rows['profiles'])} profiles, {len(rows['rules'])} rules, "
+            f"{len(rows['devices'])} devices"
+        )
+
+    def refresh(
+        self,
+        api: ControlDApi,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """Take a fresh account snapshot and load it into the mirror.
+
+        Args:
+            api: API client of the account.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+        """
+        from pyctrld.tools.snapshot import take_snapshot
+
+        self.load(take_snapshot(api, max_workers=max_workers, rate_limiter=rate_limiter))
+
+    def query(self, sql: str, parameters: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        """Run an arbitrary read query against the mirror.
+
+        Args:
+            sql: SQL statement.
+            parameters: Statement parameters.
+
+        Returns:
+            Result rows, accessible by column name.
+        """
+        return self._connection.execute(sql, parameters).fetchall()
+
+    def profiles_with_rule(self, hostname: str) -> list[str]:
+        """Find the profiles that have a custom rule for a hostname.
+
+        Args:
+            hostname: Exact rule hostname.
+
+        Returns:
+            Sorted profile PKs.
+        """
+        rows = self.query(
+            'SELECT DISTINCT profile_pk FROM rules WHERE "PK" = ? ORDER BY profile_pk', (hostname,)
+        )
+        return [row["profile_pk"] for row in rows]
+
+    def rules(self, profile_id: str, folder_id: Optional[int] = None) -> list[CustomRule]:
+        """Return the custom rules of a profile, optionally of one folder only.
+
+        Args:
+            profile_id: Primary key (PK) of the profile.
+            folder_id: Folder ID, 0 for the root folder. None for all folders.
+
+        Returns:
+            CustomRule objects.
+        """
+        sql = "SELECT data FROM rules WHERE profile_pk = ?"
+        parameters: tuple[Any, ...] = (profile_id,)
+        if folder_id is not None:
+            sql += ' AND "group" = ?'
+            parameters += (folder_id,)
+        return self._models(CustomRule, sql, parameters)
+
+    def devices_using_profile(self, profile_id: str) -> list[Device]:
+        """Return the devices whose primary profile is the given profile.
+
+        Args:
+            profile_id: Primary key (PK) of the profile.
+
+        Returns:
+            Device objects.
+        """
+        return self._models(Device, "SELECT data FROM devices WHERE profile_pk = ?", (profile_id,))
+
+    def device_by_resolver(self, uid: str) -> Optional[Device]:
+        """Return the device owning a resolver UID.
+
+        Args:
+            uid: Resolver UID.
+
+        Returns:
+            The Device, or None if no device uses the UID.
+        """
+        devices = self._models(Device, "SELECT data FROM devices WHERE resolver_uid = ?", (uid,))
+        return devices[0] if devices else None
+
+    def inactive_devices(self, days: int = 30, now: Optional[float] = None) -> list[Device]:
+        """Return the devices without activity in the given number of days.
+
+        Devices that never reported activity are included.
+
+        Args:
+            days: Inactivity period.
+            now: Reference Unix timestamp. Defaults to the current time.
+
+        Returns:
+            Device objects.
+        """
+        cutoff = (time.time() if now is None else now) - days * SECONDS_PER_DAY
+        return self._models(
+            Device,
+            "SELECT data FROM devices WHERE last_activity IS NULL OR last_activity < ?",
+            (cutoff,),
+        )
+
+    def _models(self, model: type[BaseModel], sql: str, parameters: tuple[Any, ...]) -> list[Any]:
+        """Run a query selecting the data column and validate the rows as models.
+
+        Args:
+            model: Model of the rows.
+            sql: SQL statement selecting ``data``.
+            parameters: Statement parameters.
+
+        Returns:
+            Model instances.
+        """
+        return [model.model_validate_json(row["data"]) for row in self.query(sql, parameters)]
+
+
+def _schema() -> list[str]:
+    """Return the statements creating the mirror tables and indexes.
+
+    Returns:
+        SQL statements in execution order.
+    """
+    statements = []
+    for table in _TABLES.values():
+        columns = _table_columns(table)
+        statements.append(
+            f'CREATE TABLE "{table.name}" '
+            f"({', '.join(f'{_quote(name)} {type_}' for name, type_ in columns.items())})"
+        )
+        statements.extend(
+            f'CREATE INDEX "ix_{table.name}_{column}" ON "{table.name}" ({_quote(column)})'
+            for column in table.indexes
+        )
+    return statements
+
+
+def _table_columns(table: _Table) -> dict[str, str]:
+    """Return the columns of a table in insertion order.
+
+    Args:
+        table: Table mapping.
+
+    Returns:
+        Column names mapped to SQLite types.
+    """
+    columns = {table.parent: "TEXT"} if table.parent else {}
+    columns |= {name: "TEXT" for name in table.extra}
+    columns |= _model_columns(table.model)
+    columns["data"] = "TEXT"
+    return columns
+
+
+@functools.cache
+def _model_columns(model: type[BaseModel]) -> dict[str, str]:
+    """Derive columns from the scalar and enum fields of a model.
+
+    Args:
+        model: Pydantic model.
+
+    Returns:
+        Field names mapped to SQLite types.
+    """
+    columns = {}
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        arguments = typing.get_args(annotation)
+        if type(None) in arguments and len(arguments) == 2:
+            annotation = next(argument for argument in arguments if argument is not type(None))
+
+        if annotation in _SQL_TYPES:
+            columns[name] = _SQL_TYPES[annotation]
+        elif isinstance(annotation, type) and issubclass(annotation, Enum):
+            columns[name] = "INTEGER"
+    return columns
+
+
+def _row(table: _Table, parent: Optional[str], item: BaseModel) -> tuple[Any, ...]:
+    """Build the column values of a model instance.
+
+    Args:
+        table: Table mapping.
+        parent: Value of the parent column (profile or device PK).
+        item: Model instance.
+
+    Returns:
+        Values in column order.
+    """
+    values = item.model_dump(mode="json")
+    row: list[Any] = [parent] if table.parent else []
+    row += [extract(item) for extract in table.extra.values()]
+    row += [values.get(name) for name in _model_columns(table.model)]
+    row.append(item.model_dump_json(exclude_none=True))
+    return tuple(row)
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier, e.g. the reserved column names ``group`` and ``order``."""
+    return f'"{identifier}"'
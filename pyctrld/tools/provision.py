@@ -0,0 +1,93 @@
+"""Bulk device provisioning from CSV or NDJSON files.
+
+Each CSV row or JSON line holds the fields of one ``CreateDeviceFormData``
+(``name``, ``profile_id``, ``icon``, ...). Empty CSV cells are treated as unset.
+provision_devices() reads the file and creates the devices with
+``DevicesEndpoint.bulk_create_devices()``, which skips devices that already
+exist, so a failed or interrupted run can simply be repeated.
+
+Example:
+    >>> result = provision_devices(api, "routers.csv", key="desc", output="resolvers.ndjson")
+    >>> len(result.succeeded), len(result.skipped)
+    (1998, 2)
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from typing import TYPE_CHECKING, Literal, Optional
+
+from pyctrld._core.concurrency import DEFAULT_MAX_WORKERS, RateLimiter
+from pyctrld.api.devices import CreateDeviceFormData
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Iterator
+
+    from pyctrld._api import ControlDApi
+    from pyctrld._core.models.bulk import BulkResult
+
+
+def read_device_rows(path: str | Path) -> Iterator[CreateDeviceFormData]:
+    """Read device creation rows from a CSV (``.csv``) or NDJSON file.
+
+    Args:
+        path: Input file.
+
+    Yields:
+        CreateDeviceFormData of every row.
+
+    Raises:
+        ValueError: If a row is not valid creation form data. The message
+            contains the file name and line number.
+    """
+    path = os.fspath(path)
+    with open(path, encoding="utf-8", newline="") as file:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(file)
+            rows = (
+                (reader.line_num, {name: value for name, value in row.items() if value})
+                for row in reader
+            )
+        else:
+            rows = (
+                (number, json.loads(line)) for number, line in enumerate(file, 1) if line.strip()
+            )
+
+        for line, row in rows:
+            try:
+                yield CreateDeviceFormData.model_validate(row)
+            except ValueError as error:
+                raise ValueError(f"{path}:{line}: {error}") from error
+
+
+def provision_devices(
+    api: ControlDApi,
+    path: str | Path,
+    key: Literal["name", "desc"] = "name",
+    output: Optional[str | Path] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> BulkResult:
+    """Create the devices listed in a CSV or NDJSON file.
+
+    Args:
+        api: API client of the account.
+        path: Input file, see read_device_rows().
+        key: Field identifying a device across runs (name or description).
+        output: Optional path of the resolver output file (JSON lines).
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+    Returns:
+        BulkResult with created, failed and already existing device keys.
+    """
+    return api.devices.bulk_create_devices(
+        list(read_device_rows(path)),
+        key=key,
+        output=output,
+        max_workers=max_workers,
+        rate_limiter=rate_limiter,
+    )
@@ -0,0 +1,620 @@
+"""Declarative desired-state reconciliation for profiles.
+
+A ProfileSpec describes the desired folders, custom rules, service rules, filter
+states, default rule and options of a profile. plan() diffs a spec against a
+ProfileSnapshot without any API call and returns the minimal list of operations
+needed; apply() executes a plan, running independent operations concurrently
+while keeping the required ordering (folders are created before the rules that
+reference them, rules are moved out of a folder before it is deleted).
+
+Example:
+    >>> spec = ProfileSpec(
+    ...     folders={"ads": FolderSpec(do=Do.BLOCK)},
+    ...     rules={"ads.example.com": RuleSpec(do=Do.BLOCK, folder="ads")},
+    ...     filters={"malware": True},
+    ... )
+    >>> result = reconcile(api, "PK123", spec, dry_run=True)
+    >>> print(result.plan.describe())
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Literal, Optional
+
+from pydantic import BaseModel, Field, field_validator
+from requests import RequestException
+
+from pyctrld._core.concurrency import DEFAULT_MAX_WORKERS, RateLimiter, chunked
+from pyctrld._core.exceptions import ApiError
+from pyctrld._core.logger import logger
+from pyctrld._core.models.bulk import BulkResult
+from pyctrld._core.models.common import Do, Status
+from pyctrld._core.scheduler import TaskScheduler
+from pyctrld.api.profiles.custom_rules import (
+    CUSTOM_RULES_CHUNK_SIZE,
+    ROOT_FOLDER,
+    CreateCustomRuleFormData,
+    ModifyCustomRuleFormData,
+)
+from pyctrld.api.profiles.default_rule import DefaultRuleFormData
+from pyctrld.api.profiles.filters import ModifyFilterFormData
+from pyctrld.api.profiles.profiles import ModifyOptionFormData
+from pyctrld.api.profiles.rule_folders import (
+    CreateRuleFoldersFormData,
+    RuleFoldersFormData,
+)
+from pyctrld.api.profiles.services import ModifyServiceFormData
+
+if TYPE_CHECKING:
+    from pyctrld._api import ControlDApi
+    from pyctrld._core.models.common import Action
+    from pyctrld._core.models.snapshot import ProfileSnapshot
+
+OperationKind = Literal[
+    "create_folder",
+    "modify_folder",
+    "delete_folder",
+    "create_rules",
+    "modify_rules",
+    "delete_rule",
+    "modify_service",
+    "modify_filter",
+    "modify_default_rule",
+    "modify_option",
+]
+
+
+class ActionSpec(BaseModel):
+    """Desired action of a rule, folder, service or default rule.
+
+    ``via`` and ``via_v6`` are only compared with the live state when they are set.
+
+    Args:
+        do (Optional[Do | int]): Rule type. (BLOCK = 0, BYPASS = 1, SPOOF = 2, REDIRECT = 3).
+        status (bool | Status): Rule status. Defaults to ENABLED.
+        via (Optional[str]): Spoof/Redirect target.
+        via_v6 (Optional[str]): IPv6 spoof target.
+    """
+
+    do: Optional[Do] = None
+    status: Status = Status.ENABLED
+    via: Optional[str] = None
+    via_v6: Optional[str] = None
+
+    @field_validator("do", mode="before")
+    @classmethod
+    def set_do(cls, value):
+        return None if value is None else Do(value)
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def set_status(cls, value):
+        return Status(value)
+
+    def matches(self, action: Action) -> bool:
+        """Check whether a live action already satisfies this spec.
+
+        Args:
+            action: Live action.
+
+        Returns:
+            True if no change is needed.
+        """
+        return (
+            (self.do is None or action.do == self.do)
+            and action.status == self.status
+            and (self.via is None or action.via == self.via)
+            and (self.via_v6 is None or action.via_v6 == self.via_v6)
+        )
+
+    def fields(self) -> dict[str, Any]:
+        """Return the form data fields of this spec, without unset values.
+
+        Returns:
+            Dictionary of field names to values.
+        """
+        return self.model_dump(
+            mode="json", include={"do", "status", "via", "via_v6"}, exclude_none=True
+        )
+
+
+class FolderSpec(ActionSpec):
+    """Desired state of a rule folder, identified by its name in ProfileSpec.folders."""
+
+
+class RuleSpec(ActionSpec):
+    """Desired state of a custom rule, identified by its hostname in ProfileSpec.rules.
+
+    Args:
+        do (Do | int): Rule type. (BLOCK = 0, BYPASS = 1, SPOOF = 2, REDIRECT = 3).
+        folder (Optional[str]): Name of the folder holding the rule, None for the root folder.
+    """
+
+    do: Do
+    folder: Optional[str] = None
+
+
+class OptionSpec(BaseModel):
+    """Desired state of a profile option.
+
+    Args:
+        status (bool): True to enable the option, False to disable it.
+        value (Optional[str]): Value of an enabled option.
+    """
+
+    status: bool = True
+    value: Optional[str] = None
+
+
+class ProfileSpec(BaseModel):
+    """Desired state of a profile.
+
+    Only the listed items are managed. Folders and rules missing from the spec are
+    deleted only when ``prune`` is True; services, filters and options not listed
+    are always left untouched.
+
+    Args:
+        folders: Folder specs keyed by folder name.
+        rules: Rule specs keyed by hostname.
+        services: Service rule specs keyed by service PK.
+        filters: Desired filter states keyed by native or third-party filter PK.
+        default_rule: Desired default rule.
+        options: Option specs keyed by option PK.
+        prune: Delete folders and rules that are not in the spec.
+    """
+
+    folders: dict[str, FolderSpec] = Field(default_factory=dict)
+    rules: dict[str, RuleSpec] = Field(default_factory=dict)
+    services: dict[str, ActionSpec] = Field(default_factory=dict)
+    filters: dict[str, bool] = Field(default_factory=dict)
+    default_rule: Optional[ActionSpec] = None
+    options: dict[str, OptionSpec] = Field(default_factory=dict)
+    prune: bool = False
+
+    @classmethod
+    def from_snapshot(cls, snapshot: ProfileSnapshot, prune: bool = True) -> ProfileSpec:
+        """Describe the current state of a profile as a spec.
+
+        Reconciling another profile with this spec makes it a copy of the snapshot.
+
+        Args:
+            snapshot: Profile snapshot.
+            prune: Value of the ``prune`` flag of the spec.
+
+        Returns:
+            ProfileSpec with all folders, rules, services, filters, enabled options
+            and the default rule of the snapshot.
+        """
+        spec = cls(prune=prune, default_rule=ActionSpec(**_action_spec(snapshot.default_rule)))
+        folder_names = {}
+
+        for folder in snapshot.rule_tree.folders.values():
+            if folder.folder is not None:
+                folder_names[folder.folder.PK] = folder.folder.group
+                spec.folders[folder.folder.group] = FolderSpec(**_action_spec(folder.folder.action))
+
+        for folder_id, folder in snapshot.rule_tree.folders.items():
+            inherited = folder.folder.action if folder.folder else None
+            for hostname, rule in folder.rules.items():
+                spec.rules[hostname] = RuleSpec(
+                    **_action_spec(_effective_action(rule.action, inherited)),
+                    folder=folder_names.get(folder_id),
+                )
+
+        spec.services = {
+            service.PK: ActionSpec(**_action_spec(service.action)) for service in snapshot.services
+        }
+        spec.filters = {
+            item.PK: item.status == Status.ENABLED
+            for item in [*snapshot.native_filters, *snapshot.third_party_filters]
+        }
+        spec.options = {
+            data.PK: OptionSpec(value=None if data.value is None else str(data.value))
+            for data in snapshot.profile.profile.opt.data
+        }
+        return spec
+
+
+class Operation(BaseModel):
+    """A single API call of a reconcile plan.
+
+    Attributes:
+        id: Position of the operation in the plan.
+        kind: Type of the API call.
+        key: Folder name, service PK, filter PK or option PK the call applies to.
+        folder_id: PK of an existing folder to modify or delete.
+        folder: Name of the folder rules are created in or moved to, None for the root folder.
+        hostnames: Hostnames of rule operations.
+        data: Form data fields of the call.
+        depends_on: IDs of operations that must finish before this one starts.
+    """
+
+    id: int
+    kind: OperationKind
+    key: str = ""
+    folder_id: Optional[int] = None
+    folder: Optional[str] = None
+    hostnames: list[str] = Field(default_factory=list)
+    data: dict[str, Any] = Field(default_factory=dict)
+    depends_on: list[int] = Field(default_factory=list)
+
+    def describe(self) -> str:
+        """Return a one-line human readable description of the operation.
+
+        Returns:
+            Description string.
+        """
+        target = self.key
+        if self.hostnames:
+            target = ", ".join(self.hostnames[:3])
+            if len(self.hostnames) > 3:
+                target += f" (+{len(self.hostnames) - 3})"
+        return f"#{self.id} {self.kind} {target} {self.data or ''}".rstrip()
+
+
+class Plan(BaseModel):
+    """Ordered operations reconciling a profile with its spec.
+
+    Attributes:
+        profile_id: Primary key (PK) of the profile.
+        operations: Operations in plan order.
+    """
+
+    profile_id: str
+    operations: list[Operation] = Field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Return the number of operations."""
+        return len(self.operations)
+
+    def describe(self) -> str:
+        """Return a multi-line human readable description of the plan.
+
+        Returns:
+            One line per operation, or a note that nothing has to change.
+        """
+        if not self.operations:
+            return f"{self.profile_id}: up to date"
+        return "\n".join(operation.describe() for operation in self.operations)
+
+
+class ReconcileResult(BulkResult):
+    """Outcome of reconcile(), keyed by operation description (see Operation.describe()).
+
+    Attributes:
+        plan: Plan that was computed.
+        dry_run: True if the plan was only computed, not applied.
+    """
+
+    plan: Plan
+    dry_run: bool = False
+
+
+def plan(
+    spec: ProfileSpec,
+    snapshot: ProfileSnapshot,
+    chunk_size: int = CUSTOM_RULES_CHUNK_SIZE,
+) -> Plan:
+    """Compute the operations that bring a profile to its desired state.
+
+    Runs offline against a snapshot, e.g. one loaded from a nightly backup.
+
+    Args:
+        spec: Desired state of the profile.
+        snapshot: Current state of the profile.
+        chunk_size: Maximum number of hostnames per rule create/modify operation.
+
+    Returns:
+        The reconcile Plan, empty if the profile already matches the spec.
+
+    Raises:
+        ValueError: If the spec cannot be applied, e.g. a default rule without ``do``
+            or a rule in a folder that is neither in the spec nor kept in the profile.
+    """
+    if spec.default_rule is not None:
+        DefaultRuleFormData(**spec.default_rule.fields())
+
+    builder = _PlanBuilder(snapshot.profile.PK)
+    tree = snapshot.rule_tree
+
+    # Folders
+    live_folders = {
+        folder.folder.group: folder.folder
+        for folder in tree.folders.values()
+        if folder.folder is not None
+    }
+    folder_names = {folder.PK: name for name, folder in live_folders.items()}
+    folder_actions = {folder.PK: folder.action for folder in live_folders.values()}
+
+    known_folders = set(spec.folders) if spec.prune else set(spec.folders) | set(live_folders)
+    for hostname, rule_spec in spec.rules.items():
+        if rule_spec.folder is not None and rule_spec.folder not in known_folders:
+            raise ValueError(
+                f"rule {hostname}: folder {rule_spec.folder!r} is not in the spec"
+                + ("" if spec.prune else " or the profile")
+            )
+    created_folders: dict[str, int] = {}
+
+    for name, folder_spec in spec.folders.items():
+        live = live_folders.get(name)
+        if live is None:
+            created_folders[name] = builder.add(
+                "create_folder", key=name, data=folder_spec.fields()
+            )
+        elif not folder_spec.matches(live.action):
+            builder.add("modify_folder", key=name, folder_id=live.PK, data=folder_spec.fields())
+
+    # Custom rules
+    live_rules = tree.rules()
+    creates: dict[tuple, list[str]] = {}
+    modifies: dict[tuple, list[str]] = {}
+
+    for hostname, rule_spec in spec.rules.items():
+        target = (rule_spec.folder, tuple(sorted(rule_spec.fields().items())))
+        live = live_rules.get(hostname)
+        if live is None:
+            creates.setdefault(target, []).append(hostname)
+        elif (
+            not rule_spec.matches(_effective_action(live.action, folder_actions.get(live.group)))
+            or folder_names.get(live.group) != rule_spec.folder
+        ):
+            modifies.setdefault(target, []).append(hostname)
+
+    rule_operations = []
+    for kind, groups in (("create_rules", creates), ("modify_rules", modifies)):
+        for (folder, fields), hostnames in groups.items():
+            depends_on = [created_folders[folder]] if folder in created_folders else []
+            for chunk in chunked(hostnames, chunk_size):
+                rule_operations.append(
+                    builder.add(
+                        kind,
+                        key=folder or "",
+                        folder=folder,
+                        hostnames=chunk,
+                        data=dict(fields),
+                        depends_on=depends_on,
+                    )
+                )
+
+    if spec.prune:
+        pruned_folders = {pk for pk, name in folder_names.items() if name not in spec.folders}
+        for hostname, rule in live_rules.items():
+            if hostname not in spec.rules and rule.group not in pruned_folders:
+                builder.add("delete_rule", hostnames=[hostname])
+        for folder_id in pruned_folders:
+            builder.add(
+                "delete_folder",
+                key=folder_names[folder_id],
+                folder_id=folder_id,
+                depends_on=rule_operations,
+            )
+
+    # Services
+    live_services = {service.PK: service for service in snapshot.services}
+    for service, service_spec in spec.services.items():
+        live = live_services.get(service)
+        if live is None or not service_spec.matches(live.action):
+            builder.add("modify_service", key=service, data=service_spec.fields())
+
+    # Filters
+    live_filters = {
+        live.PK: live.status == Status.ENABLED
+        for live in [*snapshot.native_filters, *snapshot.third_party_filters]
+    }
+    for filter_id, enabled in spec.filters.items():
+        if live_filters.get(filter_id) != enabled:
+            builder.add("modify_filter", key=filter_id, data={"status": enabled})
+
+    # Default rule
+    if spec.default_rule is not None and not spec.default_rule.matches(snapshot.default_rule):
+        builder.add("modify_default_rule", data=spec.default_rule.fields())
+
+    # Options
+    live_options = {data.PK: data.value for data in snapshot.profile.profile.opt.data}
+    for option, option_spec in spec.options.items():
+        enabled = option in live_options
+        if option_spec.status != enabled or (
+            enabled
+            and option_spec.value is not None
+            and str(live_options[option]) != option_spec.value
+        ):
+            builder.add("modify_option", key=option, data=option_spec.model_dump())
+
+    return builder.plan
+
+
+def apply(
+    api: ControlDApi,
+    plan: Plan,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> BulkResult:
+    """Execute a reconcile plan.
+
+    Operations start as soon as the operations they depend on have finished.
+    A failed operation does not stop independent operations; operations that
+    depend on it are skipped.
+
+    Args:
+        api: API client of the account owning the profile.
+        plan: Plan returned by plan().
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+    Returns:
+        BulkResult keyed by operation description (see Operation.describe()).
+    """
+    profile_id = plan.profile_id
+    profiles_api = api.profiles
+    folder_ids: dict[Optional[str], int] = {None: ROOT_FOLDER}
+    if any(operation.folder is not None for operation in plan.operations):
+        folder_ids |= {
+            folder.group: folder.PK for folder in profiles_api.rule_folders.list(profile_id)
+        }
+
+    def group(operation: Operation) -> int:
+        try:
+            return folder_ids[operation.folder]
+        except KeyError:
+            raise ValueError(f"folder {operation.folder!r} does not exist") from None
+
+    def execute(operation: Operation) -> None:
+        data = operation.data
+        match operation.kind:
+            case "create_folder":
+                folders = profiles_api.rule_folders.create(
+                    profile_id, CreateRuleFoldersFormData(name=operation.key, **data)
+                )
+                folder_ids.update({folder.group: folder.PK for folder in folders})
+            case "modify_folder":
+                profiles_api.rule_folders.modify(
+                    profile_id, operation.folder_id, RuleFoldersFormData(**data)
+                )
+            case "delete_folder":
+                profiles_api.rule_folders.delete(profile_id, operation.folder_id)
+            case "create_rules":
+                profiles_api.custom_rules.create(
+                    profile_id,
+                    CreateCustomRuleFormData(
+                        **data, group=group(operation), hostnames=operation.hostnames
+                    ),
+                )
+            case "modify_rules":
+                profiles_api.custom_rules.modify(
+                    profile_id,
+                    ModifyCustomRuleFormData(
+                        **data, group=group(operation), hostnames=operation.hostnames
+                    ),
+                )
+            case "delete_rule":
+                profiles_api.custom_rules.delete(profile_id, operation.hostnames[0])
+            case "modify_service":
+                profiles_api.services.modify(
+                    profile_id, operation.key, ModifyServiceFormData(**data)
+                )
+            case "modify_filter":
+                profiles_api.filters.modify(profile_id, operation.key, ModifyFilterFormData(**data))
+            case "modify_default_rule":
+                profiles_api.default_rule.modify(profile_id, DefaultRuleFormData(**data))
+            case "modify_option":
+                profiles_api.profiles.modify_options(
+                    profile_id, operation.key, ModifyOptionFormData(**data)
+                )
+
+    def run(operation: Operation, *dependencies: Optional[str]) -> Optional[str]:
+        if any(error is not None for error in dependencies):
+            return "skipped"
+        try:
+            execute(operation)
+        except (ApiError, RequestException, ValueError) as error:
+            return str(error)
+        return None
+
+    scheduler = TaskScheduler(max_workers=max_workers, rate_limiter=rate_limiter or RateLimiter())
+    for operation in plan.operations:
+        scheduler.add(
+            operation.id,
+            lambda *dependencies, operation=operation: run(operation, *dependencies),
+            depends_on=operation.depends_on,
+        )
+    outcomes = scheduler.run()
+
+    result = BulkResult()
+    for operation in plan.operations:
+        outcome = outcomes[operation.id]
+        if outcome is None:
+            result.succeeded.append(operation.describe())
+        elif outcome == "skipped":
+            result.skipped.append(operation.describe())
+        else:
+            result.failed[operation.describe()] = outcome
+
+    logger.info(
+        f"Reconcile {profile_id}: {len(result.succeeded)} applied, "
+        f"{len(result.failed)} failed, {len(result.skipped)} skipped"
+    )
+    return result
+
+
+def reconcile(
+    api: ControlDApi,
+    profile_id: str,
+    spec: ProfileSpec,
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> ReconcileResult:
+    """Snapshot a profile, plan the changes for a spec and apply them.
+
+    Args:
+        api: API client of the account owning the profile.
+        profile_id: Primary key (PK) of the profile.
+        spec: Desired state of the profile.
+        dry_run: Only compute and return the plan.
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+    Returns:
+        ReconcileResult with the computed plan and, unless ``dry_run`` is set,
+        the applied, failed and skipped operations.
+
+    Raises:
+        ValueError: If the profile does not exist or the spec cannot be applied.
+    """
+    from pyctrld.tools.snapshot import snapshot_profiles
+
+    rate_limiter = rate_limiter or RateLimiter()
+    profiles = [profile for profile in api.profiles.profiles.list() if profile.PK == profile_id]
+    if not profiles:
+        raise ValueError(f"profile {profile_id} does not exist")
+
+    snapshot = snapshot_profiles(api, profiles, max_workers=max_workers, rate_limiter=rate_limiter)
+    reconcile_plan = plan(spec, snapshot[profile_id])
+
+    if dry_run or not reconcile_plan.operations:
+        return ReconcileResult(plan=reconcile_plan, dry_run=dry_run)
+
+    result = apply(api, reconcile_plan, max_workers=max_workers, rate_limiter=rate_limiter)
+    return ReconcileResult(plan=reconcile_plan, **result.model_dump())
+
+
+class _PlanBuilder:
+    """Helper numbering operations while a plan is built."""
+
+    def __init__(self, profile_id: str) -> None:
+        self.plan = Plan(profile_id=profile_id)
+
+    def add(self, kind: OperationKind, **fields: Any) -> int:
+        operation = Operation(id=len(self.plan.operations), kind=kind, **fields)
+        self.plan.operations.append(operation)
+        return operation.id
+
+
+def _effective_action(action: Action, inherited: Optional[Action]) -> Action:
+    """Complete the action of a custom rule with the action of its folder.
+
+    Rules without their own ``do`` take type and targets from the folder, or
+    block if the folder does not set one either (see tools.simulate).
+    """
+    if action.do is not None:
+        return action
+    do, via, via_v6 = None, action.via, action.via_v6
+    if inherited is not None:
+        do, via, via_v6 = inherited.do, via or inherited.via, via_v6 or inherited.via_v6
+    return action.model_copy(
+        update={"do": do if do is not None else Do.BLOCK, "via": via, "via_v6": via_v6}
+    )
+
+
+def _action_spec(action: Action) -> dict[str, Any]:
+    """Return the spec fields of a live action, without unset values."""
+    return {
+        name: value
+        for name, value in (
+            ("do", action.do),
+            ("status", action.status),
+            ("via", action.via),
+            ("via_v6", action.via_v6),
+        )
+        if value is not None
+    }
@@ -0,0 +1,231 @@
+"""Staged rollout of ctrld custom configs to many devices.
+
+rollout_config() renders one ctrld TOML config per device, skips devices whose
+last successfully deployed config has the same content hash, and pushes the
+rest with ``ModifyDeviceFormData.ctrld_custom_config`` in waves of growing
+size. Each wave is deployed concurrently; when the error rate of a wave
+exceeds ``max_error_rate`` the rollout stops before the next wave.
+
+Every push is recorded in a Checkpoint journal together with the content hash,
+so a stopped or interrupted rollout continues where it left off when called
+again, and a later rollout of an unchanged config sends nothing.
+
+A string template is rendered with ``string.Template`` (``$name``, ``$PK``,
+``$device_id``, ``$uid``, ``$desc``, ``$profile``, ``$icon``) since TOML uses
+braces itself.
+
+Example:
+    >>> template = Path("ctrld.toml").read_text()
+    >>> result = rollout_config(api, template, journal="ctrld-rollout.ckpt")
+    >>> result.aborted, len(result.succeeded), len(result.skipped)
+    (False, 1180, 3020)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import string
+import time
+from typing import TYPE_CHECKING, Optional
+
+from pydantic import Field
+
+from pyctrld._core.checkpoint import Checkpoint
+from pyctrld._core.concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
+from pyctrld._core.logger import logger
+from pyctrld._core.models.bulk import BulkResult
+from pyctrld.api.devices import ModifyDeviceFormData
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Callable, Iterable, Sequence
+
+    from pyctrld._api import ControlDApi
+    from pyctrld._core.models.devices import Device
+
+DEFAULT_WAVES = (0.01, 0.1, 1.0)
+DEFAULT_MAX_ERROR_RATE = 0.05
+
+
+class RolloutResult(BulkResult):
+    """Outcome of a config rollout, keyed by device PK.
+
+    ``skipped`` holds devices that already run the rendered config.
+
+    Attributes:
+        waves: Number of waves that were pushed.
+        aborted: True if the rollout stopped because a wave exceeded the error rate.
+        pending: Devices not pushed yet, because of an abort or a dry run.
+    """
+
+    waves: int = 0
+    aborted: bool = False
+    pending: list[str] = Field(default_factory=list)
+
+
+def content_hash(config: str) -> str:
+    """Return the content hash recorded for a deployed config.
+
+    Args:
+        config: Rendered config.
+
+    Returns:
+        Hex SHA-256 digest of the config.
+    """
+    return hashlib.sha256(config.encode("utf-8")).hexdigest()
+
+
+def render_config(template: str, device: Device) -> str:
+    """Render a config template for a device.
+
+    Args:
+        template: ``string.Template`` source.
+        device: Target device.
+
+    Returns:
+        The rendered config.
+
+    Raises:
+        KeyError: If the template uses an unknown placeholder.
+    """
+    return string.Template(template).substitute(
+        PK=device.PK,
+        name=device.name,
+        device_id=device.device_id,
+        uid=device.resolvers.uid,
+        desc=device.desc or "",
+        profile=device.profile.PK,
+        icon=device.icon or "",
+    )
+
+
+def rollout_config(
+    api: ControlDApi,
+    config: str | Callable[[Device], str],
+    journal: Checkpoint | str | Path,
+    devices: Optional[Iterable[Device]] = None,
+    waves: Sequence[float] = DEFAULT_WAVES,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    pause: float = 0.0,
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> RolloutResult:
+    """Deploy a ctrld custom config to many devices in staged waves.
+
+    Args:
+        api: API client of the account.
+        config: Template string (see render_config()) or function returning the
+            config of a device.
+        journal: Checkpoint, or path of the journal file, recording deployed
+            content hashes and failures.
+        devices: Target devices. Defaults to all routers of the account.
+        waves: Cumulative fractions of the devices to deploy after each wave,
+            e.g. ``(0.01, 0.1, 1.0)`` for a 1% canary, then 10%, then everyone.
+            Every wave holds at least one device; devices left after the last
+            fraction form a final wave.
+        max_error_rate: Highest fraction of failed pushes in a wave before the
+            rollout stops.
+        pause: Seconds to wait between waves, e.g. to watch the canaries.
+        dry_run: Only render and compare the configs; devices that would be
+            pushed are returned as pending.
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+    Returns:
+        RolloutResult with deployed, failed, unchanged and pending devices.
+    """
+    if rate_limiter is None:
+        rate_limiter = RateLimiter()
+    if not isinstance(journal, Checkpoint):
+        journal = Checkpoint(journal)
+    if devices is None:
+        devices = api.devices.list_all_devices("routers")
+    render = config if callable(config) else lambda device: render_config(config, device)
+
+    result = RolloutResult()
+    rendered: dict[str, tuple[str, str]] = {}
+    for device in devices:
+        try:
+            content = render(device)
+        except (KeyError, ValueError) as error:
+            result.failed[device.PK] = f"render failed: {error!r}"
+            continue
+
+        digest = content_hash(content)
+        record = journal.get(device.PK)
+        if record is not None and record["ok"] and record.get("hash") == digest:
+            result.skipped.append(device.PK)
+        else:
+            rendered[device.PK] = (content, digest)
+
+    pending = list(rendered)
+    if dry_run:
+        result.pending = pending
+        return result
+
+    def push(device_id: str) -> None:
+        content, _ = rendered[device_id]
+        api.devices.modify_device(device_id, ModifyDeviceFormData(ctrld_custom_config=content))
+
+    planned = _waves(pending, waves)
+    for index, wave in enumerate(planned):
+        if index and pause:
+            time.sleep(pause)
+        result.waves += 1
+
+        failures = 0
+        for device_id, _, error in iter_concurrently(push, wave, max_workers, rate_limiter):
+            digest = rendered[device_id][1]
+            if error is None:
+                journal.mark_done([device_id], hash=digest)
+                result.succeeded.append(device_id)
+            else:
+                journal.mark_failed([device_id], str(error), hash=digest)
+                result.failed[device_id] = str(error)
+                failures += 1
+
+        logger.info(
+            f"ctrld rollout wave {result.waves}: {len(wave) - failures}/{len(wave)} deployed"
+        )
+        if failures / len(wave) > max_error_rate:
+            result.aborted = True
+            result.pending = [device_id for later in planned[index + 1 :] for device_id in later]
+            logger.warning(
+                f"ctrld rollout stopped after wave {result.waves}: "
+                f"{failures}/{len(wave)} pushes failed"
+            )
+            break
+
+    logger.info(
+        f"ctrld rollout: {len(result.succeeded)} deployed, {len(result.failed)} failed, "
+        f"{len(result.skipped)} unchanged, {len(result.pending)} pending"
+    )
+    return result
+
+
+def _waves(items: list[str], fractions: Sequence[float]) -> list[list[str]]:
+    """Split items into waves by cumulative fractions.
+
+    Args:
+        items: Items in deployment order.
+        fractions: Cumulative fractions of the items to cover after each wave.
+
+    Returns:
+        Non-empty waves covering all items.
+    """
+    waves = []
+    start = 0
+    for fraction in fractions:
+        end = min(len(items), max(start + 1, math.ceil(len(items) * fraction)))
+        if end > start:
+            waves.append(items[start:end])
+            start = end
+    if start < len(items):
+        waves.append(items[start:])
+    return waves
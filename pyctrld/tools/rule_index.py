@@ -0,0 +1,240 @@
+"""Hostname suffix index over custom rules.
+
+Custom rules apply to their hostname and every subdomain of it, and a wildcard
+rule ``*.example.com`` applies to the subdomains of ``example.com`` only. The
+most specific matching rule governs a query. RuleIndex stores the rules in a
+trie of reversed hostname labels, so finding the governing rule costs one step
+per label of the queried hostname, independent of the number of rules.
+
+Example:
+    >>> index = RuleIndex(api.profiles.custom_rules.list("PK123"))
+    >>> index.lookup("ads.tracker.example.com").PK
+    'example.com'
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from pyctrld._core.models.common import Status
+from pyctrld._core.models.profiles.custom_rules import CustomRule
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+    from pyctrld._core.models.profiles.custom_rules import ModifiedCustomRule
+    from pyctrld._core.models.profiles.rule_tree import RuleTree
+
+WILDCARD = "*"
+
+
+class _Node:
+    """Trie node of one hostname label."""
+
+    __slots__ = ("children", "rule", "wildcard")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.rule: Optional[CustomRule] = None
+        self.wildcard: Optional[CustomRule] = None
+
+
+class RuleIndex:
+    """Reversed-label trie of the custom rules of a profile.
+
+    Args:
+        rules: Custom rules to index, e.g. from ``CustomRulesEndpoint.list()``.
+    """
+
+    def __init__(self, rules: Iterable[CustomRule] = ()) -> None:
+        """Build the index.
+
+        Args:
+            rules: Custom rules to index.
+        """
+        self._root = _Node()
+        self._rules: dict[str, CustomRule] = {}
+        for rule in rules:
+            self.add(rule)
+
+    @classmethod
+    def from_tree(cls, tree: RuleTree) -> RuleIndex:
+        """Build the index of every rule in a rule tree.
+
+        Args:
+            tree: Rule tree, e.g. from ``ProfilesAPI.fetch_rule_tree()``.
+
+        Returns:
+            RuleIndex of all folders of the profile.
+        """
+        return cls(tree.rules().values())
+
+    def __repr__(self) -> str:
+        """Return string representation of the index.
+
+        Returns:
+            A string showing the number of indexed rules.
+        """
+        return f"<{self.__class__.__name__} rules={len(self._rules)}>"
+
+    def __len__(self) -> int:
+        """Return the number of indexed rules."""
+        return len(self._rules)
+
+    def __contains__(self, hostname: str) -> bool:
+        """Check whether a rule exists for exactly this hostname."""
+        return _normalize(hostname) in self._rules
+
+    def get(self, hostname: str) -> Optional[CustomRule]:
+        """Return the rule defined for exactly this hostname.
+
+        Args:
+            hostname: Rule hostname (PK), e.g. ``example.com`` or ``*.example.com``.
+
+        Returns:
+            The CustomRule, or None if no rule has this hostname.
+        """
+        return self._rules.get(_normalize(hostname))
+
+    def add(self, rule: CustomRule) -> None:
+        """Add a rule, replacing an existing rule with the same hostname.
+
+        Args:
+            rule: Custom rule to index.
+        """
+        hostname = _normalize(rule.PK)
+        labels = _labels(hostname)
+        wildcard = labels[-1] == WILDCARD
+        if wildcard:
+            labels = labels[:-1]
+
+        node = self._root
+        for label in labels:
+            node = node.children.setdefault(label, _Node())
+
+        if wildcard:
+            node.wildcard = rule
+        else:
+            node.rule = rule
+        self._rules[hostname] = rule
+
+    def remove(self, hostname: str) -> bool:
+        """Remove the rule of a hostname, pruning empty trie nodes.
+
+        Args:
+            hostname: Rule hostname (PK).
+
+        Returns:
+            True if a rule was removed.
+        """
+        hostname = _normalize(hostname)
+        if self._rules.pop(hostname, None) is None:
+            return False
+
+        labels = _labels(hostname)
+        wildcard = labels[-1] == WILDCARD
+        if wildcard:
+            labels = labels[:-1]
+
+        path = [self._root]
+        for label in labels:
+            path.append(path[-1].children[label])
+
+        if wildcard:
+            path[-1].wildcard = None
+        else:
+            path[-1].rule = None
+
+        for parent, label, node in zip(reversed(path[:-1]), reversed(labels), reversed(path[1:])):
+            if node.children or node.rule or node.wildcard:
+                break
+            del parent.children[label]
+        return True
+
+    def apply_modified(self, hostnames: list[str], responses: list[ModifiedCustomRule]) -> None:
+        """Update the index from a ``CustomRulesEndpoint.create()``/``modify()`` response.
+
+        Args:
+            hostnames: Hostnames of the submitted form data.
+            responses: Returned ModifiedCustomRule objects, one per hostname or a
+                single one applying to all hostnames.
+        """
+        if len(responses) == 1:
+            responses = responses * len(hostnames)
+
+        for hostname, response in zip(hostnames, responses):
+            self.add(
+                CustomRule(
+                    PK=hostname,
+                    order=response.order,
+                    group=response.group,
+                    action={
+                        "do": response.do,
+                        "status": response.status,
+                        "via": response.via,
+                        "via_v6": response.via_v6,
+                    },
+                )
+            )
+
+    def lookup(self, hostname: str, include_disabled: bool = False) -> Optional[CustomRule]:
+        """Return the rule governing a queried hostname.
+
+        An exact rule matches its hostname and all subdomains, a wildcard rule
+        matches subdomains only; the deepest match wins.
+
+        Args:
+            hostname: Queried hostname.
+            include_disabled: Also consider disabled rules.
+
+        Returns:
+            The governing CustomRule, or None if no rule matches.
+        """
+        node = self._root
+        match = None
+
+        for label in _labels(_normalize(hostname)):
+            if node.wildcard is not None and (include_disabled or _enabled(node.wildcard)):
+                match = node.wildcard
+            node = node.children.get(label)
+            if node is None:
+                break
+            if node.rule is not None and (include_disabled or _enabled(node.rule)):
+                match = node.rule
+
+        return match
+
+    def lookup_many(
+        self, hostnames: Iterable[str], include_disabled: bool = False
+    ) -> list[Optional[CustomRule]]:
+        """Look up many hostnames, resolving repeated hostnames once.
+
+        Args:
+            hostnames: Queried hostnames.
+            include_disabled: Also consider disabled rules.
+
+        Returns:
+            The governing rule (or None) of each hostname, in input order.
+        """
+        cache: dict[str, Optional[CustomRule]] = {}
+        matches = []
+        for hostname in hostnames:
+            if hostname not in cache:
+                cache[hostname] = self.lookup(hostname, include_disabled)
+            matches.append(cache[hostname])
+        return matches
+
+
+def _normalize(hostname: str) -> str:
+    """Lowercase a hostname and strip the trailing root dot."""
+    return hostname.lower().rstrip(".")
+
+
+def _labels(hostname: str) -> list[str]:
+    """Split a hostname into labels, top-level domain first."""
+    return hostname.split(".")[::-1]
+
+
+def _enabled(rule: CustomRule) -> bool:
+    """Check whether a rule is enabled."""
+    return rule.action.status == Status.ENABLED
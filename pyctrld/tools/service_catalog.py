@@ -0,0 +1,260 @@
+"""Local index of the ControlD service catalog.
+
+ServiceCatalog.load() lists the service categories and then the services of
+all categories concurrently, and caches the result in a JSON file for ``ttl``
+seconds, so processes started within the TTL need no request at all.
+
+The catalog answers service → category, name → PK and membership lookups with
+one dictionary access and prefix searches with a binary search. Assigned to
+``ServicesEndpoint.catalog`` of the profile services endpoint, it validates the
+``service`` argument of ``modify()`` before a request is sent.
+
+Example:
+    >>> catalog = ServiceCatalog.load(api, cache_path="~/.cache/pyctrld/services.json")
+    >>> catalog.category_of("steam")
+    'gaming'
+    >>> [service.PK for service in catalog.search("tik")]
+    ['tiktok']
+    >>> api.profiles.services.catalog = catalog
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import time
+from typing import TYPE_CHECKING, Optional
+
+from pydantic import BaseModel, Field
+
+from pyctrld._core.concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
+from pyctrld._core.logger import logger
+from pyctrld._core.models.services import Category, Service
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Iterable
+
+    from pyctrld._api import ControlDApi
+
+DEFAULT_TTL = 86_400
+
+
+class CatalogCache(BaseModel):
+    """Cached service catalog.
+
+    Attributes:
+        fetched_at: Unix timestamp of the fetch.
+        categories: Service categories.
+        services: Services of all categories.
+    """
+
+    fetched_at: int
+    categories: list[Category] = Field(default_factory=list)
+    services: list[Service] = Field(default_factory=list)
+
+
+class ServiceCatalog:
+    """Service categories and services indexed for local lookups.
+
+    Args:
+        categories: Service categories.
+        services: Services of all categories.
+        fetched_at: Unix timestamp of the fetch, defaults to now.
+    """
+
+    def __init__(
+        self,
+        categories: Iterable[Category],
+        services: Iterable[Service],
+        fetched_at: Optional[int] = None,
+    ) -> None:
+        """Build the indexes.
+
+        Args:
+            categories: Service categories.
+            services: Services of all categories.
+            fetched_at: Unix timestamp of the fetch.
+        """
+        self.fetched_at = int(time.time()) if fetched_at is None else fetched_at
+        self.categories = {category.PK: category for category in categories}
+        self._services = {service.PK: service for service in services}
+        self._by_name = {service.name.lower(): service.PK for service in self._services.values()}
+        self._by_category: dict[str, list[Service]] = {pk: [] for pk in self.categories}
+        for service in self._services.values():
+            self._by_category.setdefault(service.category, []).append(service)
+
+        self._prefixes = sorted(
+            {(service.PK.lower(), service.PK) for service in self._services.values()}
+            | {(service.name.lower(), service.PK) for service in self._services.values()}
+        )
+
+    @classmethod
+    def fetch(
+        cls,
+        api: ControlDApi,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> ServiceCatalog:
+        """Fetch the catalog, listing the services of all categories concurrently.
+
+        Args:
+            api: API client.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+        Returns:
+            The fetched ServiceCatalog.
+
+        Raises:
+            ApiError: If a listing fails.
+        """
+        fetched_at = int(time.time())
+        categories = api.services.list_service_categories()
+        services: dict[str, list[Service]] = {}
+        for category, listed, error in iter_concurrently(
+            api.services.list_all_services,
+            [category.PK for category in categories],
+            max_workers,
+            rate_limiter or RateLimiter(),
+        ):
+            if error is not None:
+                raise error
+            services[category] = listed
+
+        return cls(
+            categories,
+            [service for category in categories for service in services[category.PK]],
+            fetched_at,
+        )
+
+    @classmethod
+    def load(
+        cls,
+        api: ControlDApi,
+        cache_path: Optional[str | Path] = None,
+        ttl: float = DEFAULT_TTL,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> ServiceCatalog:
+        """Return the cached catalog if it is fresh, otherwise fetch and cache it.
+
+        Args:
+            api: API client.
+            cache_path: Optional cache file. Without it the catalog is always fetched.
+            ttl: Maximum age of the cache in seconds.
+            max_workers: Number of concurrent requests.
+            rate_limiter: Limiter shared by all requests.
+
+        Returns:
+            The ServiceCatalog.
+        """
+        path = os.path.expanduser(os.fspath(cache_path)) if cache_path is not None else None
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as file:
+                    cache = CatalogCache.model_validate_json(file.read())
+            except ValueError as error:
+                logger.warning(f"Ignoring unreadable service catalog cache {path}: {error}")
+            else:
+                if time.time() - cache.fetched_at < ttl:
+                    return cls(cache.categories, cache.services, cache.fetched_at)
+
+        catalog = cls.fetch(api, max_workers=max_workers, rate_limiter=rate_limiter)
+        if path is not None:
+            catalog.save(path)
+        return catalog
+
+    def save(self, path: str | Path) -> None:
+        """Write the catalog to a cache file atomically.
+
+        Args:
+            path: Cache file.
+        """
+        path = os.path.expanduser(os.fspath(path))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        cache = CatalogCache(
+            fetched_at=self.fetched_at,
+            categories=list(self.categories.values()),
+            services=list(self._services.values()),
+        )
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(cache.model_dump_json(exclude_none=True))
+        os.replace(temporary, path)
+
+    def __repr__(self) -> str:
+        """Return string representation of the catalog.
+
+        Returns:
+            A string showing the number of categories and services.
+        """
+        return (
+            f"<{self.__class__.__name__} categories={len(self.categories)} "
+            f"services={len(self._services)}>"
+        )
+
+    def __len__(self) -> int:
+        """Return the number of services."""
+        return len(self._services)
+
+    def __contains__(self, service: str) -> bool:
+        """Check whether a service PK exists."""
+        return service in self._services
+
+    def get(self, service: str) -> Optional[Service]:
+        """Return a service by PK, None if it does not exist."""
+        return self._services.get(service)
+
+    def category_of(self, service: str) -> Optional[str]:
+        """Return the category PK of a service, None if the service does not exist."""
+        found = self._services.get(service)
+        return found.category if found is not None else None
+
+    def pk_of(self, name: str) -> Optional[str]:
+        """Return the PK of a service by display name (case-insensitive)."""
+        return self._by_name.get(name.lower())
+
+    def services_in(self, category: str) -> list[Service]:
+        """Return the services of a category, empty for an unknown category."""
+        return list(self._by_category.get(category, ()))
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> list[Service]:
+        """Find services whose PK or name starts with a prefix (case-insensitive).
+
+        Args:
+            prefix: Prefix of the PK or name.
+            limit: Maximum number of results.
+
+        Returns:
+            Matching services ordered by the matched PK or name.
+        """
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._prefixes, (prefix, ""))
+        found: dict[str, Service] = {}
+        for key, pk in self._prefixes[start:]:
+            if not key.startswith(prefix) or (limit is not None and len(found) >= limit):
+                break
+            found.setdefault(pk, self._services[pk])
+        return list(found.values())
+
+    def validate(self, service: str) -> None:
+        """Check that a service PK exists.
+
+        Args:
+            service: Service PK.
+
+        Raises:
+            ValueError: If the service is not in the catalog.
+        """
+        if service not in self._services:
+            suggestions = ", ".join(found.PK for found in self.search(service[:3], limit=3))
+            hint = f"; did you mean {suggestions}?" if suggestions else ""
+            raise ValueError(f"Unknown service {service!r}{hint}")
@@ -0,0 +1,110 @@
+"""Category-level service policies across profiles.
+
+apply_category_policy() expands service catalog categories (e.g. ``gaming``)
+into their services and applies one service rule to all of them on many
+profiles with ``ServicesEndpoint.bulk_modify()``, which only sends the rules
+that differ from the current state.
+
+Example:
+    >>> form_data = ModifyServiceFormData(do=Do.BLOCK, status=True)
+    >>> reports = apply_category_policy(api, "gaming", school_profiles, form_data)
+    >>> sum(len(report.succeeded) for report in reports.values())
+    1184
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from pyctrld._core.concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+    from pyctrld._api import ControlDApi
+    from pyctrld._core.models.bulk import BulkResult
+    from pyctrld.api.profiles.services import ModifyServiceFormData
+    from pyctrld.tools.service_catalog import ServiceCatalog
+
+
+def category_services(
+    api: ControlDApi,
+    categories: str | Iterable[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+    catalog: Optional[ServiceCatalog] = None,
+) -> list[str]:
+    """List the services of catalog categories concurrently.
+
+    Args:
+        api: API client.
+        categories: Category PK or PKs.
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests.
+        catalog: Optional ServiceCatalog answering without requests.
+
+    Returns:
+        Service PKs of all categories, in category order.
+
+    Raises:
+        ApiError: If a category cannot be listed.
+        ValueError: If ``catalog`` is given and a category is not in it.
+    """
+    categories = [categories] if isinstance(categories, str) else list(dict.fromkeys(categories))
+    if catalog is not None:
+        for category in categories:
+            if category not in catalog.categories:
+                raise ValueError(f"Unknown service category {category!r}")
+        return [service.PK for category in categories for service in catalog.services_in(category)]
+
+    services: dict[str, list[str]] = {}
+    for category, listed, error in iter_concurrently(
+        api.services.list_all_services, categories, max_workers, rate_limiter
+    ):
+        if error is not None:
+            raise error
+        services[category] = [service.PK for service in listed]
+    return [service for category in categories for service in services[category]]
+
+
+def apply_category_policy(
+    api: ControlDApi,
+    categories: str | Iterable[str],
+    profile_ids: Iterable[str],
+    form_data: ModifyServiceFormData,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> dict[str, BulkResult]:
+    """Apply a service rule to every service of catalog categories on many profiles.
+
+    The categories are expanded with ``api.profiles.services.catalog`` when one
+    is set, otherwise with concurrent listings.
+
+    Args:
+        api: API client of the account.
+        categories: Category PK or PKs, e.g. ``"gaming"``.
+        profile_ids: Primary keys (PK) of the profiles.
+        form_data: Rule applied to every service.
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+    Returns:
+        BulkResult of every profile, keyed by profile PK, with modified, failed
+        and skipped (already in the desired state) service PKs.
+
+    Raises:
+        ApiError: If a category cannot be listed; no profile is modified then.
+        ValueError: If a category is not in the endpoint catalog; no profile is
+            modified then.
+    """
+    rate_limiter = rate_limiter or RateLimiter()
+    services = category_services(
+        api, categories, max_workers, rate_limiter, catalog=api.profiles.services.catalog
+    )
+    return api.profiles.services.bulk_modify(
+        profile_ids, services, form_data, max_workers=max_workers, rate_limiter=rate_limiter
+    )
@@ -0,0 +1,247 @@
+"""Offline DNS policy simulation for a profile snapshot.
+
+PolicySimulator evaluates hostnames against a ProfileSnapshot the way the
+resolver applies a profile: custom rules first (most specific hostname wins,
+rules inherit the action of their folder and are inactive in a disabled
+folder), then service rules, then enabled native and third-party filters, and
+finally the default rule.
+
+The ControlD API does not expose the hostnames behind services and filters, so
+they are given as local hostname sets; a set entry matches the hostname itself
+and all of its subdomains.
+
+Example:
+    >>> simulator = PolicySimulator(snapshot, filter_hostnames={"ads": ["doubleclick.net"]})
+    >>> decision = simulator.evaluate("ad.doubleclick.net")
+    >>> decision.do, decision.layer, decision.source
+    (<Do.BLOCK: 0>, 'native_filter', 'ads')
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from pyctrld._core.models.common import Do, Status
+from pyctrld.tools.rule_index import RuleIndex
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+    from pyctrld._core.models.common import Action
+    from pyctrld._core.models.snapshot import ProfileSnapshot
+
+Layer = Literal["custom_rule", "service", "native_filter", "third_party_filter", "default"]
+
+
+class Decision(BaseModel):
+    """Effective action for a hostname and the policy layer that produced it.
+
+    Decisions are immutable and shared between all hostnames resolved by the
+    same rule, service, filter or default rule.
+
+    Attributes:
+        do: Resulting action (BLOCK, BYPASS, SPOOF, REDIRECT).
+        via: Spoof/Redirect target.
+        via_v6: IPv6 spoof target.
+        layer: Policy layer that matched.
+        source: Matched rule hostname, service PK or filter PK, "default" for the default rule.
+        folder: Name of the folder of a matched custom rule, None for the root folder.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    do: Do
+    via: Optional[str] = None
+    via_v6: Optional[str] = None
+    layer: Layer
+    source: str
+    folder: Optional[str] = None
+
+    def explain(self) -> str:
+        """Return a human readable explanation of the decision.
+
+        Returns:
+            Explanation string.
+        """
+        explanation = f"{self.do.name} by {self.layer.replace('_', ' ')} {self.source}"
+        if self.folder:
+            explanation += f" in folder {self.folder}"
+        if self.via:
+            explanation += f" via {self.via}"
+        return explanation
+
+
+class PolicySimulator:
+    """Evaluate hostnames against the policy of a profile snapshot without API calls.
+
+    Args:
+        snapshot: Profile snapshot, e.g. from ``ControlDApi.snapshot()``.
+        service_hostnames: Hostnames served by each service, keyed by service PK.
+        filter_hostnames: Hostnames listed by each native or third-party filter, keyed by PK.
+    """
+
+    def __init__(
+        self,
+        snapshot: ProfileSnapshot,
+        service_hostnames: Optional[dict[str, Iterable[str]]] = None,
+        filter_hostnames: Optional[dict[str, Iterable[str]]] = None,
+    ) -> None:
+        """Compile the snapshot into lookup tables.
+
+        Args:
+            snapshot: Profile snapshot.
+            service_hostnames: Hostnames served by each service, keyed by service PK.
+            filter_hostnames: Hostnames listed by each filter, keyed by filter PK.
+        """
+        self.profile_id = snapshot.profile.PK
+        self._rules = RuleIndex()
+        self._rule_decisions: dict[str, Decision] = {}
+        self._layers: list[dict[str, Decision]] = []
+        self._default = _decision(snapshot.default_rule, "default", "default", default_do=Do.BYPASS)
+
+        for folder in snapshot.rule_tree.folders.values():
+            folder_action = folder.folder.action if folder.folder else None
+            if folder_action is not None and folder_action.status != Status.ENABLED:
+                continue
+            for rule in folder.rules.values():
+                if rule.action.status != Status.ENABLED:
+                    continue
+                self._rules.add(rule)
+                self._rule_decisions[rule.PK] = _decision(
+                    rule.action,
+                    "custom_rule",
+                    rule.PK,
+                    folder=folder.folder.group if folder.folder else None,
+                    inherited=folder_action,
+                )
+
+        service_hostnames = service_hostnames or {}
+        services: dict[str, Decision] = {}
+        for service in snapshot.services:
+            if service.action.status == Status.ENABLED and service.PK in service_hostnames:
+                _register(
+                    services,
+                    service_hostnames[service.PK],
+                    _decision(service.action, "service", service.PK),
+                )
+        self._layers.append(services)
+
+        filter_hostnames = filter_hostnames or {}
+        for layer, filters in (
+            ("native_filter", snapshot.native_filters),
+            ("third_party_filter", snapshot.third_party_filters),
+        ):
+            hostnames: dict[str, Decision] = {}
+            for item in filters:
+                if item.status == Status.ENABLED and item.PK in filter_hostnames:
+                    action = getattr(item, "action", None)
+                    do = action.do if action is not None else Do.BLOCK
+                    _register(
+                        hostnames,
+                        filter_hostnames[item.PK],
+                        Decision(do=do, layer=layer, source=item.PK),
+                    )
+            self._layers.append(hostnames)
+
+    def __repr__(self) -> str:
+        """Return string representation of the simulator.
+
+        Returns:
+            A string showing the profile and the number of compiled entries.
+        """
+        return (
+            f"<{self.__class__.__name__} profile={self.profile_id} rules={len(self._rules)} "
+            f"hostnames={sum(map(len, self._layers))}>"
+        )
+
+    def evaluate(self, hostname: str) -> Decision:
+        """Return the effective action for a hostname.
+
+        Args:
+            hostname: Queried hostname.
+
+        Returns:
+            Decision of the first matching layer.
+        """
+        rule = self._rules.lookup(hostname)
+        if rule is not None:
+            return self._rule_decisions[rule.PK]
+
+        labels = hostname.lower().rstrip(".").split(".")
+        suffixes = [".".join(labels[start:]) for start in range(len(labels))]
+        for hostnames in self._layers:
+            for suffix in suffixes:
+                decision = hostnames.get(suffix)
+                if decision is not None:
+                    return decision
+        return self._default
+
+    def evaluate_many(self, hostnames: Iterable[str]) -> list[Decision]:
+        """Evaluate many hostnames, resolving repeated hostnames once.
+
+        Args:
+            hostnames: Queried hostnames.
+
+        Returns:
+            Decision of each hostname, in input order.
+        """
+        cache: dict[str, Decision] = {}
+        decisions = []
+        for hostname in hostnames:
+            decision = cache.get(hostname)
+            if decision is None:
+                decision = cache[hostname] = self.evaluate(hostname)
+            decisions.append(decision)
+        return decisions
+
+
+def _decision(
+    action: Action,
+    layer: Layer,
+    source: str,
+    folder: Optional[str] = None,
+    inherited: Optional[Action] = None,
+    default_do: Do = Do.BLOCK,
+) -> Decision:
+    """Build the decision of an action, completing missing fields from an inherited action.
+
+    Args:
+        action: Action of the matched rule.
+        layer: Policy layer.
+        source: Matched rule hostname, service PK or filter PK.
+        folder: Folder name of a custom rule.
+        inherited: Action of the folder holding a custom rule.
+        default_do: Action type used when neither action defines one.
+
+    Returns:
+        The Decision.
+    """
+    do = action.do
+    via, via_v6 = action.via, action.via_v6
+    if inherited is not None and do is None:
+        do, via, via_v6 = inherited.do, via or inherited.via, via_v6 or inherited.via_v6
+
+    return Decision(
+        do=do if do is not None else default_do,
+        via=via,
+        via_v6=via_v6,
+        layer=layer,
+        source=source,
+        folder=folder,
+    )
+
+
+def _register(layer: dict[str, Decision], hostnames: Iterable[str], decision: Decision) -> None:
+    """Map the hostnames of a service or filter to its decision.
+
+    Hostnames already claimed by an earlier service or filter of the layer are kept.
+
+    Args:
+        layer: Hostname table of the policy layer.
+        hostnames: Hostnames of the service or filter.
+        decision: Decision applied to the hostnames and their subdomains.
+    """
+    for hostname in hostnames:
+        layer.setdefault(hostname.lower().rstrip("."), decision)
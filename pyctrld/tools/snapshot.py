@@ -0,0 +1,187 @@
+"""Account-wide snapshots of ControlD state.
+
+This module captures the complete state of an account by scheduling every
+listing call on a TaskScheduler: per-profile and per-device listings start as
+soon as the profile and device lists are known, and all calls share one
+concurrency and rate budget.
+
+Example:
+    >>> from pyctrld import ControlDApi
+    >>> from pyctrld.tools.snapshot import take_snapshot
+    >>> snapshot = take_snapshot(ControlDApi(token="your_api_token"))
+    >>> Path("backup.json").write_text(snapshot.model_dump_json(exclude_none=True))
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from pyctrld._core.concurrency import DEFAULT_MAX_WORKERS, RateLimiter
+from pyctrld._core.logger import logger
+from pyctrld._core.models.profiles.rule_tree import RuleTree
+from pyctrld._core.models.snapshot import (
+    AccountSnapshot,
+    DeviceSnapshot,
+    ProfileSnapshot,
+)
+from pyctrld._core.scheduler import TaskScheduler
+from pyctrld.api.profiles.custom_rules import ROOT_FOLDER
+
+if TYPE_CHECKING:
+    from typing import Any, Hashable, Iterable, Optional
+
+    from pyctrld._api import ControlDApi
+    from pyctrld._core.models.profiles.profiles import ProfileObject
+
+
+def take_snapshot(
+    api: ControlDApi,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> AccountSnapshot:
+    """Capture the complete state of an account.
+
+    Fetches account data, profile options, all profiles with their rule folders,
+    custom rules, services, native and third-party filters and default rule,
+    and all devices with their known IPs.
+
+    Args:
+        api: API client of the account.
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+    Returns:
+        AccountSnapshot of the account.
+
+    Raises:
+        ApiError: If any of the listings fails.
+    """
+    taken_at = int(time.time())
+    scheduler = TaskScheduler(max_workers=max_workers, rate_limiter=rate_limiter or RateLimiter())
+
+    def list_profiles() -> list[ProfileObject]:
+        profiles = api.profiles.profiles.list()
+        for profile in profiles:
+            _add_profile_tasks(scheduler, api, profile.PK)
+        return profiles
+
+    def list_devices() -> list[Any]:
+        devices = api.devices.list_all_devices()
+        for device in devices:
+            scheduler.add(("ips", device.PK), lambda pk=device.PK: api.access.list_known_ips(pk))
+        return devices
+
+    scheduler.add(("user",), api.account.user_data)
+    scheduler.add(("options",), api.profiles.profiles.list_options)
+    scheduler.add(("profiles",), list_profiles)
+    scheduler.add(("devices",), list_devices)
+
+    results = scheduler.run()
+
+    snapshot = AccountSnapshot(
+        taken_at=taken_at,
+        user=results[("user",)],
+        options=results[("options",)],
+        profiles={
+            profile.PK: _build_profile_snapshot(results, profile)
+            for profile in results[("profiles",)]
+        },
+        devices={
+            device.PK: DeviceSnapshot(device=device, known_ips=results[("ips", device.PK)])
+            for device in results[("devices",)]
+        },
+    )
+
+    logger.info(
+        f"Snapshot taken: {len(snapshot.profiles)} profiles, {len(snapshot.devices)} devices, "
+        f"{len(results)} requests in {time.time() - taken_at:.1f}s"
+    )
+    return snapshot
+
+
+def snapshot_profiles(
+    api: ControlDApi,
+    profiles: Iterable[ProfileObject],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> dict[str, ProfileSnapshot]:
+    """Capture the rules, services, filters and default rule of the given profiles.
+
+    Args:
+        api: API client of the account.
+        profiles: Profiles to capture, as returned by ``ProfilesEndpoint.list()``.
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+    Returns:
+        Profile snapshots keyed by profile PK.
+
+    Raises:
+        ApiError: If any of the listings fails.
+    """
+    profiles = list(profiles)
+    scheduler = TaskScheduler(max_workers=max_workers, rate_limiter=rate_limiter or RateLimiter())
+    for profile in profiles:
+        _add_profile_tasks(scheduler, api, profile.PK)
+
+    results = scheduler.run()
+    return {profile.PK: _build_profile_snapshot(results, profile) for profile in profiles}
+
+
+def _add_profile_tasks(scheduler: TaskScheduler, api: ControlDApi, profile_id: str) -> None:
+    """Add the listing tasks of one profile to a scheduler.
+
+    Args:
+        scheduler: Scheduler to add the tasks to.
+        api: API client of the account.
+        profile_id: Primary key (PK) of the profile.
+    """
+    profiles_api = api.profiles
+
+    def list_folders() -> list[Any]:
+        folders = profiles_api.rule_folders.list(profile_id)
+        for folder_id in [ROOT_FOLDER] + [folder.PK for folder in folders]:
+            scheduler.add(
+                ("rules", profile_id, folder_id),
+                lambda folder_id=folder_id: profiles_api.custom_rules.list(
+                    profile_id, None if folder_id == ROOT_FOLDER else folder_id
+                ),
+            )
+        return folders
+
+    scheduler.add(("folders", profile_id), list_folders)
+    scheduler.add(("services", profile_id), lambda: profiles_api.services.list(profile_id))
+    scheduler.add(("native", profile_id), lambda: profiles_api.filters.list_native(profile_id))
+    scheduler.add(
+        ("third_party", profile_id), lambda: profiles_api.filters.list_third_party(profile_id)
+    )
+    scheduler.add(("default", profile_id), lambda: profiles_api.default_rule.list(profile_id))
+
+
+def _build_profile_snapshot(
+    results: dict[Hashable, Any], profile: ProfileObject
+) -> ProfileSnapshot:
+    """Assemble a profile snapshot from scheduler results.
+
+    Args:
+        results: Results of a scheduler run containing the profile tasks.
+        profile: The profile object.
+
+    Returns:
+        ProfileSnapshot of the profile.
+    """
+    folders = results[("folders", profile.PK)]
+    rules = {
+        folder_id: results[("rules", profile.PK, folder_id)]
+        for folder_id in [ROOT_FOLDER] + [folder.PK for folder in folders]
+    }
+
+    return ProfileSnapshot(
+        profile=profile,
+        rule_tree=RuleTree.from_listing(profile.PK, folders, rules),
+        services=results[("services", profile.PK)],
+        native_filters=results[("native", profile.PK)],
+        third_party_filters=results[("third_party", profile.PK)],
+        default_rule=results[("default", profile.PK)],
+    )
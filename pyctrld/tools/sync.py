@@ -0,0 +1,141 @@
+"""Incremental profile sync backed by a local state store.
+
+A sync lists the profiles once and compares each profile's ``updated`` timestamp
+with the stored one. Rule folders, custom rules, services, filters and the
+default rule are re-fetched only for new or changed profiles, so refreshing a
+large account costs one request plus the requests of the changed profiles.
+
+Example:
+    >>> from pyctrld import ControlDApi
+    >>> from pyctrld.tools.sync import SyncStore, sync
+    >>> result = sync(ControlDApi(token="your_api_token"), SyncStore("state.json"))
+    >>> result.refreshed
+    ['PK123']
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING
+
+from pyctrld._core.concurrency import DEFAULT_MAX_WORKERS, RateLimiter
+from pyctrld._core.logger import logger
+from pyctrld._core.models.snapshot import SyncResult, SyncState
+from pyctrld.tools.snapshot import snapshot_profiles
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Optional
+
+    from pyctrld._api import ControlDApi
+
+
+class SyncStore:
+    """JSON file holding the SyncState between runs.
+
+    Writes go to a temporary file that replaces the store atomically, so an
+    interrupted save never leaves a truncated store behind.
+
+    Args:
+        path: Location of the store file. Created on first save.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the store.
+
+        Args:
+            path: Location of the store file.
+        """
+        self._path = os.fspath(path)
+
+    def __repr__(self) -> str:
+        """Return string representation of the store.
+
+        Returns:
+            A string showing the store path.
+        """
+        return f"<{self.__class__.__name__} path={self._path}>"
+
+    def load(self) -> SyncState:
+        """Read the stored state.
+
+        Returns:
+            The stored SyncState, or an empty state if the file does not exist.
+        """
+        if not os.path.exists(self._path):
+            return SyncState()
+
+        with open(self._path, encoding="utf-8") as file:
+            return SyncState.model_validate_json(file.read())
+
+    def save(self, state: SyncState) -> None:
+        """Replace the stored state.
+
+        Args:
+            state: State to store.
+        """
+        temporary = f"{self._path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(state.model_dump_json(exclude_none=True))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self._path)
+
+
+def sync(
+    api: ControlDApi,
+    store: SyncStore,
+    force: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> SyncResult:
+    """Bring the stored profile state up to date.
+
+    Args:
+        api: API client of the account.
+        store: Store holding the state of the previous sync.
+        force: Re-fetch every profile regardless of its ``updated`` timestamp.
+        max_workers: Number of concurrent requests.
+        rate_limiter: Limiter shared by all requests. Defaults to a new RateLimiter.
+
+    Returns:
+        SyncResult with the new state, which has also been saved to the store.
+
+    Raises:
+        ApiError: If any of the listings fails. The store is left unchanged.
+    """
+    synced_at = int(time.time())
+    previous = store.load().profiles
+    profiles = api.profiles.profiles.list()
+
+    changed = [
+        profile
+        for profile in profiles
+        if force
+        or profile.PK not in previous
+        or previous[profile.PK].profile.updated != profile.updated
+    ]
+    fetched = snapshot_profiles(
+        api, changed, max_workers=max_workers, rate_limiter=rate_limiter or RateLimiter()
+    )
+
+    state = SyncState(synced_at=synced_at)
+    for profile in profiles:
+        state.profiles[profile.PK] = fetched.get(profile.PK) or previous[profile.PK].model_copy(
+            update={"profile": profile}
+        )
+    store.save(state)
+
+    result = SyncResult(
+        state=state,
+        refreshed=[profile.PK for profile in changed],
+        unchanged=[profile.PK for profile in profiles if profile.PK not in fetched],
+        removed=[pk for pk in previous if pk not in state.profiles],
+    )
+
+    logger.info(
+        f"Sync: {len(result.refreshed)} refreshed, {len(result.unchanged)} unchanged, "
+        f"{len(result.removed)} removed profiles"
+    )
+    return result
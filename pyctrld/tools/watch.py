@@ -0,0 +1,307 @@
+"""Change feeds over polled list endpoints.
+
+A Watcher polls any number of list methods (``list_all_devices``,
+``CustomRulesEndpoint.list``, ``FiltersEndpoint.list_native``,
+``list_known_ips``, ...) and compares every result with the previous one by
+primary key with tools.diff.diff(). Differences are delivered as
+ChangeEvents to per-watch callbacks and through an async iterator.
+
+Each watch polls on its own adaptive interval: it drops to ``min_interval``
+after a change and doubles (up to ``max_interval``) after every poll without
+changes. All watches share one thread pool and one RateLimiter, so dozens of
+watches stay within a single request budget.
+
+Example:
+    >>> watcher = Watcher()
+    >>> watcher.watch("devices", api.devices.list_all_devices, callback=print)
+    >>> watcher.watch("rules", lambda: api.profiles.custom_rules.list("PK123"))
+    >>> watcher.watch("ips", lambda: api.access.list_known_ips("dev1"), key="ip")
+    >>> watcher.run()  # or: async for event in watcher.events(): ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import operator
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from pyctrld._core.concurrency import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
+from pyctrld._core.logger import logger
+from pyctrld.tools.diff import FieldChange, diff
+
+if TYPE_CHECKING:
+    from typing import AsyncIterator, Callable, Hashable, Iterable
+
+DEFAULT_INTERVAL = 60.0
+DEFAULT_MIN_INTERVAL = 5.0
+DEFAULT_MAX_INTERVAL = 600.0
+BACKOFF_FACTOR = 2.0
+
+
+class ChangeEvent(BaseModel):
+    """Added, changed or removed entity seen by a watch.
+
+    Attributes:
+        watch: Name of the watch.
+        kind: Type of change.
+        key: Key of the entity.
+        entity: Current entity, None if it was removed.
+        previous: Previous entity, None if it was added.
+        fields: Field-level changes of a changed entity.
+    """
+
+    watch: str
+    kind: Literal["added", "changed", "removed"]
+    key: str
+    entity: Any = None
+    previous: Any = None
+    fields: list[FieldChange] = Field(default_factory=list)
+
+
+class _Watch:
+    """Polling state of one watched list method."""
+
+    def __init__(
+        self,
+        name: str,
+        poll: Callable[[], Iterable[BaseModel]],
+        callback: Optional[Callable[[ChangeEvent], Any]],
+        key: str | Callable[[Any], Hashable],
+        ignore: Iterable[str],
+        interval: float,
+        min_interval: float,
+        max_interval: float,
+        emit_initial: bool,
+    ) -> None:
+        self.name = name
+        self.poll = poll
+        self.callback = callback
+        self.key = operator.attrgetter(key) if isinstance(key, str) else key
+        self.ignore = tuple(ignore)
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.emit_initial = emit_initial
+        self.entities: Optional[list[BaseModel]] = None
+        self.due = 0.0
+
+
+class Watcher:
+    """Scheduler multiplexing many watches over a shared rate budget.
+
+    Args:
+        max_workers: Number of concurrent polls.
+        rate_limiter: Limiter shared by all polls. Defaults to a new RateLimiter.
+    """
+
+    def __init__(
+        self, max_workers: int = DEFAULT_MAX_WORKERS, rate_limiter: Optional[RateLimiter] = None
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_workers: Number of concurrent polls.
+            rate_limiter: Limiter shared by all polls.
+        """
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._watches: dict[str, _Watch] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._wakeup: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
+
+    def __repr__(self) -> str:
+        """Return string representation of the watcher.
+
+        Returns:
+            A string showing the number of watches.
+        """
+        return f"<{self.__class__.__name__} watches={len(self._watches)}>"
+
+    def watch(
+        self,
+        name: str,
+        poll: Callable[[], Iterable[BaseModel]],
+        callback: Optional[Callable[[ChangeEvent], Any]] = None,
+        key: str | Callable[[Any], Hashable] = "PK",
+        ignore: Iterable[str] = (),
+        interval: float = DEFAULT_INTERVAL,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        emit_initial: bool = False,
+    ) -> None:
+        """Add a watch, replacing an existing watch with the same name.
+
+        Args:
+            name: Name of the watch, used in events.
+            poll: Function returning the current entity list, e.g.
+                ``lambda: api.profiles.custom_rules.list("PK123")``.
+            callback: Optional function called with every event of this watch.
+            key: Field name or function returning the key of an entity.
+            ignore: Top-level fields excluded from the comparison, e.g. ``last_activity``.
+            interval: Initial polling interval in seconds.
+            min_interval: Interval after a poll that found changes.
+            max_interval: Longest interval reached by backing off while idle.
+            emit_initial: Report the entities of the first poll as added.
+        """
+        with self._lock:
+            self._watches[name] = _Watch(
+                name,
+                poll,
+                callback,
+                key,
+                ignore,
+                interval,
+                min_interval,
+                max_interval,
+                emit_initial,
+            )
+
+    def unwatch(self, name: str) -> bool:
+        """Remove a watch.
+
+        Args:
+            name: Name of the watch.
+
+        Returns:
+            True if the watch existed.
+        """
+        with self._lock:
+            return self._watches.pop(name, None) is not None
+
+    def interval(self, name: str) -> float:
+        """Return the current polling interval of a watch in seconds."""
+        return self._watches[name].interval
+
+    def next_due(self) -> Optional[float]:
+        """Return the monotonic time at which the next watch is due, None without watches."""
+        with self._lock:
+            return min((watch.due for watch in self._watches.values()), default=None)
+
+    def poll_once(self, now: Optional[float] = None) -> list[ChangeEvent]:
+        """Poll every due watch concurrently and deliver the changes.
+
+        Args:
+            now: Monotonic time used for scheduling. Defaults to ``time.monotonic()``.
+
+        Returns:
+            Events of all polled watches. Callbacks have already been called.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            due = [watch for watch in self._watches.values() if watch.due <= now]
+
+        events: list[ChangeEvent] = []
+        for watch, entities, error in iter_concurrently(
+            lambda watch: list(watch.poll()), due, self.max_workers, self.rate_limiter
+        ):
+            if error is not None:
+                logger.warning(f"Watch {watch.name} poll failed: {error}")
+                watch_events = []
+            else:
+                watch_events = self._compare(watch, entities)
+
+            if watch_events:
+                watch.interval = watch.min_interval
+            else:
+                watch.interval = min(watch.max_interval, watch.interval * BACKOFF_FACTOR)
+            watch.due = now + watch.interval
+
+            if watch.callback is not None:
+                for event in watch_events:
+                    try:
+                        watch.callback(event)
+                    except Exception:  # noqa: BLE001
+                        # Callbacks are user code: one failing must not stop the other watches
+                        logger.exception(f"Watch {watch.name} callback failed")
+            events.extend(watch_events)
+        return events
+
+    def run(self) -> None:
+        """Poll the watches until stop() is called, e.g. from a callback or another thread."""
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            self.poll_once()
+            next_due = self.next_due()
+            delay = DEFAULT_MIN_INTERVAL if next_due is None else next_due - time.monotonic()
+            self._stopped.wait(max(0.0, delay))
+
+    def stop(self) -> None:
+        """Stop a running run() or events() loop.
+
+        Safe to call from any thread; a waiting loop returns immediately.
+        """
+        self._stopped.set()
+        with self._lock:
+            wakeup = self._wakeup
+        if wakeup is not None:
+            loop, event = wakeup
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
+    async def events(self) -> AsyncIterator[ChangeEvent]:
+        """Poll the watches until stopped and yield their events.
+
+        Polls run in a worker thread, so the event loop is never blocked.
+
+        Yields:
+            ChangeEvents in the order they were detected.
+        """
+        stopped = asyncio.Event()
+        with self._lock:
+            self._wakeup = (asyncio.get_running_loop(), stopped)
+        self._stopped.clear()
+        try:
+            while not self._stopped.is_set():
+                for event in await asyncio.to_thread(self.poll_once):
+                    yield event
+                next_due = self.next_due()
+                delay = DEFAULT_MIN_INTERVAL if next_due is None else next_due - time.monotonic()
+                try:
+                    await asyncio.wait_for(stopped.wait(), max(0.0, delay))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._lock:
+                self._wakeup = None
+
+    def _compare(self, watch: _Watch, entities: list[BaseModel]) -> list[ChangeEvent]:
+        """Diff a poll result with the previous one and store it.
+
+        Args:
+            watch: Polled watch.
+            entities: Current entity list.
+
+        Returns:
+            Events of the differences.
+        """
+        previous, watch.entities = watch.entities, entities
+        if previous is None and not watch.emit_initial:
+            return []
+
+        previous = previous or []
+        result = diff(previous, entities, key=watch.key, ignore=watch.ignore)
+        if not result:
+            return []
+
+        old = {str(watch.key(entity)): entity for entity in previous}
+        new = {str(watch.key(entity)): entity for entity in entities}
+        return [
+            ChangeEvent(
+                watch=watch.name,
+                kind=change.kind,
+                key=change.key,
+                entity=new.get(change.key),
+                previous=old.get(change.key),
+                fields=change.fields,
+            )
+            for change in result.changes
+        ]
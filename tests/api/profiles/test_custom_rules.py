@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 from random import randint
 
+import pytest
 from dotenv import load_dotenv
 
 from pyctrld._core.logger import logger
@@ -16,14 +17,18 @@ from pyctrld._core.utils import BaseEndpoint
 from pyctrld.api.profiles.custom_rules import (
     CreateCustomRuleFormData,
     CustomRulesEndpoint,
+    CustomRuleTarget,
     ModifyCustomRuleFormData,
 )
 from tests.checks import check_api_list_endpoint, check_key_in_model
+from tests.fakes import FakeCustomRulesEndpoint, api_error
 
 load_dotenv()
 token = os.environ.get("TOKEN", "")
 profile_id = os.environ.get("TEST_PROFILE_ID", "")
 
+REJECTED = str(api_error())
+
 
 class TestCustomRules:
     api = CustomRulesEndpoint(token)
@@ -85,6 +90,23 @@ class TestCustomRules:
             for key in created_rule[-1].model_dump():
                 check_key_in_model(key, ModifiedCustomRule)
 
+    def test_bulk_create(self, tmp_path):
+        hostnames = [f"{self.prefix}{randint(0, 999999)}.com" for _ in range(5)]
+        form_data = CreateCustomRuleFormData(
+            do=Do.BLOCK, status=Status.ENABLED, hostnames=hostnames + hostnames[:1], group=0
+        )
+        checkpoint = tmp_path / "bulk_create.ckpt"
+
+        result = self.api.bulk_create(profile_id, form_data, chunk_size=2, checkpoint=checkpoint)
+        logger.info(result)
+
+        assert result.ok
+        assert sorted(result.succeeded) == sorted(hostnames)
+
+        result = self.api.bulk_create(profile_id, form_data, checkpoint=checkpoint)
+        assert result.succeeded == []
+        assert result.skipped == hostnames
+
     def test_modify(self):
         present_data = self.api.list(profile_id)
         for item in present_data:
@@ -112,6 +134,98 @@ class TestCustomRules:
             assert not item.PK.startswith(self.prefix)
 
 
+def test_bulk_create_isolates_rejected_hostnames(tmp_path):
+    api = FakeCustomRulesEndpoint(rejected={"bad.com"})
+    hostnames = [f"host{i}.com" for i in range(7)] + ["bad.com", "host0.com"]
+    form_data = CreateCustomRuleFormData(do=Do.BLOCK, status=Status.ENABLED, hostnames=hostnames)
+    checkpoint = tmp_path / "bulk_create.ckpt"
+
+    result = api.bulk_create(profile_id, form_data, chunk_size=4, checkpoint=checkpoint)
+
+    assert sorted(result.succeeded) == [f"host{i}.com" for i in range(7)]
+    assert result.failed == {"bad.com": REJECTED}
+    assert all(len(call) <= 4 for call in api.calls)
+
+    api.rejected = set()
+    api.calls = []
+    result = api.bulk_create(profile_id, form_data, checkpoint=checkpoint)
+
+    assert api.calls == [["bad.com"]]
+    assert result.succeeded == ["bad.com"]
+    assert len(result.skipped) == 7
+
+
+@pytest.mark.parametrize("status_code", [401, 429, 500])
+def test_bulk_create_does_not_split_on_request_level_errors(status_code):
+    api = FakeCustomRulesEndpoint(rejected={"bad.com"}, status_code=status_code)
+    hostnames = [f"host{i}.com" for i in range(7)] + ["bad.com"]
+    form_data = CreateCustomRuleFormData(do=Do.BLOCK, status=Status.ENABLED, hostnames=hostnames)
+
+    result = api.bulk_create(profile_id, form_data, chunk_size=4)
+
+    assert len(api.calls) == 2
+    assert sorted(result.failed) == ["bad.com", "host4.com", "host5.com", "host6.com"]
+    assert str(status_code) in result.failed["bad.com"]
+
+
+def test_bulk_delete_selectors():
+    rules = {0: ["root.com", "bad.com"], 7: ["a.com", "b.com", "c.com"], 9: ["d.com"]}
+    api = FakeCustomRulesEndpoint(rejected={"bad.com"}, rules=rules)
+
+    result = api.bulk_delete(profile_id, hostnames=["d.com", "missing.com", "d.com", "bad.com"])
+    assert result.succeeded == ["d.com"]
+    assert result.failed == {"bad.com": REJECTED}
+    assert result.skipped == ["missing.com"]
+
+    result = api.bulk_delete(profile_id, folder_id=7, keep=["b.com"])
+    assert sorted(result.succeeded) == ["a.com", "c.com"]
+    assert rules == {0: ["root.com", "bad.com"], 7: ["b.com"], 9: []}
+
+    result = api.bulk_delete(profile_id, hostnames=["root.com", "b.com"], folder_id=0)
+    assert result.succeeded == ["root.com"]
+    assert result.skipped == ["b.com"]
+
+    with pytest.raises(ValueError):
+        api.bulk_delete(profile_id)
+
+
+def test_plan_modify_groups_identical_targets():
+    targets = {
+        "a.com": {"group": 7},
+        "b.com": {"status": False},
+        "c.com": CustomRuleTarget(group=7),
+        "d.com": {"status": Status.DISABLED},
+        "e.com": {"do": Do.SPOOF, "via": "127.0.0.1"},
+        "f.com": {"group": 7},
+    }
+
+    plan = CustomRulesEndpoint.plan_modify(targets, chunk_size=2)
+
+    assert [form_data.hostnames for form_data in plan] == [
+        ["a.com", "c.com"],
+        ["f.com"],
+        ["b.com", "d.com"],
+        ["e.com"],
+    ]
+    assert plan[0].group == 7 and plan[0].status is None
+    assert plan[2].status == Status.DISABLED
+    assert plan[3].do == Do.SPOOF
+
+    with pytest.raises(ValueError):
+        CustomRulesEndpoint.plan_modify({"x.com": {"do": Do.SPOOF}})
+
+
+def test_bulk_modify():
+    api = FakeCustomRulesEndpoint(rejected={"bad.com"})
+    targets = {f"host{i}.com": {"group": i % 2} for i in range(10)} | {"bad.com": {"group": 0}}
+
+    result = api.bulk_modify(profile_id, targets, chunk_size=50)
+
+    assert len(result.plan) == 2
+    assert sorted(result.succeeded) == sorted(f"host{i}.com" for i in range(10))
+    assert result.failed == {"bad.com": REJECTED}
+
+
 def test_list_custom_rules_not_changed():
     api = BaseEndpoint(token)
     response = api.get_raw_response(Endpoints.CUSTOM_RULES.format(profile_id=profile_id))
@@ -20,6 +20,7 @@ from pyctrld.api.profiles.filters import (
     ModifyFilterFormData,
 )
 from tests.checks import check_api_list_endpoint, check_key_in_model
+from tests.fakes import FAST, FakeControlD
 
 load_dotenv()
 token = os.environ.get("TOKEN", "")
@@ -65,6 +66,30 @@ class TestFilters:
                 assert filter.status != modifed_filter.status  # type: ignore
 
 
+def test_bulk_modify_sends_only_needed_changes():
+    state = FakeControlD()
+    for pk in ("P1", "P2", "P3"):
+        state.add_profile(pk)
+    state.native_filters["P2"]["ads"] = 1
+    state.third_party_filters["P3"]["oisd"] = 1
+    api = state.api()
+
+    reports = api.profiles.filters.bulk_modify(
+        ["P1", "P2", "P3", "P1"], {"ads": True, "oisd": False, "missing": True}, rate_limiter=FAST
+    )
+
+    assert list(reports) == ["P1", "P2", "P3"]
+    assert reports["P1"].succeeded == ["ads"]
+    assert reports["P1"].skipped == ["oisd"]
+    assert reports["P1"].failed == {"missing": "filter not found"}
+    assert reports["P2"].succeeded == []
+    assert sorted(reports["P2"].skipped) == ["ads", "oisd"]
+    assert sorted(reports["P3"].succeeded) == ["ads", "oisd"]
+    assert state.native_filters["P1"]["ads"] == 1
+    assert state.third_party_filters["P3"]["oisd"] == 0
+    assert [call[0] for call in state.calls].count("filters.modify") == 3
+
+
 def test_list_native_filters_not_changed():
     api = BaseEndpoint(token)
     response = api.get_raw_response(Endpoints.FILTERS.format(profile_id=profile_id))
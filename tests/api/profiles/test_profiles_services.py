@@ -14,6 +14,7 @@ from pyctrld.api.profiles.services import (
     ServicesEndpoint,
 )
 from tests.checks import check_api_list_endpoint, check_key_in_model
+from tests.fakes import FAST, FakeControlD
 
 load_dotenv()
 token = os.environ.get("TOKEN", "")
@@ -41,6 +42,18 @@ class TestServices:
                     check_key_in_model(key, Action)
 
 
+def test_bulk_modify_skips_disabling_services_without_rules():
+    state = FakeControlD()
+    state.add_profile("S1")
+    api = state.api()
+
+    reports = api.profiles.services.bulk_modify(
+        ["S1"], ["facebook", "tiktok"], ModifyServiceFormData(status=False), rate_limiter=FAST
+    )
+    assert reports["S1"].skipped == ["facebook", "tiktok"]
+    assert "services.modify" not in [call[0] for call in state.calls]
+
+
 def test_list_rule_folders_not_changed():
     api = BaseEndpoint(token)
     response = api.get_raw_response(Endpoints.PROFILES_SERVICES.format(profile_id=profile_id))
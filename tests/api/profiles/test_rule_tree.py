@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from tests.fakes import fake_profiles_api
+
+
+def test_fetch_rule_tree():
+    rules = {0: ["root.com"], 3: ["a.com", "b.com"], 5: []}
+    api = fake_profiles_api(rules)
+
+    tree = api.fetch_rule_tree("PK1", max_workers=2)
+
+    assert list(tree.folders) == [0, 3, 5]
+    assert tree.root.folder is None
+    assert list(tree.root.rules) == ["root.com"]
+    assert tree.folders[3].folder.count == 2
+    assert list(tree.folders[3].rules) == ["a.com", "b.com"]
+    assert tree.folders[5].rules == {}
+    assert tree.find("b.com").group == 3
+    assert tree.find("missing.com") is None
+    assert set(tree.rules()) == {"root.com", "a.com", "b.com"}
+    assert tree.model_validate_json(tree.model_dump_json()) == tree
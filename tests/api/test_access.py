@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 
+import pytest
 from dotenv import load_dotenv
 
 from pyctrld._core.logger import logger
@@ -10,6 +11,7 @@ from pyctrld._core.urls import Endpoints
 from pyctrld._core.utils import BaseEndpoint
 from pyctrld.api.access import AccessEndpoint, AccessFormData
 from tests.checks import check_api_list_endpoint, check_key_in_model
+from tests.fakes import FAST, make_fleet
 
 load_dotenv()
 token = os.getenv("TOKEN", "")
@@ -41,6 +43,64 @@ class TestAccessEndpoint:
         assert self.api.delete_learned_ip(form_data)
 
 
+def test_bulk_authorize_ips_dedupes_and_replaces():
+    state = make_fleet(3, restricted=1)
+    state.known_ips["D1"] = ["198.51.100.1", "198.51.100.2"]
+    state.known_ips["D2"] = ["203.0.113.1"]
+    api = state.api()
+
+    result = api.access.bulk_authorize_ips(
+        {
+            "D1": ["198.51.100.2", "203.0.113.0/30"],
+            "D2": ["203.0.113.1"],
+            "D3": ["2001:db8:0::1", "2001:DB8::1"],
+        },
+        replace=True,
+        chunk_size=1,
+        rate_limiter=FAST,
+    )
+    assert result.ok
+    assert sorted(result.succeeded) == ["D1", "D3"]
+    assert result.skipped == ["D2"]
+    assert result.calls["D1"] == {
+        "learn": ["203.0.113.1", "203.0.113.2"],
+        "delete": ["198.51.100.1"],
+    }
+    assert sorted(state.known_ips["D1"]) == ["198.51.100.2", "203.0.113.1", "203.0.113.2"]
+    assert state.known_ips["D3"] == ["2001:db8::1"]
+    assert [call[0] for call in state.calls].count("access.learn_new_ip") == 3
+
+    again = api.access.bulk_authorize_ips(
+        {"D1": ["198.51.100.2", "203.0.113.0/30"]}, dry_run=True, rate_limiter=FAST
+    )
+    assert again.skipped == ["D1"]
+    assert not again.calls
+
+
+def test_bulk_authorize_ips_refuses_replace_on_truncated_listings():
+    state = make_fleet(2, restricted=1)
+    state.known_ips["D1"] = [f"198.51.100.{host}" for host in range(1, 61)]
+    api = state.api()
+
+    result = api.access.bulk_authorize_ips(
+        {"D1": ["203.0.113.1"], "D2": ["203.0.113.2"]}, replace=True, rate_limiter=FAST
+    )
+    assert "50 or more known IPs" in result.failed["D1"]
+    assert result.succeeded == ["D2"]
+    assert len(state.known_ips["D1"]) == 60
+
+    result = api.access.bulk_authorize_ips({"D1": ["203.0.113.1"]}, rate_limiter=FAST)
+    assert result.succeeded == ["D1"]
+
+
+def test_bulk_authorize_ips_rejects_large_ranges():
+    api = make_fleet(1, restricted=1).api()
+    with pytest.raises(ValueError, match="more than 256"):
+        api.access.bulk_authorize_ips({"D1": ["10.0.0.0/16"]})
+    with pytest.raises(ValueError):
+        api.access.bulk_authorize_ips({"D1": ["not-an-ip"]})
+
+
 def test_list_known_ips_not_changed():
     api = BaseEndpoint(token)
     response = api.get_raw_response(Endpoints.ACCESS, params={"device_id": test_device_id})
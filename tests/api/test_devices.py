@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import os
 from random import randint
 
@@ -36,6 +37,7 @@ from pyctrld.api.devices import (
     ModifyDeviceFormData,
 )
 from tests.checks import check_api_list_endpoint, check_key_in_model
+from tests.fakes import FAST, make_fleet
 
 load_dotenv()
 token = os.getenv("TOKEN", "")
@@ -160,6 +162,83 @@ class TestDevices:
                     assert False, f"Unknown device type: {key}"
 
 
+def test_modify_devices_skips_unchanged_devices():
+    state = make_fleet(2, stats=0)
+    state.devices["D1"]["stats"] = 2
+    state.add_profile("P2")
+    state.add_device("D3", "laptop", "P1", icon="desktop-mac", stats=0)
+    state.add_device("D4", "router-3", "P2", icon="router", stats=0)
+    api = state.api()
+
+    result = api.devices.modify_devices(
+        ModifyDeviceFormData(stats="FULL", learn_ip=False),
+        filter="routers",
+        profile_id="P1",
+        rate_limiter=FAST,
+    )
+    assert result.succeeded == ["D2"]
+    assert result.skipped == ["D1"]
+    assert result.calls == {"D2": {"stats": 2}}
+    assert state.devices["D2"]["stats"] == 2
+    assert state.devices["D4"]["stats"] == 0
+    assert [call for call in state.calls if call[0] == "devices.modify_device"] == [
+        ("devices.modify_device", "D2")
+    ]
+
+    again = api.devices.modify_devices(
+        ModifyDeviceFormData(stats="FULL"), filter="routers", profile_id="P1", rate_limiter=FAST
+    )
+    assert not again.succeeded
+    assert again.skipped == ["D1", "D2"]
+
+
+def test_modify_devices_dry_run_by_device_ids():
+    state = make_fleet(1)
+    state.add_profile("P2")
+    state.add_device("D2", "router-2", "P2", icon="router")
+    api = state.api()
+
+    result = api.devices.modify_devices(
+        ModifyDeviceFormData(profile_id="P2"), device_ids=["D1", "D2", "D9"], dry_run=True
+    )
+    assert result.dry_run
+    assert result.calls == {"D1": {"profile_id": "P2"}}
+    assert result.skipped == ["D2"]
+    assert list(result.failed) == ["D9"]
+    assert result.describe() == "modify D1 {'profile_id': 'P2'}"
+    assert "devices.modify_device" not in [call[0] for call in state.calls]
+
+
+def test_bulk_create_devices_is_idempotent(tmp_path):
+    state = make_fleet(0)
+    state.add_device("D0", "router-0", "P1")
+    api = state.api()
+    output = tmp_path / "resolvers.ndjson"
+    rows = [
+        CreateDeviceFormData(name=f"router-{n}", profile_id="P1", icon="router") for n in range(5)
+    ]
+
+    first = api.devices.bulk_create_devices(
+        rows + rows[:2], output=output, max_workers=3, rate_limiter=FAST
+    )
+    assert sorted(first.succeeded) == ["router-1", "router-2", "router-3", "router-4"]
+    assert first.skipped == ["router-0"]
+    assert first.failed == {
+        "router-0 (row 6)": "duplicate name, first given in row 1",
+        "router-1 (row 7)": "duplicate name, first given in row 2",
+    }
+    assert len(state.devices) == 5
+    assert [call[0] for call in state.calls].count("devices.list_all_devices") == 1
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {record["key"] for record in records} == {f"router-{n}" for n in range(5)}
+    assert all(record["resolvers"]["doh"].startswith("https://") for record in records)
+
+    second = api.devices.bulk_create_devices(rows, rate_limiter=FAST)
+    assert not second.succeeded
+    assert len(second.skipped) == 5
+
+
 def test_list_all_devices_not_changed():
     api = BaseEndpoint(token)
     response = api.get_raw_response(Endpoints.DEVICES)
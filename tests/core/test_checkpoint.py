@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from pyctrld._core.checkpoint import Checkpoint
+
+
+def test_checkpoint_resumes_from_file(tmp_path):
+    path = tmp_path / "journal.ckpt"
+    checkpoint = Checkpoint(path)
+    checkpoint.mark_done(["a.com", "b.com"], chunk=1)
+    checkpoint.mark_failed(["c.com"], "HTTP Status: 400")
+
+    reopened = Checkpoint(path)
+    assert reopened.done == {"a.com", "b.com"}
+    assert reopened.failed == {"c.com": "HTTP Status: 400"}
+    assert reopened.get("a.com") == {"key": "a.com", "ok": True, "chunk": 1}
+
+    reopened.mark_done(["c.com"])
+    assert Checkpoint(path).is_done("c.com")
+    assert not Checkpoint(path).is_done("d.com")
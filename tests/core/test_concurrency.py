@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pyctrld._core.concurrency import RateLimiter, chunked, iter_concurrently
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 3)) == []
+
+    with pytest.raises(ValueError):
+        list(chunked([1], 0))
+
+
+def test_rate_limiter_limits_rate():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+
+    assert time.monotonic() - start >= 0.19
+
+
+def test_rate_limiter_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_iter_concurrently_collects_results_and_errors():
+    def square(value: int) -> int:
+        if value == 3:
+            raise RuntimeError("boom")
+        return value * value
+
+    outcomes = {item: (result, error) for item, result, error in iter_concurrently(square, range(6))}
+
+    assert {item: result for item, (result, _) in outcomes.items() if item != 3} == {
+        0: 0,
+        1: 1,
+        2: 4,
+        4: 16,
+        5: 25,
+    }
+    assert isinstance(outcomes[3][1], RuntimeError)
+
+
+def test_iter_concurrently_bounds_in_flight_calls():
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def work(_: int) -> None:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.005)
+        with lock:
+            in_flight -= 1
+
+    consumed = []
+
+    def items():
+        for i in range(50):
+            consumed.append(i)
+            yield i
+
+    for yielded, _ in enumerate(iter_concurrently(work, items(), max_workers=3), start=1):
+        assert len(consumed) - yielded <= 6
+
+    assert peak <= 3
+    assert len(consumed) == 50
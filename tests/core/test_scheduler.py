@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pyctrld._core.concurrency import RateLimiter
+from pyctrld._core.scheduler import TaskScheduler
+
+
+def test_dependencies_receive_results_in_order():
+    scheduler = TaskScheduler(max_workers=4)
+    scheduler.add("a", lambda: 2)
+    scheduler.add("b", lambda: 3)
+    scheduler.add("sum", lambda b, a: f"{b}-{a}", depends_on=["b", "a"])
+
+    assert scheduler.run() == {"a": 2, "b": 3, "sum": "3-2"}
+
+
+def test_tasks_added_while_running():
+    scheduler = TaskScheduler(max_workers=4, rate_limiter=RateLimiter(rate=1000))
+
+    def fan_out() -> list[int]:
+        items = [1, 2, 3]
+        for item in items:
+            scheduler.add(("square", item), lambda item=item: item * item)
+            scheduler.add(("double", item), lambda s: s * 2, depends_on=[("square", item)])
+        return items
+
+    scheduler.add("items", fan_out)
+    results = scheduler.run()
+
+    assert [results[("double", item)] for item in (1, 2, 3)] == [2, 8, 18]
+
+
+def test_independent_tasks_run_concurrently():
+    barrier = threading.Barrier(3, timeout=2)
+    scheduler = TaskScheduler(max_workers=3)
+    for key in range(3):
+        scheduler.add(key, barrier.wait)
+
+    start = time.monotonic()
+    scheduler.run()
+    assert time.monotonic() - start < 2
+
+
+def test_first_error_is_raised():
+    scheduler = TaskScheduler(max_workers=2)
+    scheduler.add("bad", lambda: 1 / 0)
+    scheduler.add("after", lambda value: value, depends_on=["bad"])
+
+    with pytest.raises(ZeroDivisionError):
+        scheduler.run()
+
+
+def test_invalid_tasks_are_rejected():
+    scheduler = TaskScheduler()
+    scheduler.add("a", lambda: None)
+
+    with pytest.raises(ValueError):
+        scheduler.add("a", lambda: None)
+    with pytest.raises(ValueError):
+        scheduler.add("b", lambda: None, depends_on=["missing"])
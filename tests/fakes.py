@@ -0,0 +1,545 @@
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+from requests import Response
+
+from pyctrld._api import ControlDApi
+from pyctrld._core.concurrency import RateLimiter
+from pyctrld._core.exceptions import ApiError
+from pyctrld._core.models.access import Ips
+from pyctrld._core.models.account import UserData
+from pyctrld._core.models.common import Action
+from pyctrld._core.models.devices import Device
+from pyctrld._core.models.profiles.custom_rules import CustomRule
+from pyctrld._core.models.profiles.filters import NativeFilter, ThirdPartyFilter
+from pyctrld._core.models.profiles.profiles import Data, Option, ProfileObject
+from pyctrld._core.models.profiles.rule_folders import RuleFolder
+from pyctrld._core.models.profiles.services import Service
+from pyctrld._core.models.services import Category
+from pyctrld._core.models.services import Service as CatalogService
+from pyctrld.api.access import KNOWN_IPS_LIMIT, AccessEndpoint
+from pyctrld.api.account import AccountEndpoint
+from pyctrld.api.devices import DevicesEndpoint
+from pyctrld.api.profiles._api import ProfilesAPI
+from pyctrld.api.profiles.custom_rules import CustomRulesEndpoint
+from pyctrld.api.profiles.default_rule import DefaultRuleEndpoint
+from pyctrld.api.profiles.filters import FiltersEndpoint
+from pyctrld.api.profiles.profiles import ProfilesEndpoint
+from pyctrld.api.profiles.rule_folders import RuleFoldersEndpoint
+from pyctrld.api.profiles.services import ServicesEndpoint
+from pyctrld.api.services import ServicesEndpoint as CatalogEndpoint
+from pyctrld.tools.simulate import PolicySimulator
+from pyctrld.tools.snapshot import snapshot_profiles
+
+ACTION = {"do": 0, "status": 1}
+# Rate limiter that never throttles the in-memory fakes
+FAST = RateLimiter(rate=10_000)
+
+
+def api_error(status_code: int = 400, message: str = "rejected") -> ApiError:
+    response = Response()
+    response.status_code = status_code
+    response._content = json.dumps({"error": {"code": 0, "message": message}}).encode()
+    return ApiError(response)
+
+
+class FakeCustomRulesEndpoint(CustomRulesEndpoint):
+    def __init__(
+        self,
+        rules: dict[int, list[str]] | None = None,
+        rejected: set[str] | None = None,
+        status_code: int = 400,
+    ) -> None:
+        super().__init__("")
+        self.rules = rules if rules is not None else {}
+        self.rejected = rejected or set()
+        self.status_code = status_code
+        self.calls: list[list[str]] = []
+
+    def _list(self, url, model, key, params=None):
+        folders = [folder for folder in self.rules if folder]
+        return [RuleFolder(PK=pk, group=f"f{pk}", action=ACTION, count=0) for pk in folders]
+
+    def list(self, profile_id, folder_id=None):
+        return [
+            CustomRule(PK=hostname, order=1, group=folder_id or 0, action=ACTION)
+            for hostname in self.rules.get(folder_id or 0, [])
+        ]
+
+    def create(self, profile_id, form_data):
+        self.calls.append(form_data.hostnames)
+        if self.rejected & set(form_data.hostnames):
+            raise api_error(self.status_code)
+        return []
+
+    def modify(self, profile_id, form_data):
+        self.calls.append(form_data.hostnames)
+        if self.rejected & set(form_data.hostnames):
+            raise api_error(self.status_code)
+        return []
+
+    def delete(self, profile_id, hostname):
+        self.calls.append([hostname])
+        if hostname in self.rejected:
+            raise api_error(self.status_code)
+        for rules in self.rules.values():
+            if hostname in rules:
+                rules.remove(hostname)
+        return True
+
+
+class FakeRuleFoldersEndpoint(RuleFoldersEndpoint):
+    def __init__(self, rules: dict[int, list[str]]) -> None:
+        super().__init__("")
+        self.rules = rules
+
+    def list(self, profile_id):
+        return [
+            RuleFolder(PK=pk, group=f"f{pk}", action=ACTION, count=len(hostnames))
+            for pk, hostnames in self.rules.items()
+            if pk
+        ]
+
+
+def fake_profiles_api(rules: dict[int, list[str]]) -> ProfilesAPI:
+    api = ProfilesAPI("")
+    api.__dict__["custom_rules"] = FakeCustomRulesEndpoint(rules)
+    api.__dict__["rule_folders"] = FakeRuleFoldersEndpoint(rules)
+    return api
+
+
+def profile_payload(pk: str, name: str, updated: int = 1) -> dict:
+    count = {"count": 0}
+    return {
+        "PK": pk,
+        "updated": updated,
+        "name": name,
+        "profile": {
+            "flt": count,
+            "cflt": count,
+            "ipflt": count,
+            "rule": count,
+            "svc": count,
+            "grp": count,
+            "opt": {"count": 0, "data": []},
+            "da": {"do": 1, "status": 1},
+        },
+    }
+
+
+def device_payload(pk: str, name: str, profile_id: str, **fields) -> dict:
+    return {
+        "PK": pk,
+        "ts": 1700000000,
+        "name": name,
+        "device_id": pk,
+        "status": 1,
+        "learn_ip": 0,
+        "resolvers": {
+            "uid": f"uid-{pk}",
+            "doh": f"https://dns.controld.com/{pk}",
+            "dot": f"{pk}.dns.controld.com",
+        },
+        "profile": {"PK": profile_id, "updated": 1, "name": profile_id},
+        "user": "user1",
+        "client_count": 0,
+        **fields,
+    }
+
+
+USER_PAYLOAD = {
+    "last_active": 1700000000,
+    "email_status": 1,
+    "status": 1,
+    "email": "user@example.com",
+    "date": "2024-01-01",
+    "PK": "user1",
+    "twofa": 0,
+    "v": 1,
+    "sso": "",
+    "stats_endpoint": "europe",
+    "debug": [],
+}
+
+
+class FakeControlD:
+    """In-memory ControlD account exposing fake endpoints through a real ControlDApi."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+        self.profiles: dict[str, dict] = {}
+        self.folders: dict[str, dict[int, dict]] = {}
+        self.rules: dict[str, dict[str, dict]] = {}
+        self.services: dict[str, dict[str, dict]] = {}
+        self.native_filters: dict[str, dict[str, int]] = {}
+        self.third_party_filters: dict[str, dict[str, int]] = {}
+        self.default_rules: dict[str, dict] = {}
+        self.options: dict[str, dict[str, dict]] = {}
+        self.devices: dict[str, dict] = {}
+        self.known_ips: dict[str, list[str]] = {}
+        self.catalog: dict[str, list[str]] = {
+            "gaming": ["steam", "epicgames", "roblox"],
+            "social": ["facebook", "tiktok"],
+        }
+        self._next_folder = 100
+
+    # state helpers
+
+    def add_profile(self, pk: str, name: str = "", updated: int = 1) -> None:
+        self.profiles[pk] = profile_payload(pk, name or pk, updated)
+        self.folders[pk] = {}
+        self.rules[pk] = {}
+        self.services[pk] = {}
+        self.native_filters[pk] = {"ads": 0, "malware": 1}
+        self.third_party_filters[pk] = {"oisd": 0}
+        self.default_rules[pk] = {"do": 1, "status": 1}
+        self.options[pk] = {}
+
+    def add_folder(self, profile_id: str, name: str, do: int = 0, status: int = 1) -> int:
+        self._next_folder += 1
+        self.folders[profile_id][self._next_folder] = {
+            "group": name,
+            "action": {"do": do, "status": status},
+        }
+        return self._next_folder
+
+    def add_rule(
+        self, profile_id: str, hostname: str, do: Optional[int] = 0, group: int = 0, **action
+    ):
+        # Rules inheriting the action of their folder have no "do"
+        action = {"status": 1, **action} if do is None else {"do": do, "status": 1, **action}
+        self.rules[profile_id][hostname] = {"group": group, "action": action}
+
+    def add_device(self, pk: str, name: str, profile_id: str, **fields) -> None:
+        self.devices[pk] = device_payload(pk, name, profile_id, **fields)
+        self.known_ips[pk] = []
+
+    def touch(self, profile_id: str) -> None:
+        self.profiles[profile_id]["updated"] += 1
+
+    def api(self) -> ControlDApi:
+        api = ControlDApi("")
+        profiles = api.profiles
+        for name, endpoint in {
+            "custom_rules": _FakeRules,
+            "rule_folders": _FakeFolders,
+            "services": _FakeProfileServices,
+            "filters": _FakeFilters,
+            "default_rule": _FakeDefaultRule,
+            "profiles": _FakeProfiles,
+        }.items():
+            profiles.__dict__[name] = endpoint(self)
+        api.__dict__["devices"] = _FakeDevices(self)
+        api.__dict__["access"] = _FakeAccess(self)
+        api.__dict__["account"] = _FakeAccount(self)
+        api.__dict__["services"] = _FakeCatalog(self)
+        return api
+
+
+def make_fleet(count: int, **fields) -> FakeControlD:
+    """Return an account with profile P1 and routers D1..Dn named router-1..router-n."""
+    state = FakeControlD()
+    state.add_profile("P1")
+    for number in range(1, count + 1):
+        state.add_device(f"D{number}", f"router-{number}", "P1", icon="router", **fields)
+    return state
+
+
+def _fake_endpoint(base):
+    class Fake(base):
+        def __init__(self, state: FakeControlD) -> None:
+            super().__init__("")
+            self.state = state
+
+        def _record(self, *call) -> None:
+            self.state.calls.append(call)
+
+    return Fake
+
+
+class _FakeRules(_fake_endpoint(CustomRulesEndpoint)):
+    def list(self, profile_id, folder_id=None):
+        self._record("rules.list", profile_id, folder_id)
+        group = folder_id or 0
+        return [
+            CustomRule(PK=hostname, order=1, group=rule["group"], action=rule["action"])
+            for hostname, rule in self.state.rules[profile_id].items()
+            if rule["group"] == group
+        ]
+
+    def _list(self, url, model, key, params=None):
+        return _FakeFolders(self.state).list(url.split("/")[-2])
+
+    def create(self, profile_id, form_data):
+        self._record("rules.create", profile_id, tuple(form_data.hostnames))
+        data = form_data.model_dump(mode="json")
+        for hostname in form_data.hostnames:
+            self.state.add_rule(
+                profile_id,
+                hostname,
+                do=data["do"],
+                group=data["group"] or 0,
+                **{key: data[key] for key in ("via", "via_v6") if data[key] is not None},
+            )
+        return []
+
+    def modify(self, profile_id, form_data):
+        self._record("rules.modify", profile_id, tuple(form_data.hostnames))
+        data = form_data.model_dump(mode="json", exclude_none=True)
+        for hostname in form_data.hostnames:
+            rule = self.state.rules[profile_id][hostname]
+            if "group" in data:
+                rule["group"] = data["group"]
+            for key in ("do", "status", "via", "via_v6"):
+                if key in data:
+                    rule["action"][key] = data[key]
+        return []
+
+    def delete(self, profile_id, hostname):
+        self._record("rules.delete", profile_id, hostname)
+        del self.state.rules[profile_id][hostname]
+        return True
+
+
+class _FakeFolders(_fake_endpoint(RuleFoldersEndpoint)):
+    def list(self, profile_id):
+        self._record("folders.list", profile_id)
+        return [
+            RuleFolder(
+                PK=pk,
+                group=folder["group"],
+                action=folder["action"],
+                count=sum(rule["group"] == pk for rule in self.state.rules[profile_id].values()),
+            )
+            for pk, folder in self.state.folders[profile_id].items()
+        ]
+
+    def create(self, profile_id, form_data):
+        self._record("folders.create", profile_id, form_data.name)
+        data = form_data.model_dump(mode="json")
+        self.state.add_folder(profile_id, data["name"], do=data["do"] or 0, status=data["status"])
+        return self.list(profile_id)
+
+    def modify(self, profile_id, folder, form_data):
+        self._record("folders.modify", profile_id, folder)
+        data = form_data.model_dump(mode="json", exclude_none=True)
+        current = self.state.folders[profile_id][folder]
+        if "name" in data:
+            current["group"] = data["name"]
+        for key in ("do", "status", "via", "via_v6"):
+            if key in data:
+                current["action"][key] = data[key]
+        return self.list(profile_id)
+
+    def delete(self, profile_id, folder):
+        self._record("folders.delete", profile_id, folder)
+        del self.state.folders[profile_id][folder]
+        for hostname, rule in list(self.state.rules[profile_id].items()):
+            if rule["group"] == folder:
+                del self.state.rules[profile_id][hostname]
+        return True
+
+
+class _FakeProfileServices(_fake_endpoint(ServicesEndpoint)):
+    def list(self, profile_id):
+        self._record("services.list", profile_id)
+        return [
+            Service(
+                PK=pk,
+                name=pk,
+                unlock_location="",
+                category=service["category"],
+                action=service["action"],
+            )
+            for pk, service in self.state.services[profile_id].items()
+        ]
+
+    def modify(self, profile_id, service, form_data):
+        self._record("services.modify", profile_id, service)
+        data = form_data.model_dump(mode="json", exclude_none=True)
+        current = self.state.services[profile_id].setdefault(
+            service, {"category": "unknown", "action": {"status": 1}}
+        )
+        current["action"].update(data)
+        return [Action.model_validate(current["action"])]
+
+
+class _FakeCatalog(_fake_endpoint(CatalogEndpoint)):
+    def list_service_categories(self):
+        self._record("catalog.list_service_categories")
+        return [
+            Category(PK=category, name=category.title(), description="", count=len(services))
+            for category, services in self.state.catalog.items()
+        ]
+
+    def list_all_services(self, category):
+        self._record("catalog.list_all_services", category)
+        return [
+            CatalogService(PK=pk, category=category, name=pk.title(), unlock_location="")
+            for pk in self.state.catalog[category]
+        ]
+
+
+class _FakeFilters(_fake_endpoint(FiltersEndpoint)):
+    def list_native(self, profile_id):
+        self._record("filters.list_native", profile_id)
+        return [
+            NativeFilter(PK=pk, description="", name=pk, sources=[], status=status)
+            for pk, status in self.state.native_filters[profile_id].items()
+        ]
+
+    def list_third_party(self, profile_id):
+        self._record("filters.list_third_party", profile_id)
+        return [
+            ThirdPartyFilter(
+                PK=pk,
+                description="",
+                name=pk,
+                resolvers={"v4": [], "v6": []},
+                sources=[],
+                status=status,
+            )
+            for pk, status in self.state.third_party_filters[profile_id].items()
+        ]
+
+    def modify(self, profile_id, filter, form_data):
+        self._record("filters.modify", profile_id, filter)
+        status = form_data.model_dump(mode="json")["status"]
+        for filters in (self.state.native_filters, self.state.third_party_filters):
+            if filter in filters[profile_id]:
+                filters[profile_id][filter] = status
+        return {filter: Action(status=status)}
+
+
+class _FakeDefaultRule(_fake_endpoint(DefaultRuleEndpoint)):
+    def list(self, profile_id):
+        self._record("default.list", profile_id)
+        return Action.model_validate(self.state.default_rules[profile_id])
+
+    def modify(self, profile_id, form_data):
+        self._record("default.modify", profile_id)
+        self.state.default_rules[profile_id] = form_data.model_dump(mode="json", exclude_none=True)
+        return self.list(profile_id)
+
+
+class _FakeProfiles(_fake_endpoint(ProfilesEndpoint)):
+    def list(self):
+        self._record("profiles.list")
+        profiles = []
+        for pk, payload in self.state.profiles.items():
+            payload["profile"]["opt"] = {
+                "count": len(self.state.options[pk]),
+                "data": [{"PK": name, **value} for name, value in self.state.options[pk].items()],
+            }
+            profiles.append(ProfileObject.model_validate(payload))
+        return profiles
+
+    def create(self, form_data):
+        self._record("profiles.create", form_data.name)
+        pk = f"P{len(self.state.profiles) + 1}"
+        self.state.add_profile(pk, form_data.name)
+        return [ProfileObject.model_validate(self.state.profiles[pk])]
+
+    def list_options(self):
+        self._record("profiles.list_options")
+        return [
+            Option(
+                PK="ai_malware",
+                title="AI Malware",
+                description="",
+                type="dropdown",
+                default_value=0.9,
+                info_url="",
+            )
+        ]
+
+    def modify_options(self, profile_id, name, form_data):
+        self._record("profiles.modify_options", profile_id, name)
+        data = form_data.model_dump(mode="json")
+        if data["status"]:
+            self.state.options[profile_id][name] = {"value": data["value"]}
+        else:
+            self.state.options[profile_id].pop(name, None)
+        return [Data(PK=name, value=data["value"])]
+
+
+class _FakeDevices(_fake_endpoint(DevicesEndpoint)):
+    def list_all_devices(self, filter="all"):
+        self._record("devices.list_all_devices", filter)
+        devices = [Device.model_validate(payload) for payload in self.state.devices.values()]
+        if filter == "routers":
+            devices = [device for device in devices if (device.icon or "").startswith("router")]
+        elif filter == "users":
+            devices = [device for device in devices if not (device.icon or "").startswith("router")]
+        return devices
+
+    def create_device(self, form_data):
+        self._record("devices.create_device", form_data.name)
+        pk = f"D{len(self.state.devices) + 1}"
+        data = form_data.model_dump(mode="json", exclude_none=True)
+        extra = {key: data[key] for key in ("icon", "desc") if key in data}
+        self.state.add_device(pk, data["name"], data["profile_id"], **extra)
+        return Device.model_validate(self.state.devices[pk])
+
+    def modify_device(self, device_id, form_data):
+        self._record("devices.modify_device", device_id)
+        data = form_data.model_dump(mode="json", exclude_none=True)
+        payload = self.state.devices[device_id]
+        if "profile_id" in data:
+            payload["profile"] = {"PK": data.pop("profile_id"), "updated": 1, "name": ""}
+        payload.update(data)
+        return Device.model_validate(payload)
+
+
+class _FakeAccess(_fake_endpoint(AccessEndpoint)):
+    def list_known_ips(self, device_id):
+        self._record("access.list_known_ips", device_id)
+        return [
+            Ips(ip=ip, ts=1, country="", city="", isp="", asn=0, as_name="")
+            for ip in self.state.known_ips[device_id][-KNOWN_IPS_LIMIT:]
+        ]
+
+    def learn_new_ip(self, form_data):
+        self._record("access.learn_new_ip", form_data.device_id, tuple(form_data.ips))
+        self.state.known_ips[form_data.device_id].extend(form_data.ips)
+        return True
+
+    def delete_learned_ip(self, form_data):
+        self._record("access.delete_learned_ip", form_data.device_id, tuple(form_data.ips))
+        known = self.state.known_ips[form_data.device_id]
+        known[:] = [ip for ip in known if ip not in form_data.ips]
+        return True
+
+
+class _FakeAccount(_fake_endpoint(AccountEndpoint)):
+    def user_data(self):
+        self._record("account.user_data")
+        return UserData.model_validate(USER_PAYLOAD)
+
+
+def make_simulator() -> PolicySimulator:
+    state = FakeControlD()
+    state.add_profile("P1")
+    spoof = state.add_folder("P1", "spoof", do=2)
+    state.folders["P1"][spoof]["action"]["via"] = "10.0.0.1"
+    off = state.add_folder("P1", "off", status=0)
+    state.add_rule("P1", "blocked.com")
+    state.add_rule("P1", "*.allowed.blocked.com", do=1)
+    state.add_rule("P1", "spoofed.com", do=2, group=spoof, via="10.0.0.2")
+    state.add_rule("P1", "inactive.com", group=off)
+    state.services["P1"]["youtube"] = {"category": "video", "action": {"do": 1, "status": 1}}
+    state.third_party_filters["P1"]["oisd"] = 1
+
+    api = state.api()
+    snapshot = snapshot_profiles(api, api.profiles.profiles.list())["P1"]
+    return PolicySimulator(
+        snapshot,
+        service_hostnames={"youtube": ["youtube.com", "googlevideo.com"]},
+        filter_hostnames={
+            "ads": ["ads.example.com"],
+            "malware": ["evil.com", "youtube.com"],
+            "oisd": ["tracker.net", "evil.com"],
+        },
+    )
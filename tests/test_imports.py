@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+import pyctrld
+import pyctrld.api.profiles
+
+
+def _loaded_modules_after(statement: str) -> set[str]:
+    code = f"import sys\n{statement}\nprint('\\n'.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return set(output.split())
+
+
+def test_import_is_lazy():
+    modules = _loaded_modules_after("import pyctrld")
+    assert "pyctrld._api" not in modules
+    assert "pyctrld.api.devices" not in modules
+    assert "pydantic" not in modules
+    assert "requests" not in modules
+
+
+def test_endpoint_loaded_on_first_access():
+    modules = _loaded_modules_after(
+        "from pyctrld import ControlDApi\nControlDApi('token').profiles.custom_rules"
+    )
+    assert "pyctrld.api.profiles.custom_rules" in modules
+    assert "pyctrld.api.devices" not in modules
+    assert "pyctrld.api.profiles.filters" not in modules
+
+
+def test_public_names_resolve():
+    for package in (pyctrld, pyctrld.api.profiles):
+        assert sorted(package.__all__) == sorted(package._LAZY_ATTRIBUTES)
+        for name in package.__all__:
+            assert getattr(package, name).__name__ in (name, "ServicesEndpoint")
+            assert name in dir(package)
+
+    assert pyctrld.ProfileServicesEndpoint is pyctrld.api.profiles.ServicesEndpoint
+
+
+def test_unknown_name_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        pyctrld.UnknownEndpoint  # noqa: B018
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pyctrld.tools import classify
+from pyctrld.tools.classify import classify_file
+from tests.fakes import make_simulator
+
+HOSTNAMES = ["a.blocked.com", "spoofed.com", "m.youtube.com", "evil.com", "x.org"] * 200
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_classify_text(tmp_path, workers):
+    path = tmp_path / "hosts.txt"
+    path.write_text("# header comment\n" + "\n".join(HOSTNAMES) + "\n\n")
+
+    result = classify_file(make_simulator(), path, workers=workers, batch_size=7)
+
+    assert result.total == len(HOSTNAMES)
+    assert result.by_action == {"BLOCK": 400, "SPOOF": 200, "BYPASS": 400}
+    assert result.by_layer == {
+        "custom_rule": 400,
+        "service": 200,
+        "native_filter": 200,
+        "default": 200,
+    }
+    assert result.by_folder == {"(root)": 200, "spoof": 200}
+    assert result.by_service == {"youtube": 200}
+    assert result.by_filter == {"malware": 200}
+    assert classify._simulator is None
+
+
+def test_classify_csv_and_ndjson(tmp_path):
+    csv_path = tmp_path / "log.csv"
+    csv_path.write_text("ts,hostname\n" + "".join(f"1,{h}\n" for h in HOSTNAMES[:5]) + "2,\n")
+    ndjson_path = tmp_path / "log.ndjson"
+    ndjson_path.write_text(
+        "".join(json.dumps({"q": h}) + "\n" for h in HOSTNAMES[:5]) + "not json\n"
+    )
+
+    from_csv = classify_file(make_simulator(), csv_path, workers=1)
+    from_ndjson = classify_file(make_simulator(), ndjson_path, column="q", workers=1)
+
+    assert from_csv.total == from_ndjson.total == 5
+    assert from_csv.invalid == from_ndjson.invalid == 1
+    assert from_csv.by_layer == from_ndjson.by_layer
+    with pytest.raises(ValueError):
+        classify_file(make_simulator(), csv_path, column="q")
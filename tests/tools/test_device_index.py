@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pyctrld._core.models.devices import Device
+from pyctrld.tools.device_index import DeviceIndex
+from tests.fakes import device_payload
+
+
+def make_device(pk: str, name: str, profile_id: str = "P1", **fields) -> Device:
+    return Device.model_validate(device_payload(pk, name, profile_id, **fields))
+
+
+def test_lookups_by_every_key():
+    devices = [
+        make_device("D1", "router", ts=100, last_activity=500, profile2={"PK": "P9"}),
+        make_device("D2", "router", ts=200),
+        make_device("D3", "laptop", "P2", ts=300, last_activity=900),
+    ]
+    index = DeviceIndex(devices)
+
+    assert len(index) == 3
+    assert index.get("D1").name == "router"
+    assert index.by_device_id("D2").PK == "D2"
+    assert index.by_uid("uid-D3").PK == "D3"
+    assert index.by_doh("https://dns.controld.com/D1/").PK == "D1"
+    assert index.by_dot("d2.DNS.controld.com").PK == "D2"
+    assert index.by_doh("https://dns.controld.com/unknown") is None
+    assert [device.PK for device in index.by_name("router")] == ["D1", "D2"]
+    assert [device.PK for device in index.by_profile("P1")] == ["D1", "D2"]
+    assert [device.PK for device in index.by_profile2("P9")] == ["D1"]
+    assert [device.PK for device in index.created_between(150, 300)] == ["D2", "D3"]
+    assert [device.PK for device in index.active_between(0, 600)] == ["D1"]
+
+
+def test_refresh_reindexes_only_changes():
+    index = DeviceIndex(
+        [make_device("D1", "router", ts=100), make_device("D2", "laptop", ts=200)]
+    )
+    unchanged = index.get("D1")
+
+    changes = index.refresh(
+        [
+            unchanged,
+            make_device("D2", "laptop", "P2", ts=200, last_activity=1000),
+            make_device("D3", "phone", ts=300),
+        ]
+    )
+    assert changes.added == ["D3"]
+    assert changes.changed == ["D2"]
+    assert changes.unchanged == 1
+    assert index.get("D1") is unchanged
+    assert [device.PK for device in index.by_profile("P2")] == ["D2"]
+    assert [device.PK for device in index.by_profile("P1")] == ["D1", "D3"]
+    assert [device.PK for device in index.active_between(1000, 1000)] == ["D2"]
+
+    changes = index.refresh([unchanged])
+    assert sorted(changes.removed) == ["D2", "D3"]
+    assert index.by_name("phone") == []
+    assert [device.PK for device in index.created_between(0, 10_000)] == ["D1"]
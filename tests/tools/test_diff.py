@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from pyctrld._core.models.common import Do
+from pyctrld._core.models.profiles.custom_rules import CustomRule
+from pyctrld.tools.diff import diff, diff_snapshots
+from tests.fakes import FakeControlD
+
+
+def rule(hostname: str, do: int = 0, order: int = 1) -> CustomRule:
+    return CustomRule(PK=hostname, order=order, group=0, action={"do": do, "status": 1})
+
+
+def test_diff_by_key_with_field_changes():
+    old = [rule("a.com"), rule("b.com"), rule("c.com")]
+    new = [rule("a.com"), rule("b.com", do=1), rule("d.com")]
+
+    result = diff(old, new)
+
+    assert result.added == ["d.com"]
+    assert result.removed == ["c.com"]
+    assert result.changed == ["b.com"]
+    assert result.unchanged == 1
+    [change] = result.changes[0].fields
+    assert (change.field, change.old, change.new) == ("action.do", 0, 1)
+    assert result.summary() == "1 added, 1 removed, 1 changed, 1 unchanged"
+
+
+def test_diff_ignores_fields():
+    old, new = rule("a.com", order=1), rule("a.com", order=2)
+
+    assert diff([old], [new])
+    assert not diff([old], [new], ignore=["order"])
+    assert diff([old], [new], key=lambda entity: entity.PK.upper()).changed == ["A.COM"]
+
+
+def test_diff_sees_models_changed_in_place():
+    old, new = rule("a.com"), rule("a.com")
+    assert not diff([old], [new])
+
+    new.action.do = Do.BYPASS
+    new.comment = "extra field"
+
+    [change] = diff([old], [new]).changes
+    assert [field.field for field in change.fields] == ["action.do", "comment"]
+
+
+def test_diff_snapshots():
+    state = FakeControlD()
+    state.add_profile("P1")
+    state.add_rule("P1", "a.com")
+    state.add_device("D1", "router", "P1")
+    before = state.api().snapshot()
+
+    state.add_rule("P1", "b.com")
+    state.rules["P1"]["a.com"]["action"]["do"] = 1
+    state.native_filters["P1"]["ads"] = 1
+    del state.devices["D1"]
+    after = state.api().snapshot()
+
+    result = diff_snapshots(before, after)
+
+    assert result["rules"].added == ["P1/b.com"]
+    assert result["rules"].changed == ["P1/a.com"]
+    assert result["native_filters"].changed == ["P1/ads"]
+    assert result["devices"].removed == ["D1"]
+    assert not result["profiles"]
+    assert not diff_snapshots(after, after)["rules"]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from pyctrld._core.models.devices import Device
+from tests.fakes import device_payload
+
+pytest.importorskip("numpy")
+
+from pyctrld.tools.fleet import SECONDS_PER_DAY, FleetFrame
+
+NOW = 1_800_000_000
+
+
+def make_device(pk: str, profile_id: str = "P1", **fields) -> Device:
+    return Device.model_validate(device_payload(pk, pk, profile_id, **fields))
+
+
+def make_fleet() -> FleetFrame:
+    ctrld = {"last_fetch": NOW, "status": 1}
+    return FleetFrame(
+        [
+            make_device(
+                "D1",
+                icon="router",
+                client_count=5,
+                last_activity=NOW - 40 * SECONDS_PER_DAY,
+                ctrld={**ctrld, "version": "1.3.10"},
+                restricted=1,
+                stats=2,
+            ),
+            make_device(
+                "D2",
+                icon="router",
+                client_count=3,
+                last_activity=NOW,
+                ctrld={**ctrld, "version": "1.4.2"},
+            ),
+            make_device("D3", "P2", icon="mobile-ios", client_count=1, status=2),
+            make_device(
+                "D4",
+                "P2",
+                icon="router",
+                last_activity=NOW - 90 * SECONDS_PER_DAY,
+                ctrld={**ctrld, "version": "1.3.10"},
+                restricted=0,
+            ),
+        ]
+    )
+
+
+def test_fleet_aggregations():
+    fleet = make_fleet()
+
+    assert len(fleet) == 4
+    assert fleet.stale(days=30, now=NOW) == ["D3", "D4", "D1"]
+    assert fleet.stale(days=60, now=NOW, include_never=False) == ["D4"]
+    assert fleet.version_distribution() == {"1.3.10": 2, "1.4.2": 1}
+    assert fleet.devices_per_profile() == {"P1": 2, "P2": 2}
+    assert fleet.restricted_counts() == {"restricted": 1, "unrestricted": 3}
+    assert fleet.clients_per_icon() == {"router": 8, "mobile-ios": 1}
+    assert fleet.status_counts() == {"ACTIVE": 3, "SOFT_DISABLED": 1}
+    assert fleet.stats_counts() == {"FULL": 1}
+
+
+def test_empty_fleet():
+    fleet = FleetFrame([])
+
+    assert len(fleet) == 0
+    assert fleet.stale(now=NOW) == []
+    assert fleet.devices_per_profile() == {}
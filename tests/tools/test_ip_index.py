@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pyctrld._core.models.access import Ips
+from pyctrld._core.models.devices import Device
+from pyctrld.tools.ip_index import IpIndex
+from tests.fakes import device_payload
+
+
+def ips(*addresses: str) -> list[Ips]:
+    return [Ips(ip=ip, ts=1, country="", city="", isp="", asn=0, as_name="") for ip in addresses]
+
+
+def make_device(pk: str, **fields) -> Device:
+    return Device.model_validate(device_payload(pk, pk, "P1", **fields))
+
+
+def test_lookup_learned_and_resolver_addresses():
+    devices = [
+        make_device("D1", legacy_ipv4={"resolver": "192.0.2.10", "status": 1}),
+        make_device(
+            "D2",
+            resolvers={
+                "uid": "u2",
+                "doh": "https://dns.controld.com/D2",
+                "dot": "D2.dns.controld.com",
+                "v4": ["192.0.2.20"],
+                "v6": ["2001:db8::20"],
+            },
+        ),
+    ]
+    index = IpIndex(devices, {"D1": ips("198.51.100.7"), "D2": ips("198.51.100.7")})
+
+    assert index.match("192.0.2.10") == {"D1": "legacy_ipv4"}
+    assert index.lookup("2001:DB8::20") == ("D2",)
+    assert sorted(index.lookup("198.51.100.7")) == ["D1", "D2"]
+    assert index.lookup("203.0.113.1") == ()
+    assert index.lookup("not-an-ip") == ()
+    assert index.lookup_many(["192.0.2.20", "192.0.2.20", "192.0.2.10"]) == [
+        ("D2",),
+        ("D2",),
+        ("D1",),
+    ]
+
+
+def test_longest_prefix_match_and_incremental_updates():
+    index = IpIndex()
+    index.add("10.0.0.0/8", "WIDE")
+    index.add("10.1.0.0/16", "NARROW")
+    index.add("10.1.2.3", "HOST")
+
+    assert index.lookup("10.1.2.3") == ("HOST",)
+    assert index.lookup("10.1.9.9") == ("NARROW",)
+    assert index.lookup("10.200.0.1") == ("WIDE",)
+    assert index.lookup("11.0.0.1") == ()
+
+    assert index.remove("10.1.0.0/16", "NARROW")
+    assert not index.remove("10.1.0.0/16", "NARROW")
+    assert index.lookup("10.1.9.9") == ("WIDE",)
+
+    index.set_known_ips("HOST", ips("10.1.2.3", "10.1.2.4"))
+    index.set_known_ips("HOST", ips("10.1.2.4"))
+    assert index.lookup("10.1.2.3") == ("WIDE",)
+    assert index.lookup("10.1.2.4") == ("HOST",)
+
+    index.remove_device("WIDE")
+    assert index.lookup("10.200.0.1") == ()
+    assert len(index) == 1
+
+
+def test_learned_ip_equal_to_resolver_address_keeps_both_sources():
+    device = make_device("D1", legacy_ipv4={"resolver": "192.0.2.10", "status": 1})
+    index = IpIndex([device], {"D1": ips("192.0.2.10")})
+    assert index.match("192.0.2.10") == {"D1": "learned"}
+
+    index.add_device(device)
+    index.set_known_ips("D1", ips())
+    assert index.match("192.0.2.10") == {"D1": "legacy_ipv4"}
+
+    index.set_known_ips("D1", ips("192.0.2.10"))
+    assert index.remove("192.0.2.10", "D1", "legacy_ipv4")
+    assert not index.remove("192.0.2.10", "D1", "resolver")
+    assert index.match("192.0.2.10") == {"D1": "learned"}
+
+
+def test_remove_prunes_empty_radix_nodes():
+    index = IpIndex()
+    index.add("10.1.0.0/16", "D1")
+    index.add("10.0.0.0/8", "D2")
+    index.add("2001:db8::/32", "D3")
+
+    assert index.remove("10.1.0.0/16", "D1")
+    node = index._roots[4]
+    for _ in range(8):
+        node = node.children[0] or node.children[1]
+    assert node.devices == {"D2": "learned"}
+    assert node.children == [None, None]
+
+    index.remove_device("D2")
+    index.remove_device("D3")
+    assert index._roots[4].children == [None, None]
+    assert index._roots[6].children == [None, None]
+    assert repr(index) == "<IpIndex devices=0 addresses=0 networks=0>"
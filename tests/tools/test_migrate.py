@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from pyctrld._core.checkpoint import Checkpoint
+from pyctrld.tools.migrate import migrate_profiles
+from tests.fakes import FAST, FakeControlD
+
+
+def make_source() -> FakeControlD:
+    state = FakeControlD()
+    state.add_profile("S1", "tenant")
+    ads = state.add_folder("S1", "ads")
+    for index in range(5):
+        state.add_rule("S1", f"ads{index}.com", group=ads)
+    state.add_rule("S1", "root.com", do=1)
+    state.services["S1"]["youtube"] = {"category": "video", "action": {"do": 0, "status": 1}}
+    state.native_filters["S1"]["ads"] = 1
+    state.options["S1"]["ai_malware"] = {"value": "0.9"}
+    state.default_rules["S1"] = {"do": 0, "status": 1}
+    state.add_profile("S2", "other")
+    return state
+
+
+def test_migrate_copies_profile_with_grouped_writes():
+    source, target = make_source(), FakeControlD()
+
+    [result] = migrate_profiles(source.api(), target.api(), profile_ids=["S1"], rate_limiter=FAST)
+
+    assert result.ok, result
+    assert result.counts["rules"] == (6, 6)
+    assert result.counts["folders"] == (1, 1)
+    copy = result.target_profile
+    assert target.profiles[copy]["name"] == "tenant"
+    assert set(target.rules[copy]) == set(source.rules["S1"])
+    assert target.native_filters[copy]["ads"] == 1
+    assert target.options[copy] == {"ai_malware": {"value": "0.9"}}
+    assert target.default_rules[copy]["do"] == 0
+
+    writes = [call[0] for call in target.calls if call[0].endswith(("create", "modify"))]
+    assert writes.index("folders.create") < writes.index("rules.create")
+    assert writes.count("rules.create") == 2
+
+
+def test_migrate_resumes_from_checkpoint(tmp_path):
+    source, target = make_source(), FakeControlD()
+    checkpoint = Checkpoint(tmp_path / "migration.ckpt")
+    api = target.api()
+
+    def fail(*args, **kwargs):
+        raise ValueError("interrupted")
+
+    create_rules = api.profiles.custom_rules.create
+    api.profiles.custom_rules.create = fail
+    [first] = migrate_profiles(
+        source.api(), api, profile_ids=["S1"], checkpoint=checkpoint, rate_limiter=FAST
+    )
+    assert not first.ok
+
+    api.profiles.custom_rules.create = create_rules
+    [second] = migrate_profiles(
+        source.api(), api, profile_ids=["S1"], checkpoint=checkpoint, rate_limiter=FAST
+    )
+    assert second.ok
+    assert second.target_profile == first.target_profile
+    assert len(target.profiles) == 1
+
+    target.calls.clear()
+    [third] = migrate_profiles(
+        source.api(),
+        api,
+        profile_ids=["S1"],
+        checkpoint=tmp_path / "migration.ckpt",
+        rate_limiter=FAST,
+    )
+    assert third.skipped
+    assert not any(call[0] == "profiles.create" for call in target.calls)
+
+
+def test_migrate_rerun_sends_nothing_for_inherited_rules(tmp_path):
+    source, target = make_source(), FakeControlD()
+    allow = source.add_folder("S1", "allow", do=1)
+    source.add_rule("S1", "inherit.com", do=None, group=allow)
+    checkpoint = Checkpoint(tmp_path / "migration.ckpt")
+    api = target.api()
+
+    def fail(*args, **kwargs):
+        raise ValueError("interrupted")
+
+    modify_filter = api.profiles.filters.modify
+    api.profiles.filters.modify = fail
+    [first] = migrate_profiles(
+        source.api(), api, profile_ids=["S1"], checkpoint=checkpoint, rate_limiter=FAST
+    )
+    assert ["modify_filter" in operation for operation in first.failed] == [True]
+
+    # Rules in a folder may take their action from it instead of carrying their own
+    for rule in target.rules[first.target_profile].values():
+        if rule["group"]:
+            rule["action"].pop("do")
+
+    api.profiles.filters.modify = modify_filter
+    target.calls.clear()
+    [second] = migrate_profiles(
+        source.api(), api, profile_ids=["S1"], checkpoint=checkpoint, rate_limiter=FAST
+    )
+    assert second.ok
+    assert second.operations == 1
+    assert not any(
+        call[0].startswith("rules.") and call[0] != "rules.list" for call in target.calls
+    )
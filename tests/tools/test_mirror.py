@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import sqlite3
+
+from pyctrld.tools.mirror import SECONDS_PER_DAY, Mirror
+from tests.fakes import FakeControlD
+
+NOW = 1700000000
+
+
+def make_account() -> FakeControlD:
+    state = FakeControlD()
+    for pk in ("P1", "P2"):
+        state.add_profile(pk)
+        state.add_rule(pk, "example.com")
+    folder = state.add_folder("P1", "ads")
+    state.add_rule("P1", "ads.com", group=folder)
+    state.add_device("D1", "router", "P1", last_activity=NOW)
+    state.add_device("D2", "laptop", "P1", last_activity=NOW - 40 * SECONDS_PER_DAY)
+    state.add_device("D3", "phone", "P2")
+    state.known_ips["D1"] = ["1.2.3.4"]
+    return state
+
+
+def test_mirror_queries(tmp_path):
+    state = make_account()
+    path = tmp_path / "account.db"
+
+    with Mirror(path) as mirror:
+        mirror.refresh(state.api())
+
+    state.calls.clear()
+    with Mirror(path) as mirror:
+        assert mirror.profiles_with_rule("example.com") == ["P1", "P2"]
+        assert mirror.profiles_with_rule("ads.com") == ["P1"]
+        assert [rule.PK for rule in mirror.rules("P1", folder_id=101)] == ["ads.com"]
+        assert len(mirror.rules("P1")) == 2
+        assert {device.PK for device in mirror.devices_using_profile("P1")} == {"D1", "D2"}
+        assert mirror.device_by_resolver("uid-D3").PK == "D3"
+        assert mirror.device_by_resolver("unknown") is None
+        assert {device.PK for device in mirror.inactive_devices(30, now=NOW)} == {"D2", "D3"}
+        assert mirror.query("SELECT ip FROM known_ips WHERE device_pk = ?", ("D1",))[0]["ip"] == (
+            "1.2.3.4"
+        )
+        plan = mirror.query("EXPLAIN QUERY PLAN SELECT * FROM rules WHERE \"PK\" = 'x'")
+        assert "ix_rules_PK" in plan[0]["detail"]
+    assert state.calls == []
+
+
+def test_mirror_load_replaces_content():
+    state = make_account()
+    mirror = Mirror()
+    mirror.load(state.api().snapshot())
+
+    del state.rules["P2"]["example.com"]
+    mirror.load(state.api().snapshot())
+
+    assert mirror.profiles_with_rule("example.com") == ["P1"]
+    mirror.close()
+
+
+def test_mirror_rebuilds_tables_of_an_outdated_schema(tmp_path):
+    path = tmp_path / "account.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE "rules" ("PK" TEXT, data TEXT)')
+    connection.close()
+
+    with Mirror(path) as mirror:
+        mirror.load(make_account().api().snapshot())
+
+    with Mirror(path) as mirror:
+        assert mirror.profiles_with_rule("example.com") == ["P1", "P2"]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pyctrld.tools.provision import provision_devices, read_device_rows
+from tests.fakes import FAST, FakeControlD
+
+
+def test_provision_from_csv_and_ndjson(tmp_path):
+    state = FakeControlD()
+    state.add_profile("P1")
+    csv_path = tmp_path / "routers.csv"
+    csv_path.write_text("name,profile_id,icon,desc\nr1,P1,router,SN-1\nr2,P1,router,\n")
+    ndjson_path = tmp_path / "routers.ndjson"
+    ndjson_path.write_text(json.dumps({"name": "r3", "profile_id": "P1", "icon": "router"}) + "\n")
+
+    assert [row.desc for row in read_device_rows(csv_path)] == ["SN-1", None]
+    result = provision_devices(state.api(), csv_path, rate_limiter=FAST)
+    assert sorted(result.succeeded) == ["r1", "r2"]
+    assert provision_devices(state.api(), ndjson_path, rate_limiter=FAST).succeeded == ["r3"]
+
+    by_desc = provision_devices(state.api(), csv_path, key="desc", rate_limiter=FAST)
+    assert by_desc.skipped == ["SN-1"]
+    assert list(by_desc.failed) == ["r2"]
+
+    ndjson_path.write_text(json.dumps({"name": "r4"}) + "\n")
+    with pytest.raises(ValueError, match="routers.ndjson:1"):
+        list(read_device_rows(ndjson_path))
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import pytest
+
+from pyctrld._core.models.common import Do
+from pyctrld.tools.reconcile import (
+    ActionSpec,
+    FolderSpec,
+    OptionSpec,
+    ProfileSpec,
+    RuleSpec,
+    apply,
+    plan,
+    reconcile,
+)
+from pyctrld.tools.snapshot import snapshot_profiles
+from tests.fakes import FakeControlD
+
+
+def make_account() -> FakeControlD:
+    state = FakeControlD()
+    state.add_profile("P1")
+    old = state.add_folder("P1", "old")
+    state.add_folder("P1", "ads")
+    state.add_rule("P1", "keep.com")
+    state.add_rule("P1", "stale.com")
+    state.add_rule("P1", "moved.com", group=old)
+    state.add_rule("P1", "gone.com", group=old)
+    return state
+
+
+SPEC = ProfileSpec(
+    folders={"ads": FolderSpec(do=Do.BLOCK), "new": FolderSpec(do=Do.BYPASS)},
+    rules={
+        "keep.com": RuleSpec(do=Do.BLOCK),
+        "moved.com": RuleSpec(do=Do.BLOCK, folder="new"),
+        "a.new.com": RuleSpec(do=Do.BYPASS, folder="new"),
+        "b.new.com": RuleSpec(do=Do.BYPASS, folder="new"),
+        "spoof.com": RuleSpec(do=Do.SPOOF, via="1.2.3.4"),
+    },
+    services={"youtube": ActionSpec(do=Do.BLOCK)},
+    filters={"ads": True, "malware": True},
+    default_rule=ActionSpec(do=Do.BLOCK),
+    options={"ai_malware": OptionSpec(value="0.9")},
+    prune=True,
+)
+
+
+def snapshot(state: FakeControlD):
+    api = state.api()
+    return api, snapshot_profiles(api, api.profiles.profiles.list())["P1"]
+
+
+def test_plan_is_minimal_and_ordered():
+    state = make_account()
+    _, current = snapshot(state)
+    state.calls.clear()
+
+    result = plan(SPEC, current)
+
+    assert state.calls == []
+    operations = {(op.kind, op.key, tuple(op.hostnames)): op for op in result.operations}
+    create_folder = operations[("create_folder", "new", ())]
+    create_rules = operations[("create_rules", "new", ("a.new.com", "b.new.com"))]
+    move_rule = operations[("modify_rules", "new", ("moved.com",))]
+    delete_folder = operations[("delete_folder", "old", ())]
+
+    assert create_rules.depends_on == [create_folder.id]
+    assert move_rule.depends_on == [create_folder.id]
+    assert move_rule.id in delete_folder.depends_on
+    assert ("delete_rule", "", ("stale.com",)) in operations
+    # gone.com disappears with its folder
+    assert ("delete_rule", "", ("gone.com",)) not in operations
+    assert ("modify_filter", "malware", ()) not in operations
+    assert {op.kind for op in result.operations} >= {
+        "modify_service",
+        "modify_filter",
+        "modify_default_rule",
+        "modify_option",
+    }
+    assert not any(op.key == "ads" and "folder" in op.kind for op in result.operations)
+
+
+def test_apply_reaches_desired_state():
+    state = make_account()
+    api, current = snapshot(state)
+
+    result = apply(api, plan(SPEC, current), max_workers=4)
+
+    assert result.ok
+    assert not result.skipped
+    assert set(state.rules["P1"]) == set(SPEC.rules)
+    assert {folder["group"] for folder in state.folders["P1"].values()} == {"ads", "new"}
+    assert state.options["P1"] == {"ai_malware": {"value": "0.9"}}
+
+    _, updated = snapshot(state)
+    assert len(plan(SPEC, updated)) == 0
+
+
+def test_apply_skips_dependents_of_failed_operations():
+    state = make_account()
+    api, current = snapshot(state)
+    reconcile_plan = plan(SPEC, current)
+
+    def fail(*args, **kwargs):
+        raise ValueError("folder quota exceeded")
+
+    api.profiles.rule_folders.create = fail
+    result = apply(api, reconcile_plan)
+
+    assert len(result.failed) == 1
+    assert "create_folder" in next(iter(result.failed))
+    assert any("a.new.com" in skipped for skipped in result.skipped)
+    assert state.default_rules["P1"]["do"] == 0
+
+
+def test_reconcile_dry_run_does_not_write():
+    state = make_account()
+
+    result = reconcile(state.api(), "P1", SPEC, dry_run=True)
+
+    assert result.dry_run and len(result.plan) > 0
+    assert not result.succeeded
+    assert not any(call[0].endswith(("create", "modify", "delete")) for call in state.calls)
+    with pytest.raises(ValueError):
+        reconcile(state.api(), "missing", SPEC)
+
+
+def test_reconcile_reports_applied_and_failed_operations():
+    state = make_account()
+    api = state.api()
+
+    def fail(*args, **kwargs):
+        raise ValueError("folder quota exceeded")
+
+    api.profiles.rule_folders.create = fail
+    result = reconcile(api, "P1", SPEC)
+
+    assert not result.dry_run and not result.ok
+    assert len(result.succeeded) + len(result.failed) + len(result.skipped) == len(result.plan)
+    assert "create_folder" in next(iter(result.failed))
+    assert state.default_rules["P1"]["do"] == 0
+
+    result = reconcile(state.api(), "P1", SPEC)
+    assert result.ok and not result.skipped
+    assert len(reconcile(state.api(), "P1", SPEC).plan) == 0
+
+
+def test_plan_rejects_default_rule_without_do():
+    _, current = snapshot(make_account())
+
+    with pytest.raises(ValueError, match="do"):
+        plan(ProfileSpec(default_rule=ActionSpec(status=True)), current)
+
+
+def test_plan_of_own_snapshot_is_empty_with_inherited_actions():
+    state = make_account()
+    allow = state.add_folder("P1", "allow", do=Do.BYPASS)
+    state.add_rule("P1", "b.com", do=None, group=allow)
+    state.add_rule("P1", "root.com", do=None)
+    _, current = snapshot(state)
+
+    spec = ProfileSpec.from_snapshot(current)
+    assert spec.rules["b.com"].do == Do.BYPASS
+    assert spec.rules["root.com"].do == Do.BLOCK
+    assert len(plan(spec, current)) == 0
+
+    spec.rules["b.com"] = RuleSpec(do=Do.BLOCK, folder="allow")
+    assert [operation.hostnames for operation in plan(spec, current).operations] == [["b.com"]]
+
+
+def test_rules_in_unknown_folders_fail_alone():
+    state = make_account()
+    api, current = snapshot(state)
+
+    with pytest.raises(ValueError, match="nope.com: folder 'nope'"):
+        plan(ProfileSpec(rules={"nope.com": RuleSpec(do=Do.BLOCK, folder="nope")}), current)
+    with pytest.raises(ValueError, match="folder 'old'"):
+        plan(ProfileSpec(rules={"x.com": RuleSpec(do=Do.BLOCK, folder="old")}, prune=True), current)
+    assert len(plan(ProfileSpec(rules={"x.com": RuleSpec(do=Do.BLOCK, folder="old")}), current))
+
+    reconcile_plan = plan(ProfileSpec(rules={"x.com": RuleSpec(do=Do.BLOCK)}), current)
+    reconcile_plan.operations.append(
+        reconcile_plan.operations[0].model_copy(update={"id": 1, "folder": "nope"})
+    )
+    result = apply(api, reconcile_plan)
+    assert result.succeeded == [reconcile_plan.operations[0].describe()]
+    assert list(result.failed.values()) == ["folder 'nope' does not exist"]
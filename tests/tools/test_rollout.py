@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pyctrld._core.checkpoint import Checkpoint
+from pyctrld.tools.rollout import _waves, rollout_config
+from tests.fakes import FAST, make_fleet
+
+TEMPLATE = '[listener.0]\nip = "127.0.0.1"\n# device $name ($uid)\n'
+
+
+def test_waves_cover_all_items():
+    items = [str(number) for number in range(10)]
+    assert [len(wave) for wave in _waves(items, (0.01, 0.5, 1.0))] == [1, 4, 5]
+    assert [len(wave) for wave in _waves(items, (0.5,))] == [5, 5]
+    assert _waves([], (0.1, 1.0)) == []
+
+
+def test_rollout_skips_deployed_hashes_and_resumes(tmp_path):
+    state = make_fleet(10)
+    api = state.api()
+    journal = Checkpoint(tmp_path / "rollout.ckpt")
+    modify = api.devices.modify_device
+    broken = {"D2", "D3", "D4"}
+
+    def flaky_modify(device_id, form_data):
+        if device_id in broken:
+            raise RuntimeError("router offline")
+        return modify(device_id, form_data)
+
+    api.devices.modify_device = flaky_modify
+    first = rollout_config(
+        api, TEMPLATE, journal, waves=(0.1, 0.5, 1.0), max_error_rate=0.5, rate_limiter=FAST
+    )
+    assert first.aborted
+    assert first.waves == 2
+    assert first.succeeded == ["D1", "D5"]
+    assert sorted(first.failed) == ["D2", "D3", "D4"]
+    assert first.pending == ["D6", "D7", "D8", "D9", "D10"]
+    assert state.devices["D1"]["ctrld_custom_config"].endswith("# device router-1 (uid-D1)\n")
+
+    broken.clear()
+    resumed = rollout_config(api, TEMPLATE, journal, rate_limiter=FAST)
+    assert not resumed.aborted
+    assert resumed.skipped == ["D1", "D5"]
+    assert len(resumed.succeeded) == 8
+
+    unchanged = rollout_config(
+        api, TEMPLATE, tmp_path / "rollout.ckpt", dry_run=True, rate_limiter=FAST
+    )
+    assert len(unchanged.skipped) == 10
+    assert not unchanged.pending
+
+    changed = rollout_config(api, TEMPLATE + "# v2\n", journal, dry_run=True, rate_limiter=FAST)
+    assert len(changed.pending) == 10
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pyctrld._core.models.profiles.custom_rules import CustomRule, ModifiedCustomRule
+from pyctrld.tools.rule_index import RuleIndex
+
+
+def rule(hostname: str, do: int = 0, status: int = 1) -> CustomRule:
+    return CustomRule(PK=hostname, order=1, group=0, action={"do": do, "status": status})
+
+
+def matched(index: RuleIndex, hostname: str) -> str | None:
+    match = index.lookup(hostname)
+    return match.PK if match else None
+
+
+def test_lookup_prefers_most_specific_rule():
+    index = RuleIndex(
+        [
+            rule("example.com"),
+            rule("*.ads.example.com"),
+            rule("safe.ads.example.com", do=1),
+            rule("off.example.com", status=0),
+        ]
+    )
+
+    assert matched(index, "example.com") == "example.com"
+    assert matched(index, "WWW.Example.com.") == "example.com"
+    assert matched(index, "ads.example.com") == "example.com"
+    assert matched(index, "x.ads.example.com") == "*.ads.example.com"
+    assert matched(index, "a.safe.ads.example.com") == "safe.ads.example.com"
+    assert matched(index, "off.example.com") == "example.com"
+    assert index.lookup("off.example.com", include_disabled=True).PK == "off.example.com"
+    assert matched(index, "example.org") is None
+    assert matched(index, "com") is None
+    assert [m and m.PK for m in index.lookup_many(["a.example.com", "x.org", "a.example.com"])] == [
+        "example.com",
+        None,
+        "example.com",
+    ]
+
+
+def test_incremental_updates():
+    index = RuleIndex([rule("example.com")])
+
+    index.apply_modified(
+        ["a.example.com", "b.example.com"],
+        [ModifiedCustomRule(do=1, status=1, order=1, group=5)],
+    )
+    assert index.get("a.example.com").action.do.value == 1
+    assert index.get("b.example.com").group == 5
+    assert len(index) == 3
+
+    assert index.remove("a.example.com")
+    assert not index.remove("a.example.com")
+    assert matched(index, "x.a.example.com") == "example.com"
+    assert index.remove("example.com")
+    assert matched(index, "x.a.example.com") is None
+    assert "b.example.com" in index
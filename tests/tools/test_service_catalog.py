@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from pyctrld._core.models.common import Do
+from pyctrld.api.profiles.services import ModifyServiceFormData, ServicesEndpoint
+from pyctrld.tools.service_catalog import ServiceCatalog
+from pyctrld.tools.service_policy import apply_category_policy
+from tests.fakes import FAST, FakeControlD
+
+
+def fetches(state: FakeControlD) -> list[tuple]:
+    return [call for call in state.calls if call[0].startswith("catalog.")]
+
+
+def test_load_fetches_all_categories_and_caches_on_disk(tmp_path):
+    state = FakeControlD()
+    api = state.api()
+    path = tmp_path / "cache" / "services.json"
+
+    catalog = ServiceCatalog.load(api, cache_path=path, rate_limiter=FAST)
+    assert len(catalog) == 5
+    assert sorted(call[1] for call in fetches(state)[1:]) == ["gaming", "social"]
+    assert json.loads(path.read_text())["fetched_at"] == catalog.fetched_at
+
+    state.calls.clear()
+    cached = ServiceCatalog.load(api, cache_path=path, rate_limiter=FAST)
+    assert fetches(state) == []
+    assert cached.category_of("tiktok") == "social"
+
+    data = json.loads(path.read_text())
+    data["fetched_at"] = int(time.time()) - 100
+    path.write_text(json.dumps(data))
+    ServiceCatalog.load(api, cache_path=path, ttl=60, rate_limiter=FAST)
+    assert fetches(state)[0] == ("catalog.list_service_categories",)
+
+
+def test_lookups_and_prefix_search():
+    state = FakeControlD()
+    catalog = ServiceCatalog.fetch(state.api(), rate_limiter=FAST)
+
+    assert "steam" in catalog and "stem" not in catalog
+    assert catalog.category_of("roblox") == "gaming"
+    assert catalog.category_of("missing") is None
+    assert catalog.pk_of("EPICGAMES") == "epicgames"
+    assert [service.PK for service in catalog.services_in("social")] == ["facebook", "tiktok"]
+    assert [service.PK for service in catalog.search("Ro")] == ["roblox"]
+    assert len(catalog.search("", limit=2)) == 2
+    assert catalog.search("zzz") == []
+
+    with pytest.raises(ValueError, match="did you mean steam"):
+        catalog.validate("stem")
+
+
+def test_catalog_rejects_unknown_services_before_sending(monkeypatch):
+    state = FakeControlD()
+    endpoint = ServicesEndpoint("token")
+    endpoint.catalog = ServiceCatalog.fetch(state.api(), rate_limiter=FAST)
+    monkeypatch.setattr(endpoint, "_request", pytest.fail)
+
+    with pytest.raises(ValueError, match="Unknown service 'stem'"):
+        endpoint.modify("S1", "stem", ModifyServiceFormData(do=Do.BLOCK, status=True))
+
+
+def test_policy_uses_endpoint_catalog():
+    state = FakeControlD()
+    state.add_profile("S1")
+    api = state.api()
+    api.profiles.services.catalog = ServiceCatalog.fetch(api, rate_limiter=FAST)
+    state.calls.clear()
+
+    block = ModifyServiceFormData(do=Do.BLOCK, status=True)
+    reports = apply_category_policy(api, "gaming", ["S1"], block, rate_limiter=FAST)
+    assert sorted(reports["S1"].succeeded) == ["epicgames", "roblox", "steam"]
+    assert fetches(state) == []
+
+    reports = api.profiles.services.bulk_modify(["S1"], ["stem", "steam"], block, rate_limiter=FAST)
+    assert list(reports["S1"].failed) == ["stem"]
+    assert reports["S1"].skipped == ["steam"]
+
+
+def test_policy_rejects_unknown_category_with_catalog():
+    state = FakeControlD()
+    state.add_profile("S1")
+    api = state.api()
+    api.profiles.services.catalog = ServiceCatalog.fetch(api, rate_limiter=FAST)
+    state.calls.clear()
+
+    block = ModifyServiceFormData(do=Do.BLOCK, status=True)
+    with pytest.raises(ValueError, match="Unknown service category 'gamng'"):
+        apply_category_policy(api, ["gaming", "gamng"], ["S1"], block, rate_limiter=FAST)
+    assert state.calls == []
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from pyctrld._core.models.common import Do
+from pyctrld.api.profiles.services import ModifyServiceFormData
+from pyctrld.tools.service_policy import apply_category_policy
+from tests.fakes import FAST, FakeControlD
+
+
+def test_apply_category_policy_skips_services_in_desired_state():
+    state = FakeControlD()
+    for pk in ("S1", "S2"):
+        state.add_profile(pk)
+    state.services["S1"]["steam"] = {"category": "gaming", "action": {"do": 0, "status": 1}}
+    state.services["S2"]["roblox"] = {"category": "gaming", "action": {"do": 1, "status": 1}}
+    api = state.api()
+    block = ModifyServiceFormData(do=Do.BLOCK, status=True)
+
+    reports = apply_category_policy(api, "gaming", ["S1", "S2"], block, rate_limiter=FAST)
+
+    assert sorted(reports["S1"].succeeded) == ["epicgames", "roblox"]
+    assert reports["S1"].skipped == ["steam"]
+    assert sorted(reports["S2"].succeeded) == ["epicgames", "roblox", "steam"]
+    assert state.services["S2"]["roblox"]["action"]["do"] == 0
+
+    again = apply_category_policy(api, ["gaming"], ["S1", "S2"], block, rate_limiter=FAST)
+    assert all(not report.succeeded and len(report.skipped) == 3 for report in again.values())
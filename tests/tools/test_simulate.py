@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pickle
+
+from pyctrld._core.models.common import Do
+from tests.fakes import make_simulator
+
+
+def test_evaluate_layers():
+    simulator = make_simulator()
+
+    cases = {
+        "www.blocked.com": (Do.BLOCK, "custom_rule", "blocked.com"),
+        "x.allowed.blocked.com": (Do.BYPASS, "custom_rule", "*.allowed.blocked.com"),
+        "spoofed.com": (Do.SPOOF, "custom_rule", "spoofed.com"),
+        "inactive.com": (Do.BYPASS, "default", "default"),
+        "m.youtube.com": (Do.BYPASS, "service", "youtube"),
+        "evil.com": (Do.BLOCK, "native_filter", "malware"),
+        "ads.example.com": (Do.BYPASS, "default", "default"),
+        "cdn.tracker.net": (Do.BLOCK, "third_party_filter", "oisd"),
+    }
+    for hostname, expected in cases.items():
+        decision = simulator.evaluate(hostname)
+        assert (decision.do, decision.layer, decision.source) == expected, hostname
+
+    spoofed = simulator.evaluate("spoofed.com")
+    assert spoofed.via == "10.0.0.2"
+    assert spoofed.folder == "spoof"
+    assert spoofed.explain() == "SPOOF by custom rule spoofed.com in folder spoof via 10.0.0.2"
+
+
+def test_evaluate_many_is_picklable_and_consistent():
+    simulator = pickle.loads(pickle.dumps(make_simulator()))
+    hostnames = ["a.blocked.com", "evil.com", "a.blocked.com", "unknown.org"]
+
+    decisions = simulator.evaluate_many(hostnames)
+
+    assert [decision.layer for decision in decisions] == [
+        "custom_rule",
+        "native_filter",
+        "custom_rule",
+        "default",
+    ]
+    assert decisions[0] is decisions[2]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from pyctrld._core.models.snapshot import AccountSnapshot
+from pyctrld.tools.snapshot import snapshot_profiles
+from tests.fakes import FakeControlD
+
+
+def make_account() -> FakeControlD:
+    state = FakeControlD()
+    for pk in ("P1", "P2"):
+        state.add_profile(pk)
+        folder = state.add_folder(pk, "ads")
+        state.add_rule(pk, f"root.{pk}.com")
+        state.add_rule(pk, f"ads.{pk}.com", group=folder)
+    state.services["P1"]["youtube"] = {"category": "video", "action": {"do": 0, "status": 1}}
+    state.add_device("D1", "router", "P1", icon="router")
+    state.known_ips["D1"] = ["1.2.3.4"]
+    return state
+
+
+def test_snapshot_captures_account():
+    state = make_account()
+
+    snapshot = state.api().snapshot(max_workers=4)
+
+    assert set(snapshot.profiles) == {"P1", "P2"}
+    p1 = snapshot.profiles["P1"]
+    assert set(p1.rule_tree.rules()) == {"root.P1.com", "ads.P1.com"}
+    assert p1.rule_tree.find("ads.P1.com").group == 101
+    assert [service.PK for service in p1.services] == ["youtube"]
+    assert {f.PK for f in p1.native_filters} == {"ads", "malware"}
+    assert [f.PK for f in p1.third_party_filters] == ["oisd"]
+    assert p1.default_rule.status.value == 1
+    assert [ip.ip for ip in snapshot.devices["D1"].known_ips] == ["1.2.3.4"]
+    assert snapshot.user.email == "user@example.com"
+    assert snapshot.options[0].PK == "ai_malware"
+
+    restored = AccountSnapshot.model_validate_json(snapshot.model_dump_json(exclude_none=True))
+    assert restored.model_dump() == snapshot.model_dump()
+
+
+def test_snapshot_profiles_only_fetches_given_profiles():
+    state = make_account()
+    api = state.api()
+    profiles = [profile for profile in api.profiles.profiles.list() if profile.PK == "P2"]
+    state.calls.clear()
+
+    snapshots = snapshot_profiles(api, profiles)
+
+    assert list(snapshots) == ["P2"]
+    assert {call[1] for call in state.calls} == {"P2"}
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pyctrld.tools.sync import SyncStore, sync
+from tests.fakes import FakeControlD
+
+
+def make_account() -> FakeControlD:
+    state = FakeControlD()
+    for pk in ("P1", "P2", "P3"):
+        state.add_profile(pk)
+        state.add_rule(pk, f"{pk}.com")
+    return state
+
+
+def listing_calls(state: FakeControlD) -> set[str]:
+    return {call[1] for call in state.calls if call[0] != "profiles.list"}
+
+
+def test_sync_refetches_only_changed_profiles(tmp_path):
+    state = make_account()
+    store = SyncStore(tmp_path / "state.json")
+
+    first = sync(state.api(), store)
+    assert first.refreshed == ["P1", "P2", "P3"]
+
+    state.calls.clear()
+    second = sync(state.api(), store)
+    assert second.refreshed == []
+    assert second.unchanged == ["P1", "P2", "P3"]
+    assert state.calls == [("profiles.list",)]
+
+    state.add_rule("P2", "new.com")
+    state.touch("P2")
+    del state.profiles["P3"]
+    state.calls.clear()
+
+    third = sync(state.api(), store)
+    assert third.refreshed == ["P2"]
+    assert third.removed == ["P3"]
+    assert listing_calls(state) == {"P2"}
+    assert set(store.load().profiles["P2"].rule_tree.rules()) == {"P2.com", "new.com"}
+    assert store.load().profiles["P2"].profile.updated == 2
+
+
+def test_sync_force_refetches_everything(tmp_path):
+    state = make_account()
+    store = SyncStore(tmp_path / "state.json")
+    sync(state.api(), store)
+
+    state.calls.clear()
+    result = sync(state.api(), store, force=True)
+
+    assert result.refreshed == ["P1", "P2", "P3"]
+    assert listing_calls(state) == {"P1", "P2", "P3"}
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from pyctrld._core.models.common import Do
+from pyctrld.tools.watch import Watcher
+from tests.fakes import FAST, make_fleet
+
+
+def test_poll_once_emits_changes_and_adapts_interval():
+    state = make_fleet(1)
+    state.add_rule("P1", "a.com", Do.BLOCK)
+    api = state.api()
+    received = []
+    watcher = Watcher(rate_limiter=FAST)
+    watcher.watch(
+        "rules",
+        lambda: api.profiles.custom_rules.list("P1"),
+        callback=received.append,
+        interval=10,
+        min_interval=1,
+        max_interval=40,
+    )
+    watcher.watch(
+        "ips", lambda: api.access.list_known_ips("D1"), key="ip", interval=1, emit_initial=True
+    )
+
+    assert watcher.poll_once(now=0) == []
+    assert watcher.interval("rules") == 20
+    assert watcher.next_due() == 2
+
+    state.add_rule("P1", "b.com", Do.BLOCK)
+    state.known_ips["D1"].append("198.51.100.1")
+    assert [(event.watch, event.key) for event in watcher.poll_once(now=5)] == [
+        ("ips", "198.51.100.1")
+    ]
+    assert not received
+
+    events = watcher.poll_once(now=60)
+    assert [(event.watch, event.kind, event.key) for event in events] == [
+        ("rules", "added", "b.com")
+    ]
+    assert received == events
+    assert watcher.interval("rules") == 1
+
+    state.rules["P1"].pop("a.com")
+    removed = watcher.poll_once(now=61)
+    assert [(event.kind, event.key, event.entity) for event in removed] == [
+        ("removed", "a.com", None)
+    ]
+    assert removed[0].previous.PK == "a.com"
+
+    for now in range(62, 400, 50):
+        watcher.poll_once(now=now)
+    assert watcher.interval("rules") == 40
+
+
+def test_events_async_iterator():
+    api = make_fleet(1).api()
+    watcher = Watcher(rate_limiter=FAST)
+    watcher.watch("devices", api.devices.list_all_devices, emit_initial=True)
+
+    async def first_event():
+        async for event in watcher.events():
+            watcher.stop()
+            return event
+
+    event = asyncio.run(first_event())
+    assert (event.kind, event.key, event.entity.name) == ("added", "D1", "router-1")
+
+
+def test_stop_interrupts_events_wait():
+    api = make_fleet(1).api()
+    watcher = Watcher(rate_limiter=FAST)
+    watcher.watch("devices", api.devices.list_all_devices, interval=300, emit_initial=True)
+
+    async def collect():
+        threading.Timer(0.2, watcher.stop).start()
+        return [event async for event in watcher.events()]
+
+    started = time.monotonic()
+    assert [event.key for event in asyncio.run(collect())] == ["D1"]
+    assert time.monotonic() - started < 5